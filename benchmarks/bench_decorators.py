@@ -0,0 +1,102 @@
+"""
+Every decorator of ``decorators.py`` over small, wide and deeply nested payloads,
+through the test client(``client``) and by calling the view directly(``direct``)
+"""
+import json
+from io import BytesIO
+
+import pytest
+
+from flask_validation import (
+    json_required, validate_common, validate_keys, validate_many, validate_payload, validate_stream,
+    validate_with_fields, validate_with_jsonschema
+)
+from flask_validation.compiler import ENGINES
+
+from payloads import BULK, RECORD_FIELDS, SHAPES, WIDE
+
+DECORATORS = {
+    'validate_keys': lambda shape, engine: validate_keys(shape.keys),
+    'validate_common': lambda shape, engine: validate_common(shape.types, engine),
+    'validate_with_fields': lambda shape, engine: validate_with_fields(shape.fields, engine),
+    'validate_payload': lambda shape, engine: validate_payload(shape.keys, shape.types, shape.fields, engine=engine),
+    'validate_payload_collect_errors': lambda shape, engine: validate_payload(
+        shape.keys, shape.types, shape.fields, collect_errors=True, engine=engine
+    ),
+    'validate_with_jsonschema': lambda shape, engine: validate_with_jsonschema(shape.jsonschema)
+}
+
+
+@pytest.mark.parametrize('shape', SHAPES, ids=repr)
+@pytest.mark.parametrize('engine', ENGINES)
+@pytest.mark.parametrize('name', sorted(DECORATORS))
+def test_direct(benchmark, make_app, call_directly, name, engine, shape):
+    if name in ('validate_keys', 'validate_with_jsonschema') and engine != ENGINES[0]:
+        pytest.skip('{} has a single engine'.format(name))
+
+    benchmark.group = 'direct-{}'.format(shape)
+    benchmark(call_directly(make_app(DECORATORS[name](shape, engine)), shape.payload))
+
+
+@pytest.mark.parametrize('shape', SHAPES, ids=repr)
+@pytest.mark.parametrize('name', sorted(DECORATORS))
+def test_client(benchmark, make_app, post, name, shape):
+    benchmark.group = 'client-{}'.format(shape)
+    benchmark(post(make_app(DECORATORS[name](shape, 'codegen')).test_client(), shape.payload))
+
+
+def test_client_baseline(benchmark, make_app, post):
+    # decorator가 없는 경우와 비교하기 위한 기준값
+    benchmark.group = 'client-small'
+    benchmark(post(make_app(lambda fn: fn).test_client(), SHAPES[0].payload))
+
+
+def test_json_required(benchmark, make_app, post):
+    benchmark.group = 'client-small'
+    benchmark(post(make_app(json_required).test_client(), SHAPES[0].payload))
+
+
+@pytest.mark.parametrize('engine', ENGINES)
+@pytest.mark.parametrize('collect_errors', (False, True))
+def test_validate_many(benchmark, make_app, call_directly, engine, collect_errors):
+    benchmark.group = 'bulk'
+    benchmark(call_directly(make_app(validate_many(RECORD_FIELDS, collect_errors=collect_errors, engine=engine)), BULK))
+
+
+@pytest.mark.parametrize('format', ('ndjson', 'array'))
+def test_validate_stream(benchmark, make_app, format):
+    benchmark.group = 'bulk'
+
+    if format == 'ndjson':
+        body = '\n'.join(json.dumps(record) for record in BULK).encode()
+    else:
+        body = json.dumps(BULK).encode()
+
+    def view(records):
+        for _ in records:
+            pass
+
+        return 'hello'
+
+    app = make_app(lambda fn: validate_stream(RECORD_FIELDS, format=format, engine='codegen')(view))
+
+    def run():
+        with app.test_request_context('/', method='POST', input_stream=BytesIO(body), content_length=len(body)):
+            assert app.view_functions['view']() == 'hello'
+
+    benchmark(run)
+
+
+@pytest.mark.parametrize('mode', ('optional', 'partial'))
+def test_partial(benchmark, make_app, call_directly, mode):
+    # 200개 key의 mapping에 2개 key만 보내는 PATCH
+    payload = dict(list(WIDE.payload.items())[:2])
+
+    if mode == 'partial':
+        decorator = validate_with_fields(WIDE.fields, partial=True)
+    else:
+        fields = {key: type(field)(required=False) for key, field in WIDE.fields.items()}
+        decorator = validate_with_fields(fields, 'codegen')
+
+    benchmark.group = 'partial'
+    benchmark(call_directly(make_app(decorator), payload))
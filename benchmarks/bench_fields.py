@@ -0,0 +1,43 @@
+"""
+Every field of ``fields.py``, through ``validate`` and through the compiled check of ``compile``
+"""
+import pytest
+
+from flask_validation import BooleanField, FloatField, IntField, ListField, LRU, StringField, load_enum
+from flask_validation import common_regex as cr
+
+FIELDS = {
+    'StringField': (StringField(), 'viper'),
+    'StringField-length': (StringField(min_length=1, max_length=20), 'viper'),
+    'StringField-regex-email': (StringField(regex=cr.email), 'viper@istruly.sexy'),
+    'StringField-regex-url': (StringField(regex=cr.url), 'https://www.google.com/search'),
+    'StringField-regex-cached': (StringField(regex=cr.url, cache=LRU()), 'https://www.google.com/search'),
+    'StringField-enum-10000': (StringField(enum=['SKU-{}'.format(i) for i in range(10000)]), 'SKU-9999'),
+    'StringField-enum-lazy': (StringField(enum=load_enum(lambda: ['ko_KR', 'en_US'])), 'en_US'),
+    'IntField': (IntField(min_value=0, max_value=100), 42),
+    'FloatField': (FloatField(min_value=0.0, max_value=1.0), 0.5),
+    'BooleanField': (BooleanField(), True),
+    'ListField': (ListField(min_length=1, max_length=1000), list(range(1000))),
+    'ListField-item-int': (ListField(item=IntField(min_value=0)), list(range(1000))),
+    'ListField-item-string': (ListField(item=StringField(max_length=10)), ['viper'] * 1000),
+    'ListField-item-mapping': (ListField(item={'id': IntField(), 'name': StringField()}), [{'id': 1, 'name': 'viper'}] * 1000)
+}
+
+
+@pytest.mark.parametrize('name', sorted(FIELDS))
+def test_validate(benchmark, name):
+    field, value = FIELDS[name]
+    assert field.validate(value) is not False
+
+    benchmark.group = 'field-{}'.format(name)
+    benchmark(field.validate, value)
+
+
+@pytest.mark.parametrize('name', sorted(FIELDS))
+def test_compiled(benchmark, name):
+    field, value = FIELDS[name]
+    check = field.compile()
+    assert check(value) is None
+
+    benchmark.group = 'field-{}'.format(name)
+    benchmark(check, value)
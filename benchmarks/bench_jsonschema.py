@@ -0,0 +1,47 @@
+"""
+Raw ``jsonschema.validate`` against the compiled validators of the package(and schemas converted into fields), on the same payloads
+"""
+import jsonschema
+import pytest
+
+from flask_validation import compile_fields, jsonschema_to_fields
+from flask_validation.compiler import compile_jsonschema
+
+from payloads import SHAPES
+
+
+@pytest.mark.parametrize('shape', SHAPES, ids=repr)
+def test_jsonschema_validate(benchmark, shape):
+    # 매번 schema를 검사하고 validator를 만드는, 이 package 이전의 방식
+    benchmark.group = 'jsonschema-{}'.format(shape)
+    benchmark(jsonschema.validate, shape.payload, shape.jsonschema)
+
+
+@pytest.mark.parametrize('shape', SHAPES, ids=repr)
+def test_compiled_jsonschema(benchmark, shape):
+    validator = compile_jsonschema(shape.jsonschema)
+    assert validator.is_valid(shape.payload)
+
+    benchmark.group = 'jsonschema-{}'.format(shape)
+    benchmark(validator.is_valid, shape.payload)
+
+
+@pytest.mark.parametrize('shape', SHAPES, ids=repr)
+@pytest.mark.parametrize('engine', ('interpreted', 'codegen'))
+def test_compiled_fields(benchmark, shape, engine):
+    validator = compile_fields(shape.fields, engine)
+    assert validator(shape.payload) is None
+
+    benchmark.group = 'jsonschema-{}'.format(shape)
+    benchmark(validator, shape.payload)
+
+
+@pytest.mark.parametrize('shape', SHAPES, ids=repr)
+@pytest.mark.parametrize('engine', ('interpreted', 'codegen'))
+def test_native_jsonschema(benchmark, shape, engine):
+    # validate_with_jsonschema가 지원하는 schema에 사용하는 경로
+    validator = compile_fields(jsonschema_to_fields(shape.jsonschema), engine)
+    assert validator(shape.payload) is None
+
+    benchmark.group = 'jsonschema-{}'.format(shape)
+    benchmark(validator, shape.payload)
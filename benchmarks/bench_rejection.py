@@ -0,0 +1,53 @@
+"""
+The rejection path of invalid requests with ``abort``(``abort``) and with ``VALIDATION_FAST_REJECTION``(``fast``),
+through the test client(``client``) and by dispatching the request in a pushed request context(``dispatch``)
+"""
+import json
+
+import pytest
+
+from flask_validation import json_required, validate_payload, validate_with_fields
+
+from payloads import SMALL
+
+# (decorator, payload, content type, status code)
+REJECTIONS = {
+    'invalid_content_type': (lambda: json_required, SMALL.payload, 'text/plain', 406),
+    'key_missing': (lambda: validate_with_fields(SMALL.fields, 'codegen'), {}, 'application/json', 400),
+    'validation_failure': (
+        lambda: validate_with_fields(SMALL.fields, 'codegen'), dict(SMALL.payload, age=-1), 'application/json', 400
+    ),
+    'collect_errors': (
+        lambda: validate_payload(SMALL.keys, key_field_mapping=SMALL.fields, collect_errors=True, engine='codegen'), {},
+        'application/json', 400
+    )
+}
+
+
+@pytest.mark.parametrize('mode', ('abort', 'fast'))
+@pytest.mark.parametrize('name', sorted(REJECTIONS))
+def test_client(benchmark, make_app, post, name, mode):
+    decorator, payload, content_type, status_code = REJECTIONS[name]
+    app = make_app(decorator(), VALIDATION_FAST_REJECTION=mode == 'fast')
+
+    benchmark.group = 'rejection-client-{}'.format(name)
+    benchmark(post(app.test_client(), payload, status_code, content_type))
+
+
+@pytest.mark.parametrize('mode', ('abort', 'fast'))
+@pytest.mark.parametrize('name', sorted(REJECTIONS))
+def test_dispatch(benchmark, make_app, name, mode):
+    decorator, payload, content_type, status_code = REJECTIONS[name]
+    app = make_app(decorator(), VALIDATION_FAST_REJECTION=mode == 'fast')
+
+    # error handler 탐색과 error page 생성을 포함한 dispatch만 측정
+    with app.test_request_context('/', method='POST', data=json.dumps(payload), content_type=content_type) as context:
+        context.request.get_data()
+        environ = context.request.environ
+
+        def run():
+            environ.pop('flask_validation.context', None)
+            assert app.full_dispatch_request().status_code == status_code
+
+        benchmark.group = 'rejection-dispatch-{}'.format(name)
+        benchmark(run)
@@ -0,0 +1,128 @@
+"""
+Deterministic payloads and the equivalent specs for every decorator, shared by the benchmarks
+"""
+import random
+
+from flask_validation import BooleanField, FloatField, IntField, ListField, StringField
+from flask_validation import common_regex as cr
+
+# 실행마다 같은 payload로 측정하기 위해 seed 고정
+_random = random.Random(20180420)
+
+
+def _word(length=8):
+    return ''.join(_random.choice('abcdefghijklmnopqrstuvwxyz') for _ in range(length))
+
+
+def _record():
+    return {
+        'name': _word(),
+        'email': '{}@{}.com'.format(_word(), _word(5)),
+        'age': _random.randint(0, 100),
+        'score': _random.random(),
+        'active': _random.random() < 0.5,
+        'tags': [_random.randint(0, 1000) for _ in range(5)]
+    }
+
+
+RECORD_FIELDS = {
+    'name': StringField(max_length=20),
+    'email': StringField(regex=cr.email),
+    'age': IntField(min_value=0, max_value=150),
+    'score': FloatField(min_value=0.0, max_value=1.0),
+    'active': BooleanField(),
+    'tags': ListField(item=IntField(min_value=0))
+}
+
+RECORD_TYPES = {'name': str, 'email': str, 'age': int, 'score': float, 'active': bool, 'tags': list}
+
+RECORD_JSONSCHEMA = {
+    'type': 'object',
+    'properties': {
+        'name': {'type': 'string', 'maxLength': 20},
+        'email': {'type': 'string', 'pattern': str(cr.email)},
+        'age': {'type': 'integer', 'minimum': 0, 'maximum': 150},
+        'score': {'type': 'number', 'minimum': 0.0, 'maximum': 1.0},
+        'active': {'type': 'boolean'},
+        'tags': {'type': 'array', 'items': {'type': 'integer', 'minimum': 0}}
+    },
+    'required': list(RECORD_FIELDS)
+}
+
+
+def _wide(width=200):
+    payload = {}
+    fields = {}
+    types = {}
+    properties = {}
+
+    for index in range(width):
+        key = 'key{}'.format(index)
+        kind = index % 3
+
+        if kind == 0:
+            payload[key] = _word()
+            fields[key] = StringField(max_length=20)
+            types[key] = str
+            properties[key] = {'type': 'string', 'maxLength': 20}
+        elif kind == 1:
+            payload[key] = _random.randint(0, 100)
+            fields[key] = IntField(min_value=0)
+            types[key] = int
+            properties[key] = {'type': 'integer', 'minimum': 0}
+        else:
+            payload[key] = _random.random() < 0.5
+            fields[key] = BooleanField()
+            types[key] = bool
+            properties[key] = {'type': 'boolean'}
+
+    return payload, fields, types, {'type': 'object', 'properties': properties, 'required': list(payload)}
+
+
+def _nested(depth=10):
+    payload = _record()
+    fields = dict(RECORD_FIELDS)
+    types = dict(RECORD_TYPES)
+    jsonschema = dict(RECORD_JSONSCHEMA)
+
+    for _ in range(depth):
+        payload = {'child': payload, 'id': _random.randint(0, 100)}
+        fields = {'child': fields, 'id': IntField()}
+        types = {'child': types, 'id': int}
+        jsonschema = {
+            'type': 'object',
+            'properties': {'child': jsonschema, 'id': {'type': 'integer'}},
+            'required': ['child', 'id']
+        }
+
+    return payload, fields, types, jsonschema
+
+
+def _keys(spec):
+    return [{key: _keys(value)} if isinstance(value, dict) else key for key, value in spec.items()]
+
+
+class Shape(object):
+    """
+    A payload with the specs describing it, for ``validate_keys``, ``validate_common``,
+    ``validate_with_fields`` and ``validate_with_jsonschema``
+    """
+    def __init__(self, name, payload, fields, types, jsonschema):
+        self.name = name
+        self.payload = payload
+        self.fields = fields
+        self.types = types
+        self.keys = _keys(types)
+        self.jsonschema = jsonschema
+
+    def __repr__(self):
+        return self.name
+
+
+SMALL = Shape('small', _record(), RECORD_FIELDS, RECORD_TYPES, RECORD_JSONSCHEMA)
+WIDE = Shape('wide', *_wide())
+NESTED = Shape('nested', *_nested())
+SHAPES = (SMALL, WIDE, NESTED)
+
+# validate_many, validate_stream용
+BULK = [_record() for _ in range(10000)]
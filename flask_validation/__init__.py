@@ -1,3 +1,9 @@
+from .cache import LRU
+from .compiler import compile_fields, compile_keys, compile_many, compile_payload, compile_types
+from .context import get_context, get_json
 from .decorators import *
+from .enums import EnumSet, load_enum
 from .fields import *
+from .model import Model
+from .schema import fields_to_jsonschema, jsonschema_to_fields
 from .validator import Validator
\ No newline at end of file
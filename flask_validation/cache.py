@@ -0,0 +1,91 @@
+import time
+from collections import OrderedDict, namedtuple
+from threading import Lock
+
+CacheInfo = namedtuple('CacheInfo', ('hits', 'misses', 'maxsize', 'currsize'))
+
+_missing = object()
+
+
+class LRU(object):
+    """
+    A bounded cache of check results, passed to a field as ``cache``
+
+    Results of the field's ``validator_function`` (and ``regex`` for ``StringField``) are cached per value,
+    so that values repeating across requests are checked once. Unhashable values are always checked.
+    One instance can be shared by several fields, and is safe to use from multiple threads.
+
+    :param maxsize: maximum number of cached results. The least recently used one is evicted first.
+    :param ttl: seconds a result stays valid, or None to keep it until evicted
+    """
+    def __init__(self, maxsize: int=1024, ttl: float=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._results = OrderedDict()
+        self._lock = Lock()
+
+    def __getstate__(self):
+        # 결과는 process마다 따로 cache
+        return {'maxsize': self.maxsize, 'ttl': self.ttl}
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    def wrap(self, function):
+        """
+        Returns a function returning the truth value of ``function(value)``, cached by this instance
+        """
+        def cached(value):
+            # 1, 1.0, True는 hash가 같으므로 type도 key에 포함
+            key = (function, type(value), value)
+
+            try:
+                result = self._get(key)
+            except TypeError:
+                return bool(function(value))
+
+            if result is _missing:
+                result = bool(function(value))
+                self._set(key, result)
+
+            return result
+
+        return cached
+
+    def _get(self, key):
+        with self._lock:
+            entry = self._results.get(key)
+
+            if entry is None or (entry[1] is not None and entry[1] < time.monotonic()):
+                self.misses += 1
+                return _missing
+
+            self._results.move_to_end(key)
+            self.hits += 1
+
+            return entry[0]
+
+    def _set(self, key, result):
+        expires = None if self.ttl is None else time.monotonic() + self.ttl
+
+        with self._lock:
+            self._results[key] = (result, expires)
+            self._results.move_to_end(key)
+
+            if len(self._results) > self.maxsize:
+                self._results.popitem(last=False)
+
+    def info(self):
+        """
+        Returns hit/miss statistics as a ``CacheInfo(hits, misses, maxsize, currsize)``
+        """
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.maxsize, len(self._results))
+
+    def clear(self):
+        with self._lock:
+            self._results.clear()
+            self.hits = 0
+            self.misses = 0
@@ -1,9 +1,185 @@
-email = '^([a-z0-9_\.-]+)@([\da-z\.-]+)\.([a-z\.]{2,6})$'
-url = '^(https?:\/\/)?([\da-z\.-]+)\.([a-z\.]{2,6})([\/\w_\.-]*)*\/?$'
-visa_card = '4\d{3}[\s-]?\d{4}[\s-]?\d{4}[\s-]?\d{4}'
-master_card = '5[1-5]\d{2}[\s-]?\d{4}[\s-]?\d{4}[\s-]?\d{4}'
-isbn = '(?:[\d]-?){9}[\dxX]'
-hex = '^#?([a-f0-9]{6}|[a-f0-9]{3})$'
-ipv4 = '^(?:(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\.){3}(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)$'
-digit = '^[0-9]*$'
-date = '^(19|20)?[0-9]{2}[- /.](0?[1-9]|1[012])[- /.](0?[1-9]|[12][0-9]|3[01])$'  # yyyy/mm/dd
+import re
+
+try:
+    from re import _parser as sre_parse
+except ImportError:
+    import sre_parse
+
+
+class _Pattern(str):
+    """
+    A regex pattern string with an upper bound on the length of strings it can match.
+    ``StringField`` checks the length before running the regex, and ``compiled`` is the precompiled pattern.
+    """
+    def __new__(cls, pattern, max_length):
+        self = super(_Pattern, cls).__new__(cls, pattern)
+        self.max_length = max_length
+        self.compiled = re.compile(pattern)
+
+        return self
+
+    def __reduce__(self):
+        return _Pattern, (str(self), self.max_length)
+
+
+# 모두 backtracking이 입력 길이에 선형인 형태로 작성. label은 '.'으로, path는 '/'로 구분되어 분할 방법이 하나뿐임
+email = _Pattern(r'^[a-z0-9_.-]+@[\da-z-]+(?:\.[\da-z-]+)*\.[a-z]{2,6}$', 254)
+url = _Pattern(r'^(?:https?://)?[\da-z-]+(?:\.[\da-z-]+)*\.[a-z]{2,6}(?:/[\w.-]*)*$', 2048)
+visa_card = _Pattern(r'4\d{3}[\s-]?\d{4}[\s-]?\d{4}[\s-]?\d{4}', None)
+master_card = _Pattern(r'5[1-5]\d{2}[\s-]?\d{4}[\s-]?\d{4}[\s-]?\d{4}', None)
+isbn = _Pattern(r'(?:[\d]-?){9}[\dxX]', None)
+hex = _Pattern(r'^#?(?:[a-f0-9]{6}|[a-f0-9]{3})$', 7)
+ipv4 = _Pattern(r'^(?:(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\.){3}(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)$', 15)
+digit = _Pattern(r'^[0-9]*$', None)
+date = _Pattern(r'^(?:19|20)?[0-9]{2}[- /.](?:0?[1-9]|1[012])[- /.](?:0?[1-9]|[12][0-9]|3[01])$', 10)  # yyyy/mm/dd
+
+
+_REPEATS = (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT)
+_CATEGORIES = {
+    sre_parse.CATEGORY_DIGIT: lambda char: char.isdigit(),
+    sre_parse.CATEGORY_NOT_DIGIT: lambda char: not char.isdigit(),
+    sre_parse.CATEGORY_SPACE: lambda char: char.isspace(),
+    sre_parse.CATEGORY_NOT_SPACE: lambda char: not char.isspace(),
+    sre_parse.CATEGORY_WORD: lambda char: char.isalnum() or char == '_',
+    sre_parse.CATEGORY_NOT_WORD: lambda char: not (char.isalnum() or char == '_')
+}
+
+
+def _matches_char(item, char):
+    """
+    Returns whether a single-character item can match ``char``, or True if the item is not a single character
+    """
+    if len(item) != 1:
+        return True
+
+    op, av = item[0]
+
+    if op == sre_parse.LITERAL:
+        return chr(av) == char
+    if op == sre_parse.NOT_LITERAL:
+        return chr(av) != char
+    if op == sre_parse.CATEGORY:
+        return _CATEGORIES.get(av, lambda char: True)(char)
+    if op == sre_parse.IN:
+        negate = False
+        for set_op, set_av in av:
+            if set_op == sre_parse.NEGATE:
+                negate = True
+            elif set_op == sre_parse.LITERAL and chr(set_av) == char:
+                return not negate
+            elif set_op == sre_parse.RANGE and set_av[0] <= ord(char) <= set_av[1]:
+                return not negate
+            elif set_op == sre_parse.CATEGORY and _CATEGORIES.get(set_av, lambda char: True)(char):
+                return not negate
+
+        return negate
+
+    return True
+
+
+def _unwrap(items):
+    # 단순 group은 풀어서 내용을 같은 sequence로 취급
+    for op, av in items:
+        if op == sre_parse.SUBPATTERN:
+            for item in _unwrap(av[-1]):
+                yield item
+        else:
+            yield op, av
+
+
+def _is_unbounded_repeat(op, av):
+    return op in _REPEATS and av[1] == sre_parse.MAXREPEAT
+
+
+def _find_nested_repeat(items, inside_repeat=None):
+    for op, av in items:
+        if _is_unbounded_repeat(op, av):
+            body = list(_unwrap(av[2]))
+
+            if inside_repeat is None:
+                inner = [sub_av for sub_op, sub_av in body if _is_unbounded_repeat(sub_op, sub_av)]
+                # 바깥 반복마다 반드시 나오는 문자를 안쪽 반복이 match할 수 없으면 나누는 방법이 하나뿐이므로 안전
+                delimiters = [chr(sub_av) for sub_op, sub_av in body if sub_op == sre_parse.LITERAL]
+                if inner and not any(
+                    all(not _matches_char(list(inner_av[2]), delimiter) for inner_av in inner) for delimiter in delimiters
+                ):
+                    return 'nested quantifiers'
+
+            found = _find_nested_repeat(av[2], inside_repeat)
+        elif op in _REPEATS:
+            found = _find_nested_repeat(av[2], inside_repeat)
+        elif op == sre_parse.SUBPATTERN:
+            found = _find_nested_repeat(av[-1], inside_repeat)
+        elif op == sre_parse.BRANCH:
+            found = next((f for f in (_find_nested_repeat(branch, inside_repeat) for branch in av[1]) if f), None)
+        elif op in (sre_parse.ASSERT, sre_parse.ASSERT_NOT):
+            found = _find_nested_repeat(av[1], inside_repeat)
+        else:
+            found = None
+
+        if found:
+            return found
+
+
+def find_redos(pattern):
+    """
+    Returns a description of why ``pattern`` may backtrack catastrophically, or None if nothing is found
+
+    This is a heuristic check for nested unbounded quantifiers like ``(a+)+`` or ``([\\w.]*)*``,
+    where the ways to split a string between the inner and the outer quantifier grow exponentially.
+    Nested quantifiers separated by a mandatory character the inner one can not match, like ``(?:\\.[a-z]+)*``, are allowed.
+
+    :param pattern: regex pattern string or compiled pattern
+    """
+    if hasattr(pattern, 'pattern'):
+        pattern = pattern.pattern
+
+    return _find_nested_repeat(sre_parse.parse(pattern))
+
+
+def _collect_literals(items, literals):
+    run = []
+
+    for op, av in items:
+        if op == sre_parse.LITERAL:
+            run.append(chr(av))
+            continue
+
+        if run:
+            literals.append(''.join(run))
+            run = []
+
+        if op == sre_parse.SUBPATTERN:
+            # (?i:...)처럼 group 안에서 대소문자 구분을 끄면 literal로 취급할 수 없음
+            if not (len(av) == 4 and av[1] & re.IGNORECASE):
+                _collect_literals(av[-1], literals)
+        elif op in _REPEATS and av[0] >= 1:
+            _collect_literals(av[2], literals)
+
+    if run:
+        literals.append(''.join(run))
+
+
+def required_literals(pattern):
+    """
+    Returns the substrings every string matched by ``pattern`` contains, as a tuple
+
+    ``StringField`` checks them with ``in`` before running the regex, which rejects most non-matching strings
+    without a regex call. Case-insensitive patterns have no required literal.
+
+    :param pattern: regex pattern string or compiled pattern
+    """
+    flags = 0
+    if hasattr(pattern, 'pattern'):
+        pattern, flags = pattern.pattern, pattern.flags
+
+    parsed = sre_parse.parse(pattern, flags)
+    state = getattr(parsed, 'state', None) or parsed.pattern
+
+    if (flags | state.flags) & re.IGNORECASE:
+        return ()
+
+    literals = []
+    _collect_literals(parsed, literals)
+
+    return tuple(literals)
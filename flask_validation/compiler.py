@@ -0,0 +1,734 @@
+import json
+import linecache
+import math
+
+from jsonschema.validators import validator_for
+
+from .fields import ListField, _BaseField
+from .model import make_model_class
+
+KEY_MISSING = 'key_missing'
+INVALID_TYPE = 'invalid_type'
+VALIDATION_FAILURE = 'validation_failure'
+PAYLOAD_TOO_LARGE = 'payload_too_large'
+INVALID_CONTENT_TYPE = 'invalid_content_type'
+VALIDATION_ERROR = 'validation_error'
+
+# failure reason별로 abort code를 담고 있는 config option
+ABORT_CODE_OPTIONS = {
+    INVALID_CONTENT_TYPE: 'INVALID_CONTENT_TYPE_ABORT_CODE',
+    KEY_MISSING: 'KEY_MISSING_ABORT_CODE',
+    INVALID_TYPE: 'INVALID_TYPE_ABORT_CODE',
+    VALIDATION_FAILURE: 'VALIDATION_FAILURE_ABORT_CODE',
+    VALIDATION_ERROR: 'VALIDATION_ERROR_ABORT_CODE',
+    PAYLOAD_TOO_LARGE: 'PAYLOAD_TOO_LARGE_ABORT_CODE'
+}
+
+ENGINES = ('interpreted', 'codegen')
+
+
+class _Node(object):
+    """
+    A key of the merged schema: the rules checked on its value, and its nested keys if the value must be an object.
+    A rule is ``('presence', None)``, ``('type', <type class>)`` or ``('field', <field instance>)``
+    """
+    __slots__ = ('rules', 'children', 'container_reason')
+
+    def __init__(self):
+        self.rules = []
+        self.children = None
+        self.container_reason = None
+
+
+def _get_node(tree, key):
+    node = tree.get(key)
+    if node is None:
+        node = tree[key] = _Node()
+
+    return node
+
+
+def _get_children(tree, key, reason):
+    node = _get_node(tree, key)
+    if node.children is None:
+        node.children = {}
+        node.container_reason = reason
+
+    return node.children
+
+
+def _merge_keys(tree, keys):
+    # ['a', 'b', {'c': ['q' ,'z']}]
+    for key in keys:
+        if isinstance(key, str):
+            _get_node(tree, key).rules.append(('presence', None))
+        elif isinstance(key, dict):
+            for k, v in key.items():
+                _merge_keys(_get_children(tree, k, KEY_MISSING), v)
+
+
+def _merge_types(tree, mapping):
+    # {'a': str, 'b': int, 'c': {'d': int, 'e': str}}
+    for key, typ in mapping.items():
+        if isinstance(typ, type):
+            _get_node(tree, key).rules.append(('type', typ))
+        elif isinstance(typ, dict):
+            _merge_types(_get_children(tree, key, INVALID_TYPE), typ)
+        else:
+            _get_node(tree, key).rules.append(('presence', None))
+
+
+def _merge_fields(tree, mapping):
+    # {'a': StringField(allow_empty=False), 'b': IntField(min_value=0), 'c': {'d': BooleanField()}}
+    for key, field in mapping.items():
+        if isinstance(field, _BaseField):
+            _get_node(tree, key).rules.append(('field', field))
+        elif isinstance(field, dict):
+            _merge_fields(_get_children(tree, key, VALIDATION_FAILURE), field)
+
+
+def _get_rule_options(rule):
+    """
+    Returns ``(required, allow_null, failure reason)`` of a rule
+    """
+    kind, spec = rule
+    if kind == 'field':
+        return spec.required, spec.allow_null, VALIDATION_FAILURE
+    if kind == 'type':
+        return True, False, INVALID_TYPE
+
+    return True, False, KEY_MISSING
+
+
+def _check_dict(value):
+    if not isinstance(value, dict):
+        return 'type'
+
+
+def _check_nothing(value):
+    return None
+
+
+def _compile_type_check(typ):
+    def check(value):
+        if type(value) is not typ:
+            return 'type'
+
+    return check
+
+
+def _compile_rule(rule):
+    kind, spec = rule
+    if kind == 'field':
+        return spec.compile()
+    if kind == 'type':
+        return _compile_type_check(spec)
+
+    return _check_nothing
+
+
+class _Plan(object):
+    """
+    A flat list of validation steps. Nested objects are not visited recursively;
+    each step refers to the object it reads from by a container index, and container 0 is the payload itself.
+    """
+    def __init__(self, collect_errors=False, model=False):
+        # step: (parent container index, key, key path, required, allow_null, check, failure reason, child container index)
+        self.steps = []
+        self.container_count = 1
+        self.collect_errors = collect_errors
+        # container index별 model class
+        self.model_classes = [] if model else None
+
+    def add_tree(self, tree, parent=0, path=()):
+        if self.model_classes is not None:
+            self.model_classes.append(make_model_class(path[-1] if path else 'Payload', tree))
+
+        for key, node in tree.items():
+            key_path = path + (key,)
+            # 같은 key의 missing은 처음 required인 step에서만 보고
+            required = True
+
+            for rule in node.rules:
+                rule_required, allow_null, reason = _get_rule_options(rule)
+                self.steps.append((parent, key, key_path, required and rule_required, allow_null, _compile_rule(rule), reason, None))
+                required = required and not rule_required
+
+            if node.children is not None:
+                child = self.container_count
+                self.container_count += 1
+                self.steps.append((parent, key, key_path, required, False, _check_dict, node.container_reason, child))
+                self.add_tree(node.children, child, key_path)
+
+    def build(self, root_failure_reason):
+        steps = tuple(self.steps)
+        empty_containers = [None] * (self.container_count - 1)
+
+        if self.model_classes is not None:
+            model_classes = tuple(self.model_classes)
+            empty_objects = [None] * (self.container_count - 1)
+
+            def run(payload):
+                if not isinstance(payload, dict):
+                    return root_failure_reason, None
+
+                containers = [payload] + empty_containers
+                objects = [model_classes[0]()] + empty_objects
+
+                for parent, key, path, required, allow_null, check, reason, child in steps:
+                    src = containers[parent]
+
+                    if key not in src:
+                        if required:
+                            return KEY_MISSING, None
+
+                        setattr(objects[parent], key, None)
+                        continue
+
+                    value = src[key]
+
+                    if not (allow_null and value is None) and check(value) is not None:
+                        return reason, None
+
+                    if child is not None:
+                        containers[child] = value
+                        value = objects[child] = model_classes[child]()
+
+                    setattr(objects[parent], key, value)
+
+                return None, objects[0]
+        elif self.collect_errors:
+            def run(payload):
+                if not isinstance(payload, dict):
+                    return [{'path': (), 'code': root_failure_reason, 'constraint': 'type'}]
+
+                errors = []
+                containers = [payload] + empty_containers
+
+                for parent, key, path, required, allow_null, check, reason, child in steps:
+                    src = containers[parent]
+
+                    if src is None:
+                        # 상위 object가 없거나 invalid해서 이미 보고됨
+                        continue
+
+                    if key not in src:
+                        if required:
+                            errors.append({'path': path, 'code': KEY_MISSING, 'constraint': 'required'})
+
+                        continue
+
+                    value = src[key]
+
+                    if allow_null and value is None:
+                        continue
+
+                    constraint = check(value)
+                    if constraint is not None:
+                        errors.append({'path': path, 'code': reason, 'constraint': constraint})
+                    elif child is not None:
+                        containers[child] = value
+
+                return errors
+        else:
+            def run(payload):
+                if not isinstance(payload, dict):
+                    return root_failure_reason
+
+                containers = [payload] + empty_containers
+
+                for parent, key, path, required, allow_null, check, reason, child in steps:
+                    src = containers[parent]
+
+                    if key not in src:
+                        if required:
+                            return KEY_MISSING
+
+                        continue
+
+                    value = src[key]
+
+                    if allow_null and value is None:
+                        continue
+
+                    if check(value) is not None:
+                        return reason
+
+                    if child is not None:
+                        containers[child] = value
+
+        return run
+
+
+class _CodeGenerator(object):
+    """
+    Generates the source of a single validation function, with the same semantics as ``_Plan``.
+    Every check is emitted as a straight-line ``if``, constants are inlined,
+    and everything else(regex match methods, enums, validator functions, types) is bound as a default argument.
+    """
+    def __init__(self, collect_errors=False, model=False):
+        self.lines = []
+        self.namespace = {}
+        self.names = {}
+        self.container_count = 1
+        self.collect_errors = collect_errors
+        self.model = model
+
+    def bind(self, obj):
+        if type(obj) in (bool, int, str) or (type(obj) is float and math.isfinite(obj)):
+            return repr(obj)
+
+        name = self.names.get(id(obj))
+        if name is None:
+            name = self.names[id(obj)] = '_c{}'.format(len(self.namespace))
+            self.namespace[name] = obj
+
+        return name
+
+    def emit(self, depth, line):
+        self.lines.append('    ' * depth + line)
+
+    def fail(self, depth, path, reason, constraint):
+        if self.collect_errors:
+            self.emit(depth, "append({{'path': {}, 'code': {}, 'constraint': {}}})".format(
+                self.bind(path), self.bind(reason), self.bind(constraint)
+            ))
+        elif self.model:
+            self.emit(depth, 'return {}, None'.format(self.bind(reason)))
+        else:
+            self.emit(depth, 'return {}'.format(self.bind(reason)))
+
+    def get_conditions(self, rule):
+        kind, spec = rule
+        if kind == 'field':
+            if spec._first_defined('_get_source_checks', '_get_checks', 'validate') == '_get_source_checks':
+                return spec._get_source_checks(self.bind)
+
+            return [('validate', '{}(value) is not None'.format(self.bind(spec.compile())))]
+        if kind == 'type':
+            return [('type', 'type(value) is not {}'.format(self.bind(spec)))]
+
+        return []
+
+    def add_tree(self, tree, src='src0', depth=1, path=()):
+        # model object 변수는 src 변수와 번호를 공유(src0 -> obj0)
+        obj = 'obj' + src[3:]
+        if self.model:
+            self.emit(depth, '{} = {}()'.format(obj, self.bind(make_model_class(path[-1] if path else 'Payload', tree))))
+
+        for key, node in tree.items():
+            key_path = path + (key,)
+            key_source = self.bind(key)
+            required = node.children is not None or any(_get_rule_options(rule)[0] for rule in node.rules)
+
+            if not required:
+                if self.model:
+                    self.emit(depth, '{}.{} = None'.format(obj, key))
+
+                self.emit(depth, 'if {} in {}:'.format(key_source, src))
+                body_depth = depth + 1
+            elif self.collect_errors:
+                self.emit(depth, 'if {} not in {}:'.format(key_source, src))
+                self.fail(depth + 1, key_path, KEY_MISSING, 'required')
+                self.emit(depth, 'else:')
+                body_depth = depth + 1
+            else:
+                self.emit(depth, 'if {} not in {}:'.format(key_source, src))
+                self.fail(depth + 1, key_path, KEY_MISSING, 'required')
+                body_depth = depth
+
+            self.emit(body_depth, 'value = {}[{}]'.format(src, key_source))
+
+            for rule in node.rules:
+                _, allow_null, reason = _get_rule_options(rule)
+                conditions = self.get_conditions(rule)
+                rule_depth = body_depth
+
+                if allow_null and conditions:
+                    self.emit(rule_depth, 'if value is not None:')
+                    rule_depth += 1
+
+                for i, (constraint, condition) in enumerate(conditions):
+                    # 모든 error를 모을 때도 한 rule에서는 처음 실패한 constraint만 보고
+                    keyword = 'elif' if self.collect_errors and i else 'if'
+                    self.emit(rule_depth, '{} {}:'.format(keyword, condition))
+                    self.fail(rule_depth + 1, key_path, reason, constraint)
+
+            if self.model and node.children is None:
+                self.emit(body_depth, '{}.{} = value'.format(obj, key))
+
+            if node.children is not None:
+                child = 'src{}'.format(self.container_count)
+                self.container_count += 1
+
+                self.emit(body_depth, '{} = value'.format(child))
+                self.emit(body_depth, 'if not isinstance({}, dict):'.format(child))
+                self.fail(body_depth + 1, key_path, node.container_reason, 'type')
+
+                if self.model:
+                    self.add_tree(node.children, child, body_depth, key_path)
+                    self.emit(body_depth, '{}.{} = obj{}'.format(obj, key, child[3:]))
+                elif self.collect_errors:
+                    self.emit(body_depth, 'else:')
+                    if not node.children:
+                        self.emit(body_depth + 1, 'pass')
+                    self.add_tree(node.children, child, body_depth + 1, key_path)
+                else:
+                    self.add_tree(node.children, child, body_depth, key_path)
+
+    def build(self, root_failure_reason):
+        body = self.lines
+        self.lines = []
+
+        if self.collect_errors:
+            root_failure = "[{{'path': (), 'code': {}, 'constraint': 'type'}}]".format(self.bind(root_failure_reason))
+        elif self.model:
+            root_failure = '{}, None'.format(self.bind(root_failure_reason))
+        else:
+            root_failure = self.bind(root_failure_reason)
+
+        self.emit(0, 'def validate_payload(src0, {}isinstance=isinstance, len=len, type=type, dict=dict):'.format(
+            ''.join('{0}={0}, '.format(name) for name in self.namespace)
+        ))
+        self.emit(1, 'if not isinstance(src0, dict):')
+        self.emit(2, 'return {}'.format(root_failure))
+
+        if self.collect_errors:
+            self.emit(1, 'errors = []')
+            self.emit(1, 'append = errors.append')
+            self.lines.extend(body)
+            self.emit(1, 'return errors')
+        elif self.model:
+            self.lines.extend(body)
+            self.emit(1, 'return None, obj0')
+        else:
+            self.lines.extend(body)
+
+        source = '\n'.join(self.lines) + '\n'
+        filename = '<flask_validation codegen {}>'.format(id(self))
+        # traceback에서 생성된 source가 보이도록 linecache에 등록
+        linecache.cache[filename] = (len(source), None, source.splitlines(True), filename)
+
+        namespace = dict(self.namespace)
+        exec(compile(source, filename, 'exec'), namespace)
+
+        validate_payload = namespace['validate_payload']
+        validate_payload.source = source
+
+        return validate_payload
+
+
+def compile_payload(required_keys: list=None, key_type_mapping: dict=None, key_field_mapping: dict=None,
+                    engine: str='interpreted', collect_errors: bool=False, model: bool=False):
+    """
+    Compiles the specs of ``validate_keys``, ``validate_common`` and ``validate_with_fields`` into a single validation function
+
+    The specs are walked once, here, and merged by key path, so a payload is traversed only once however many specs are given.
+    The returned function takes a payload and returns None if it is valid, or the failure reason
+    (``KEY_MISSING``, ``INVALID_TYPE`` or ``VALIDATION_FAILURE``, see ``ABORT_CODE_OPTIONS`` for the abort code of each).
+
+    If ``collect_errors`` is True, the returned function checks the whole payload instead of stopping at the first failure,
+    and returns a list of errors(empty if valid) of this form ``{'path': <key path tuple>, 'code': <failure reason>, 'constraint': <constraint name>}``.
+
+    If ``model`` is True, the returned function also builds an instance of a slotted ``Model`` class generated from the specs
+    while validating, and returns ``(failure reason, instance)``. The instance is None if the payload is invalid.
+    Every key must then be a valid Python identifier. It can not be combined with ``collect_errors``.
+
+    With the ``interpreted`` engine, nested dictionaries are flattened into a list of steps
+    which refer to their parent object by index, and each field is compiled into a check bound to its active constraints.
+    With the ``codegen`` engine, Python source of a single function with straight-line checks is generated and executed.
+    The generated source is available as the ``source`` attribute of the returned function.
+
+    :param required_keys: key list like ``validate_keys``
+    :param key_type_mapping: A dictionary like ``validate_common``
+    :param key_field_mapping: A dictionary like ``validate_with_fields``
+    :param engine: ``interpreted`` or ``codegen``
+    :param collect_errors: collect all errors instead of returning the first failure reason
+    :param model: build a ``Model`` instance of the payload while validating
+    """
+    if collect_errors and model:
+        raise ValueError('collect_errors and model can not be combined')
+
+    tree = {}
+
+    if required_keys:
+        _merge_keys(tree, required_keys)
+    if key_type_mapping:
+        _merge_types(tree, key_type_mapping)
+    if key_field_mapping:
+        _merge_fields(tree, key_field_mapping)
+
+    if engine == 'interpreted':
+        builder = _Plan(collect_errors, model)
+    elif engine == 'codegen':
+        builder = _CodeGenerator(collect_errors, model)
+    else:
+        raise ValueError('Unknown engine {!r}, expected one of {}'.format(engine, ENGINES))
+
+    builder.add_tree(tree)
+
+    if key_type_mapping:
+        return builder.build(INVALID_TYPE)
+    if key_field_mapping:
+        return builder.build(VALIDATION_FAILURE)
+
+    return builder.build(KEY_MISSING)
+
+
+def compile_keys(required_keys: list, engine: str='interpreted', collect_errors: bool=False):
+    """
+    Compiles a ``validate_keys`` key list into a single validation function. See ``compile_payload``
+    """
+    return compile_payload(required_keys=required_keys, engine=engine, collect_errors=collect_errors)
+
+
+def compile_types(key_type_mapping: dict, engine: str='interpreted', collect_errors: bool=False):
+    """
+    Compiles a ``validate_common`` mapping into a single validation function. See ``compile_payload``
+    """
+    return compile_payload(key_type_mapping=key_type_mapping, engine=engine, collect_errors=collect_errors)
+
+
+def compile_fields(key_field_mapping: dict, engine: str='interpreted', collect_errors: bool=False, model: bool=False):
+    """
+    Compiles a ``validate_with_fields`` mapping into a single validation function. See ``compile_payload``
+    """
+    return compile_payload(key_field_mapping=key_field_mapping, engine=engine, collect_errors=collect_errors, model=model)
+
+
+def _build_partial_index(mapping):
+    # {key: (allow_null, check, nested index)}
+    index = {}
+
+    for key, field in mapping.items():
+        if isinstance(field, _BaseField):
+            index[key] = (field.allow_null, field.compile(), None)
+        elif isinstance(field, dict):
+            index[key] = (False, _check_dict, _build_partial_index(field))
+
+    return index
+
+
+def compile_partial(key_field_mapping: dict, collect_errors: bool=False, reject_unknown: bool=False):
+    """
+    Compiles a ``validate_with_fields`` mapping into a validation function checking only the keys present in the payload,
+    for partial updates(e.g. ``PATCH``)
+
+    ``required`` of the fields is ignored. The mapping is indexed by key here, and each object of the payload is checked
+    by iterating over its keys and looking them up in the index, so the cost is proportional to the payload,
+    not the mapping. Without ``reject_unknown``, the smaller of the object and the index is iterated.
+    The returned function is like ``compile_payload``, and with ``reject_unknown``, a key not in the mapping is
+    a ``VALIDATION_FAILURE`` with the ``unknown`` constraint.
+
+    :param key_field_mapping: A dictionary like ``validate_with_fields``
+    :param collect_errors: collect all errors instead of returning the first failure reason
+    :param reject_unknown: fail on keys which are not in the mapping
+    """
+    root_index = _build_partial_index(key_field_mapping)
+
+    def present_items(src, index):
+        if reject_unknown or len(src) <= len(index):
+            return src.items()
+
+        # payload가 mapping보다 크면 mapping 쪽을 순회
+        return [(key, src[key]) for key in index if key in src]
+
+    if collect_errors:
+        def validate_object(src, index, path, errors):
+            for key, value in present_items(src, index):
+                entry = index.get(key)
+                if entry is None:
+                    if reject_unknown:
+                        errors.append({'path': path + (key,), 'code': VALIDATION_FAILURE, 'constraint': 'unknown'})
+                    continue
+
+                allow_null, check, children = entry
+                if allow_null and value is None:
+                    continue
+
+                constraint = check(value)
+                if constraint is not None:
+                    errors.append({'path': path + (key,), 'code': VALIDATION_FAILURE, 'constraint': constraint})
+                elif children is not None:
+                    validate_object(value, children, path + (key,), errors)
+
+        def validate_partial(payload):
+            if not isinstance(payload, dict):
+                return [{'path': (), 'code': VALIDATION_FAILURE, 'constraint': 'type'}]
+
+            errors = []
+            validate_object(payload, root_index, (), errors)
+
+            return errors
+    else:
+        def validate_object(src, index):
+            for key, value in present_items(src, index):
+                entry = index.get(key)
+                if entry is None:
+                    if reject_unknown:
+                        return VALIDATION_FAILURE
+                    continue
+
+                allow_null, check, children = entry
+                if allow_null and value is None:
+                    continue
+
+                if check(value) is not None:
+                    return VALIDATION_FAILURE
+
+                if children is not None:
+                    failure_reason = validate_object(value, children)
+                    if failure_reason is not None:
+                        return failure_reason
+
+        def validate_partial(payload):
+            if not isinstance(payload, dict):
+                return VALIDATION_FAILURE
+
+            return validate_object(payload, root_index)
+
+    return validate_partial
+
+
+def compile_many(key_field_mapping: dict, engine: str='interpreted', collect_errors: bool=False, max_errors: int=None):
+    """
+    Compiles a ``validate_with_fields`` mapping into a validation function for a list of records
+
+    The returned function takes a payload and returns a list of errors(empty if valid) with the index of the record
+    at the head of the path. Without ``collect_errors``, each invalid record is reported once
+    with the failure reason and no constraint(``{'path': (<index>,), 'code': <failure reason>, 'constraint': None}``),
+    which keeps the loop over valid records as tight as possible.
+    With ``collect_errors``, every error of every record is reported like ``compile_payload``.
+
+    :param key_field_mapping: A dictionary for record check with this form ``{<key name>: <field class>}``
+    :param engine: ``interpreted`` or ``codegen``
+    :param collect_errors: collect all errors of each record instead of the first failure reason
+    :param max_errors: stop validating after this many errors
+    """
+    validator = compile_fields(key_field_mapping, engine, collect_errors)
+
+    def validate_records(records):
+        if not isinstance(records, list):
+            return [{'path': (), 'code': VALIDATION_FAILURE, 'constraint': 'type'}]
+
+        errors = []
+
+        for index, record in enumerate(records):
+            result = validator(record)
+            if not result:
+                continue
+
+            if collect_errors:
+                errors.extend(
+                    {'path': (index,) + error['path'], 'code': error['code'], 'constraint': error['constraint']}
+                    for error in result
+                )
+            else:
+                errors.append({'path': (index,), 'code': result, 'constraint': None})
+
+            if max_errors is not None and len(errors) >= max_errors:
+                del errors[max_errors:]
+                break
+
+        return errors
+
+    return validate_records
+
+
+def compile_multidict(key_field_mapping: dict, multi_valued: bool=True):
+    """
+    Compiles a flat mapping of fields into a parser of string values, like ``request.args`` or ``request.form``
+
+    The returned function takes a ``MultiDict``(or a dictionary without ``multi_valued``)
+    and returns ``(failure_reason, values)``, with ``values`` the typed values of the present keys.
+    Each value is converted with ``coerce`` of its field and checked with the compiled field.
+    ``ListField`` takes every value of a repeated key and other fields the first one.
+    An empty value is None for a field with ``allow_null``.
+
+    :param key_field_mapping: A dictionary with this form ``{<key name>: <field instance>}``
+    :param multi_valued: whether the parsed mapping can hold several values per key, which ``ListField`` requires
+    """
+    entries = []
+
+    for key, field in key_field_mapping.items():
+        if not isinstance(field, _BaseField):
+            raise ValueError('Field of {!r} must be a field instance, since the parsed values are flat'.format(key))
+
+        is_list = isinstance(field, ListField)
+        if is_list and (not multi_valued or isinstance(field.item, dict)):
+            raise ValueError('ListField of {!r} can not be parsed from {}'.format(
+                key, 'a dictionary of records' if multi_valued else 'single values'
+            ))
+
+        entries.append((key, is_list, field.required, field.allow_null, field.coerce, field.compile()))
+
+    entries = tuple(entries)
+
+    def parse(multidict):
+        values = {}
+
+        for key, is_list, required, allow_null, coerce, check in entries:
+            value = multidict.getlist(key) if is_list else multidict.get(key)
+
+            if value is None or (is_list and not value):
+                if required:
+                    return KEY_MISSING, None
+                continue
+
+            if allow_null and value == '':
+                values[key] = None
+                continue
+
+            try:
+                value = coerce(value)
+            except (ValueError, TypeError):
+                return VALIDATION_FAILURE, None
+
+            if check(value) is not None:
+                return VALIDATION_FAILURE, None
+
+            values[key] = value
+
+        return None, values
+
+    return parse
+
+
+# 같은 schema를 쓰는 endpoint(blueprint)끼리 validator를 공유하기 위한 process-wide cache
+_jsonschema_validators_by_id = {}
+_jsonschema_validators_by_content = {}
+
+
+def compile_jsonschema(jsonschema: dict):
+    """
+    Returns a validator instance for ``jsonschema``, checking the schema against its metaschema only once
+
+    The validator class is picked from the schema's ``$schema`` (latest draft if absent).
+    Validators are cached process-wide by schema identity and by schema content,
+    so endpoints sharing a schema(even as equal copies) share one validator.
+
+    :param jsonschema: jsonschema
+    """
+    validator = _jsonschema_validators_by_id.get(id(jsonschema))
+    if validator is not None and validator.schema is jsonschema:
+        return validator
+
+    try:
+        content_key = json.dumps(jsonschema, sort_keys=True)
+    except (TypeError, ValueError):
+        content_key = None
+
+    validator = _jsonschema_validators_by_content.get(content_key)
+    if validator is None:
+        cls = validator_for(jsonschema)
+        cls.check_schema(jsonschema)
+        validator = cls(jsonschema)
+
+        if content_key is not None:
+            _jsonschema_validators_by_content[content_key] = validator
+
+    if validator.schema is jsonschema:
+        # validator가 schema를 참조하고 있으므로 id가 재사용될 일이 없음
+        _jsonschema_validators_by_id[id(jsonschema)] = validator
+
+    return validator
@@ -0,0 +1,91 @@
+from flask import current_app, request
+from werkzeug.exceptions import BadRequest
+
+from .compiler import ABORT_CODE_OPTIONS
+from .payload import exceeds_limits
+
+_missing = object()
+
+
+class ValidationContext(object):
+    """
+    Per-request state shared by stacked validation decorators
+
+    It is created by the outermost decorator of a request(see ``get_context``), and holds the parsed payload,
+    the resolved config and the specs already proven valid for this request, so that a stack of decorators
+    costs one parse and one config lookup.
+    """
+    def __init__(self):
+        self.state = current_app.extensions.get('flask_validation')
+        self.is_json = request.is_json
+        self.skip_proven = current_app.config.get('VALIDATION_SKIP_PROVEN', True)
+        self.fast_rejection = self.state is not None and self.state.fast_rejection
+        # 이 request에서 이미 통과한 spec들. 같은 spec을 가진 안쪽 decorator는 검사를 생략
+        self.proven = set()
+        self.metrics = self.state.metrics if self.state is not None and self.state.metrics.enabled else None
+        self.profiler = self.state.profiler if self.state is not None and self.state.profiler.rate else None
+        # 마지막으로 abort한 failure reason. metric 기록용
+        self.failure_reason = None
+        self._payload = _missing
+        self._abort_codes = None
+        # (max_depth, max_keys)별 exceeds_limits 결과
+        self._limits = {}
+
+    @property
+    def payload(self):
+        if self._payload is _missing:
+            if self.state is None or self.state.json_decoder is None:
+                self._payload = request.json
+            else:
+                try:
+                    self._payload = self.state.json_decoder(request.get_data())
+                except self.state.json_decode_errors:
+                    raise BadRequest('Failed to decode JSON object')
+
+        return self._payload
+
+    def get_abort_code(self, failure_reason):
+        if self._abort_codes is None:
+            config = current_app.config
+            self._abort_codes = {reason: config[option] for reason, option in ABORT_CODE_OPTIONS.items()}
+
+        return self._abort_codes[failure_reason]
+
+    def exceeds_limits(self, max_depth, max_keys):
+        """
+        Returns ``exceeds_limits`` of the body, scanned once per request for the same limits
+        """
+        result = self._limits.get((max_depth, max_keys))
+        if result is None:
+            result = self._limits[max_depth, max_keys] = exceeds_limits(request.get_data(), max_depth, max_keys)
+
+        return result
+
+    def is_proven(self, spec_key):
+        return self.skip_proven and spec_key in self.proven
+
+    def prove(self, spec_key):
+        self.proven.add(spec_key)
+
+
+def get_context():
+    """
+    Returns the ``ValidationContext`` of the current request, creating it on first access
+    """
+    # g는 app context가 이미 push된 경우 request 간에 공유될 수 있으므로 request environ에 저장
+    context = request.environ.get('flask_validation.context')
+    if context is None:
+        context = request.environ['flask_validation.context'] = ValidationContext()
+
+    return context
+
+
+def get_json():
+    """
+    Returns the JSON payload of the current request
+
+    With ``VALIDATION_JSON_DECODER`` configured, the raw body is decoded with it once per request and cached,
+    so stacked decorators and the view share a single parse. Otherwise, it is the same as ``request.json``.
+    Aborts with 400 if the body is malformed.
+    """
+    return get_context().payload
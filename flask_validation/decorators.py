@@ -1,30 +1,204 @@
+import asyncio
+import contextvars
+import inspect
+import random
 from functools import wraps
 
-from jsonschema import validate
-from jsonschema.exceptions import ValidationError
-from flask import abort, request, current_app
+from flask import abort, current_app, json, jsonify, request
+from werkzeug.exceptions import BadRequest
 
-from .fields import _BaseField
+from .compiler import (
+    INVALID_CONTENT_TYPE, PAYLOAD_TOO_LARGE, VALIDATION_ERROR,
+    compile_fields, compile_jsonschema, compile_keys, compile_many, compile_multidict, compile_partial, compile_payload,
+    compile_types
+)
+from .context import get_context
+from .parallel import ParallelValidator
+from .rejection import Rejection
+from .response import _is_field_mapping, compile_response_check
+from .schema import UnsupportedSchema, jsonschema_to_fields
+from .streaming import STREAM_FORMATS
+from .warmup import ValidationSpec
 
 
-def json_required(fn):
+class _SpecKey(object):
     """
-    A decorator to check header type is ``application/json``
+    Identifies a spec(e.g. a mapping) in ``ValidationContext.proven`` by identity, referencing it so that
+    its id is not reused by another spec while the decorator lives
+    """
+    __slots__ = ('kind', 'spec', 'options')
 
-    if you decorate endpoint with this, it will ensure that the request has a valid payload type before access endpoint
-    if header's content type is not ``application/json``, abort the ``invalid_content_type_abort_code``
+    def __init__(self, kind, spec, options=()):
+        self.kind = kind
+        self.spec = spec
+        self.options = options
+
+    def __hash__(self):
+        return hash((self.kind, id(self.spec), self.options))
+
+    def __eq__(self, other):
+        return isinstance(other, _SpecKey) and self.kind == other.kind and self.spec is other.spec and self.options == other.options
+
+
+def _abort(failure_reason):
+    context = get_context()
+    context.failure_reason = failure_reason
+
+    if context.fast_rejection:
+        raise Rejection(failure_reason)
+
+    abort(context.get_abort_code(failure_reason))
+
+
+def _abort_with_errors(errors):
+    # 첫 번째 error의 failure reason으로 abort code 결정
+    context = get_context()
+    context.failure_reason = errors[0]['code']
+
+    if context.fast_rejection:
+        raise Rejection(context.failure_reason, errors)
+
+    response = jsonify(errors=errors)
+    response.status_code = context.get_abort_code(context.failure_reason)
+
+    abort(response)
+
+
+def _read_body(max_body_bytes):
+    """
+    Returns the size of a body sent without Content-Length(e.g. chunked), reading at most ``max_body_bytes + 1`` bytes
     """
+    data = getattr(request, '_cached_data', None)
+    if data is not None:
+        return len(data)
+
+    chunks = []
+    size = 0
+    while size <= max_body_bytes:
+        chunk = request.stream.read(max_body_bytes + 1 - size)
+        if not chunk:
+            break
+
+        chunks.append(chunk)
+        size += len(chunk)
+
+    if size <= max_body_bytes:
+        # body 전체를 읽었으므로 request.get_data()가 다시 읽지 않도록 werkzeug의 cache에 저장
+        request._cached_data = b''.join(chunks)
+
+    return size
+
+
+def _load_json(context, max_body_bytes=None, max_depth=None, max_keys=None):
+    """
+    Returns the JSON payload of the context, aborting ``payload_too_large_abort_code`` before parsing if the body exceeds the limits
+    """
+    if max_body_bytes is not None:
+        content_length = request.content_length
+        if content_length is None:
+            # Content-Length 없이(chunked) 보내진 경우 limit보다 1 byte 더 읽어서 확인
+            content_length = _read_body(max_body_bytes)
+
+        if content_length > max_body_bytes:
+            _abort(PAYLOAD_TOO_LARGE)
+
+    if (max_depth is not None or max_keys is not None) and context.exceeds_limits(max_depth, max_keys):
+        _abort(PAYLOAD_TOO_LARGE)
+
+    return context.payload
+
+
+def _rejection_response(rejection):
+    context = get_context()
+    code = context.get_abort_code(rejection.failure_reason)
+
+    return context.state.rejections.response(
+        current_app.response_class, rejection.failure_reason, code, rejection.errors, json.dumps
+    )
+
+
+async def _run_check(check, kwargs):
+    state = current_app.extensions.get('flask_validation')
+
+    if state is not None and state.offload_threshold is not None \
+            and (request.content_length or 0) >= state.offload_threshold:
+        # executor thread에서도 같은 request context를 사용하도록 context variable을 복사
+        context = contextvars.copy_context()
+        await asyncio.get_running_loop().run_in_executor(state.get_executor(), context.run, check, kwargs)
+    else:
+        check(kwargs)
+
+
+def _wrap(fn, check, offload=True, spec=None):
+    """
+    Wraps a view function to run ``check(kwargs)`` before it
+
+    ``check`` aborts if the request is invalid, and may add keyword arguments for the view.
+    With ``VALIDATION_FAST_REJECTION``, it raises ``Rejection`` instead, and the wrapper returns a prebuilt JSON response
+    without calling the view.
+    ``spec`` is attached to the wrapper as ``__validation_spec__``, for ``Validator`` to warm it up.
+    If ``ValidationMetrics`` of ``Validator`` is enabled, ``check`` is run through it to be recorded.
+    For ``async def`` views, the wrapper is a coroutine function awaiting the view, and if ``offload`` is set,
+    ``check`` runs in the executor of ``Validator`` for bodies over ``VALIDATION_OFFLOAD_THRESHOLD`` bytes
+    so that the event loop is not blocked.
+    """
+    # metric label로 사용할 decorator 이름. check는 각 decorator 안에서 정의됨
+    decorator = check.__qualname__.split('.')[0]
+
+    spec = spec or ValidationSpec()
+    spec.decorator = decorator
+
+    def run_check(kwargs):
+        metrics = get_context().metrics
+        if metrics is None:
+            check(kwargs)
+        else:
+            metrics.run(decorator, check, kwargs)
+
+    if inspect.iscoroutinefunction(fn):
+        @wraps(fn)
+        async def async_wrapper(*args, **kwargs):
+            try:
+                if offload:
+                    await _run_check(run_check, kwargs)
+                else:
+                    run_check(kwargs)
+            except Rejection as rejection:
+                return _rejection_response(rejection)
+
+            return await fn(*args, **kwargs)
+
+        async_wrapper.__validation_spec__ = spec
+        return async_wrapper
+
     @wraps(fn)
     def wrapper(*args, **kwargs):
-        invalid_content_type_abort_code = current_app.config['INVALID_CONTENT_TYPE_ABORT_CODE']
-        if not request.is_json:
-            abort(invalid_content_type_abort_code)
+        try:
+            run_check(kwargs)
+        except Rejection as rejection:
+            return _rejection_response(rejection)
 
         return fn(*args, **kwargs)
+
+    wrapper.__validation_spec__ = spec
     return wrapper
 
 
-def validate_keys(required_keys):
+def json_required(fn):
+    """
+    A decorator to check header type is ``application/json``
+
+    if you decorate endpoint with this, it will ensure that the request has a valid payload type before access endpoint
+    if header's content type is not ``application/json``, abort the ``invalid_content_type_abort_code``
+    """
+    def check(kwargs):
+        if not get_context().is_json:
+            _abort(INVALID_CONTENT_TYPE)
+
+    return _wrap(fn, check, offload=False)
+
+
+def validate_keys(required_keys, max_body_bytes: int=None, max_depth: int=None, max_keys: int=None):
     """
     A decorator to check request payload keys
 
@@ -35,33 +209,33 @@ def validate_keys(required_keys):
     like this ``['a', 'b', {'c': ['q' ,'z']}]``
 
     :param required_keys: key list to check request body's JSON
+    :param max_body_bytes: abort ``payload_too_large_abort_code`` if the body is larger than this, checked before parsing
+    :param max_depth: abort ``payload_too_large_abort_code`` if the payload nests deeper than this, checked before parsing
+    :param max_keys: abort ``payload_too_large_abort_code`` if the payload has more object keys than this, checked before parsing
     """
     # ['a', 'b', {'c': ['q' ,'z']}]
 
-    def _validate_keys(src, keys, key_missing_abort_code):
-        for key in keys:
-            if isinstance(key, str):
-                if key not in src:
-                    abort(key_missing_abort_code)
-            elif isinstance(key, dict):
-                for k, v in key.items():
-                    if k not in src:
-                        abort(key_missing_abort_code)
-                    _validate_keys(src[k], v, key_missing_abort_code)
+    validator = compile_keys(required_keys) if required_keys else None
+    spec_key = _SpecKey('keys', required_keys)
 
-    def decorator(fn):
-        @wraps(fn)
-        def wrapper(*args, **kwargs):
-            key_missing_abort_code = current_app.config['KEY_MISSING_ABORT_CODE']
-            if request.is_json and required_keys:
-                _validate_keys(request.json, required_keys, key_missing_abort_code)
+    def check(kwargs):
+        context = get_context()
+        if context.is_json and validator is not None:
+            payload = _load_json(context, max_body_bytes, max_depth, max_keys)
 
-            return fn(*args, **kwargs)
-        return wrapper
+            if not context.is_proven(spec_key):
+                failure_reason = validator(payload)
+                if failure_reason is not None:
+                    _abort(failure_reason)
+
+                context.prove(spec_key)
+
+    def decorator(fn):
+        return _wrap(fn, check)
     return decorator
 
 
-def validate_common(key_type_mapping: dict):
+def validate_common(key_type_mapping: dict, engine: str='interpreted', max_body_bytes: int=None, max_depth: int=None, max_keys: int=None):
     """
     A decorator to check request payload keys and type
 
@@ -73,37 +247,36 @@ def validate_common(key_type_mapping: dict):
 
 
     :param key_type_mapping: A dictionary for payload check with this form ``{<key name>: <type class>}``
+    :param engine: Validation engine used by ``compile_types``, ``interpreted`` or ``codegen``
+    :param max_body_bytes: abort ``payload_too_large_abort_code`` if the body is larger than this, checked before parsing
+    :param max_depth: abort ``payload_too_large_abort_code`` if the payload nests deeper than this, checked before parsing
+    :param max_keys: abort ``payload_too_large_abort_code`` if the payload has more object keys than this, checked before parsing
     """
     # {'a': str, 'b': int, 'c': {'d': int, 'e': str}}
 
-    def validate_key_and_type(src, mapping, key_missing_abort_code, invalid_type_abort_code):
-        for key, typ in mapping.items():
-            if key not in src:
-                abort(key_missing_abort_code)
+    validator = compile_types(key_type_mapping, engine) if key_type_mapping else None
+    spec_key = _SpecKey('types', key_type_mapping)
+    spec = ValidationSpec([key_type_mapping])
 
-            if isinstance(typ, type):
-                if type(src[key]) is not typ:
-                    abort(invalid_type_abort_code)
-            elif isinstance(typ, dict):
-                if not isinstance(src[key], dict):
-                    abort(invalid_type_abort_code)
+    def check(kwargs):
+        context = get_context()
+        if context.is_json and validator is not None:
+            payload = _load_json(context, max_body_bytes, max_depth, max_keys)
 
-                validate_key_and_type(src[key], typ, key_missing_abort_code, invalid_type_abort_code)
+            if not context.is_proven(spec_key):
+                failure_reason = validator(payload)
+                if failure_reason is not None:
+                    _abort(failure_reason)
 
-    def decorator(fn):
-        @wraps(fn)
-        def wrapper(*args, **kwargs):
-            key_missing_abort_code = current_app.config['KEY_MISSING_ABORT_CODE']
-            invalid_type_abort_code = current_app.config['INVALID_TYPE_ABORT_CODE']
-            if request.is_json and key_type_mapping:
-                validate_key_and_type(request.json, key_type_mapping, key_missing_abort_code, invalid_type_abort_code)
+                context.prove(spec_key)
 
-            return fn(*args, **kwargs)
-        return wrapper
+    def decorator(fn):
+        return _wrap(fn, check, spec=spec)
     return decorator
 
 
-def validate_with_fields(key_field_mapping: dict):
+def validate_with_fields(key_field_mapping: dict, engine: str='interpreted', max_body_bytes: int=None, max_depth: int=None, max_keys: int=None,
+                         model_kwarg: str=None, partial: bool=False, reject_unknown: bool=False):
     """
     A decorator to check request payload with Field classes in fields.py
 
@@ -113,69 +286,427 @@ def validate_with_fields(key_field_mapping: dict):
     Nested JSON processing is possible by inserting the dictionary in the  ``required_keys``
     like this ``{'a': StringField(allow_empty=False), 'b': IntField(min_value=0), 'c': {'d': BooleanField()}}``
 
+    If ``model_kwarg`` is given, a slotted ``Model`` instance of the payload is built while validating
+    and passed to the view in that keyword argument(None if the request is not JSON).
+    Nested dictionaries become nested instances, and missing optional keys are None.
+
+    With ``partial``, for partial updates(e.g. ``PATCH``), only the keys present in the payload are checked,
+    as if every field was optional, at a cost proportional to the payload(see ``compile_partial``).
+    It can not be combined with ``model_kwarg``, and ``engine`` is not used.
+
+    With ``VALIDATION_PROFILE_RATE``, the cost of each field and constraint is profiled on a sample of requests
+    (see ``FieldProfiler``).
+
     :param key_field_mapping: A dictionary for payload check with this form ``{<key name>: <field class>}``
+    :param engine: Validation engine used by ``compile_fields``, ``interpreted`` or ``codegen``
+    :param max_body_bytes: abort ``payload_too_large_abort_code`` if the body is larger than this, checked before parsing
+    :param max_depth: abort ``payload_too_large_abort_code`` if the payload nests deeper than this, checked before parsing
+    :param max_keys: abort ``payload_too_large_abort_code`` if the payload has more object keys than this, checked before parsing
+    :param model_kwarg: name of the keyword argument to pass the ``Model`` instance with
+    :param partial: check only the keys present in the payload
+    :param reject_unknown: with ``partial``, abort ``validation_failure_code`` on keys which are not in the mapping
     """
     # {'a': StringField(allow_empty=False), 'b': IntField(min_value=0), 'c': {'d': BooleanField()}}
+    if partial and model_kwarg is not None:
+        raise ValueError('partial and model_kwarg can not be combined')
+
+    # mapping은 decorate 시점에 한 번만 compile
+    if not key_field_mapping:
+        validator = None
+    elif partial:
+        validator = compile_partial(key_field_mapping, reject_unknown=reject_unknown)
+    else:
+        validator = compile_fields(key_field_mapping, engine, model=model_kwarg is not None)
+
+    # partial 검사는 전체 검사를 대신할 수 없으므로 spec을 구분
+    spec_key = _SpecKey('partial', key_field_mapping, (reject_unknown,)) if partial else _SpecKey('fields', key_field_mapping)
+    spec = ValidationSpec([key_field_mapping])
+
+    def check(kwargs):
+        context = get_context()
+        if context.is_json and validator is not None:
+            payload = _load_json(context, max_body_bytes, max_depth, max_keys)
+
+            if not context.is_proven(spec_key):
+                if context.profiler is not None and context.profiler.sample():
+                    context.profiler.profile(key_field_mapping, payload)
 
-    def _validate_with_fields(src, mapping, key_missing_abort_code, validation_failure_abort_code):
-        for key, field in mapping.items():
-            if isinstance(field, _BaseField):
-                if field.required and key not in src:
-                    # required일 때만 not in에 대해 abort
-                    abort(key_missing_abort_code)
+                failure_reason = validator(payload)
+                if failure_reason is not None:
+                    _abort(failure_reason)
 
-                if key in src:
-                    # required가 True던 False던, 들어 있으면 validate
-                    value = src[key]
+                context.prove(spec_key)
 
-                    if field.allow_null:
-                        if value is None:
-                            # nullable하고, 실제로 value가 null이라면 validation 필요 x
-                            continue
+    def check_model(kwargs):
+        instance = None
 
-                    if field.validate(value) is False:
-                        abort(validation_failure_abort_code)
-            elif isinstance(field, dict):
-                if key not in src:
-                    abort(key_missing_abort_code)
+        context = get_context()
+        if context.is_json and validator is not None:
+            payload = _load_json(context, max_body_bytes, max_depth, max_keys)
 
-                if not isinstance(src[key], dict):
-                    abort(validation_failure_abort_code)
+            if context.profiler is not None and context.profiler.sample():
+                context.profiler.profile(key_field_mapping, payload)
 
-                _validate_with_fields(src[key], field, key_missing_abort_code, validation_failure_abort_code)
+            # model은 항상 만들어야 하므로 proven이어도 검사
+            failure_reason, instance = validator(payload)
+            if failure_reason is not None:
+                _abort(failure_reason)
+
+            context.prove(spec_key)
+
+        kwargs[model_kwarg] = instance
 
     def decorator(fn):
-        @wraps(fn)
-        def wrapper(*args, **kwargs):
-            key_missing_abort_code = current_app.config['KEY_MISSING_ABORT_CODE']
-            validation_failure_abort_code = current_app.config['VALIDATION_FAILURE_ABORT_CODE']
-            if request.is_json and key_field_mapping:
-                _validate_with_fields(request.json, key_field_mapping, key_missing_abort_code, validation_failure_abort_code)
+        return _wrap(fn, check if model_kwarg is None else check_model, spec=spec)
+    return decorator
 
-            return fn(*args, **kwargs)
-        return wrapper
+
+def validate_payload(required_keys: list=None, key_type_mapping: dict=None, key_field_mapping: dict=None,
+                     collect_errors: bool=False, engine: str='interpreted',
+                     max_body_bytes: int=None, max_depth: int=None, max_keys: int=None):
+    """
+    A decorator combining ``validate_keys``, ``validate_common`` and ``validate_with_fields``
+
+    The specs are merged into one validator, so the request payload is traversed once instead of once per stacked decorator.
+    Without ``collect_errors``, it aborts like the combined decorators on the first failure.
+    With ``collect_errors``, the whole payload is checked and all errors are responded at once as JSON like this
+    ``{"errors": [{"path": ["c", "d"], "code": "invalid_type", "constraint": "type"}]}``,
+    with the abort code of the first error.
+
+    :param required_keys: key list like ``validate_keys``
+    :param key_type_mapping: A dictionary like ``validate_common``
+    :param key_field_mapping: A dictionary like ``validate_with_fields``
+    :param collect_errors: respond all errors instead of aborting on the first failure
+    :param engine: Validation engine used by ``compile_payload``, ``interpreted`` or ``codegen``
+    :param max_body_bytes: abort ``payload_too_large_abort_code`` if the body is larger than this, checked before parsing
+    :param max_depth: abort ``payload_too_large_abort_code`` if the payload nests deeper than this, checked before parsing
+    :param max_keys: abort ``payload_too_large_abort_code`` if the payload has more object keys than this, checked before parsing
+    """
+    validator = compile_payload(required_keys, key_type_mapping, key_field_mapping, engine, collect_errors)
+    spec_keys = [
+        _SpecKey(kind, spec) for kind, spec in (('keys', required_keys), ('types', key_type_mapping), ('fields', key_field_mapping))
+        if spec
+    ]
+    spec = ValidationSpec([key_type_mapping, key_field_mapping])
+
+    def check(kwargs):
+        context = get_context()
+        if context.is_json:
+            payload = _load_json(context, max_body_bytes, max_depth, max_keys)
+
+            if not all(context.is_proven(spec_key) for spec_key in spec_keys):
+                result = validator(payload)
+                if collect_errors:
+                    if result:
+                        _abort_with_errors(result)
+                elif result is not None:
+                    _abort(result)
+
+                for spec_key in spec_keys:
+                    context.prove(spec_key)
+
+    def decorator(fn):
+        return _wrap(fn, check, spec=spec)
     return decorator
 
 
-def validate_with_jsonschema(jsonschema: dict):
+def validate_many(key_field_mapping: dict, max_errors: int=None, collect_errors: bool=False, engine: str='interpreted',
+                  max_body_bytes: int=None, max_depth: int=None, max_keys: int=None,
+                  parallel_threshold: int=None, chunk_size: int=10000):
+    """
+    A decorator to check a request payload which is a list of records, with Field classes in fields.py
+
+    Every record is validated with ``key_field_mapping``, and the errors are responded at once as JSON
+    like ``validate_payload``, with the index of the record at the head of each path.
+    If the payload is not a list, abort ``validation_failure_code``.
+
+    With ``parallel_threshold``, lists of at least that many records are split into chunks of ``chunk_size``
+    and validated on the process pool of ``Validator``(see ``VALIDATION_PROCESS_POOL_WORKERS``).
+    The mapping must be picklable then(see ``ParallelValidator``). Without the pool, they are validated in the request thread.
+
+    :param key_field_mapping: A dictionary for record check with this form ``{<key name>: <field class>}``
+    :param max_errors: stop validating and respond after this many errors
+    :param collect_errors: respond all errors of each record instead of the first failure of each record
+    :param engine: Validation engine used by ``compile_many``, ``interpreted`` or ``codegen``
+    :param max_body_bytes: abort ``payload_too_large_abort_code`` if the body is larger than this, checked before parsing
+    :param max_depth: abort ``payload_too_large_abort_code`` if the payload nests deeper than this, checked before parsing
+    :param max_keys: abort ``payload_too_large_abort_code`` if the payload has more object keys than this, checked before parsing
+    :param parallel_threshold: number of records from which the list is validated on the process pool
+    :param chunk_size: records validated by a task of the process pool
+    """
+    validator = compile_many(key_field_mapping, engine, collect_errors, max_errors)
+    spec_key = _SpecKey('many', key_field_mapping)
+
+    parallel_validator = None
+    if parallel_threshold is not None:
+        parallel_validator = ParallelValidator(key_field_mapping, engine, collect_errors, max_errors, chunk_size)
+
+    spec = ValidationSpec([key_field_mapping], parallel_validator=parallel_validator)
+
+    def check(kwargs):
+        context = get_context()
+        if context.is_json:
+            payload = _load_json(context, max_body_bytes, max_depth, max_keys)
+
+            if not context.is_proven(spec_key):
+                process_pool = None
+                if parallel_validator is not None and context.state is not None \
+                        and isinstance(payload, list) and len(payload) >= parallel_threshold:
+                    process_pool = context.state.get_process_pool()
+
+                if process_pool is not None:
+                    errors = parallel_validator(process_pool, payload)
+                else:
+                    errors = validator(payload)
+                if errors:
+                    _abort_with_errors(errors)
+
+                context.prove(spec_key)
+
+    def decorator(fn):
+        return _wrap(fn, check, spec=spec)
+    return decorator
+
+
+def _iter_validated_records(records, validator):
+    while True:
+        try:
+            record = next(records)
+        except StopIteration:
+            return
+        except ValueError:
+            raise BadRequest('Failed to decode JSON object')
+
+        failure_reason = validator(record)
+        if failure_reason is not None:
+            # view가 record를 읽는 중이므로 wrapper가 Rejection을 처리할 수 없어 항상 abort
+            context = get_context()
+            context.failure_reason = failure_reason
+            abort(context.get_abort_code(failure_reason))
+
+        yield record
+
+
+def validate_stream(key_field_mapping: dict, format: str='ndjson', kwarg: str='records', chunk_size: int=65536,
+                    engine: str='interpreted', max_body_bytes: int=None):
+    """
+    A decorator to validate a large request body of records as a stream, without loading it into ``request.json``
+
+    The records are parsed from ``request.stream`` one by one, validated with ``key_field_mapping``,
+    and passed to the view as a generator in the ``kwarg`` keyword argument.
+    Memory usage is bounded by a record, not the whole body.
+
+    The view must consume the generator before returning. When an invalid record is reached,
+    it aborts like ``validate_with_fields`` and the rest of the body is not read.
+    If the body is malformed, it aborts with 400.
+
+    :param key_field_mapping: A dictionary for record check with this form ``{<key name>: <field class>}``
+    :param format: ``ndjson`` for newline delimited JSON, ``array`` for a JSON array
+    :param kwarg: name of the keyword argument to pass the records with
+    :param chunk_size: bytes to read from the stream at a time
+    :param engine: Validation engine used by ``compile_fields``, ``interpreted`` or ``codegen``
+    :param max_body_bytes: abort ``payload_too_large_abort_code`` if the ``Content-Length`` is larger than this, before reading the stream
+    """
+    if format not in STREAM_FORMATS:
+        raise ValueError('Unknown format {!r}, expected one of {}'.format(format, tuple(STREAM_FORMATS)))
+
+    iter_records = STREAM_FORMATS[format]
+    validator = compile_fields(key_field_mapping, engine)
+    spec = ValidationSpec([key_field_mapping])
+
+    def check(kwargs):
+        if max_body_bytes is not None and (request.content_length or 0) > max_body_bytes:
+            _abort(PAYLOAD_TOO_LARGE)
+
+        kwargs[kwarg] = _iter_validated_records(iter_records(request.stream, chunk_size), validator)
+
+    def decorator(fn):
+        # record는 view가 읽을 때 검사되므로 executor로 넘길 작업이 없음
+        return _wrap(fn, check, offload=False, spec=spec)
+    return decorator
+
+
+def validate_with_jsonschema(jsonschema: dict, max_body_bytes: int=None, max_depth: int=None, max_keys: int=None,
+                             native: bool=True, engine: str='interpreted'):
     """
     A decorator to check request payload with jsonschema
 
-    If validation fails(jsonschema.exceptions.ValidationError raised), abort the  ``validation_error_abort_code``.
+    If validation fails, abort the  ``validation_error_abort_code``.
+    The schema itself is checked once here, and raises ``jsonschema.exceptions.SchemaError`` if it is invalid.
+
+    With ``native``, a schema in the subset supported by ``jsonschema_to_fields`` is converted into fields
+    and checked by the compiled field validator, with the same result but much faster.
+    Schemas using other keywords are checked by ``jsonschema``.
 
     :param jsonschema: jsonschema
+    :param max_body_bytes: abort ``payload_too_large_abort_code`` if the body is larger than this, checked before parsing
+    :param max_depth: abort ``payload_too_large_abort_code`` if the payload nests deeper than this, checked before parsing
+    :param max_keys: abort ``payload_too_large_abort_code`` if the payload has more object keys than this, checked before parsing
+    :param native: check supported schemas with fields instead of ``jsonschema``
+    :param engine: Validation engine used by ``compile_fields`` for supported schemas, ``interpreted`` or ``codegen``
     """
+    validator = compile_jsonschema(jsonschema)
+    # 내용이 같은 schema는 validator를 공유하므로 validator로 식별
+    spec_key = _SpecKey('jsonschema', validator)
+
+    native_validator = None
+    mapping = None
+    if native:
+        try:
+            mapping = jsonschema_to_fields(jsonschema)
+        except UnsupportedSchema:
+            pass
+        else:
+            native_validator = compile_fields(mapping, engine)
+
+    spec = ValidationSpec([mapping], jsonschema=validator)
+
+    def check(kwargs):
+        context = get_context()
+        if context.is_json:
+            payload = _load_json(context, max_body_bytes, max_depth, max_keys)
+
+            if not context.is_proven(spec_key):
+                if native_validator is not None:
+                    if native_validator(payload) is not None:
+                        _abort(VALIDATION_ERROR)
+                elif not validator.is_valid(payload):
+                    _abort(VALIDATION_ERROR)
+
+                context.prove(spec_key)
 
     def decorator(fn):
+        return _wrap(fn, check, spec=spec)
+    return decorator
+
+
+def _pass_values(result, kwargs, kwarg):
+    failure_reason, values = result
+    if failure_reason is not None:
+        _abort(failure_reason)
+
+    if kwarg is None:
+        kwargs.update(values)
+    else:
+        kwargs[kwarg] = values
+
+
+def validate_args(key_field_mapping: dict, kwarg: str=None):
+    """
+    A decorator to parse and check the query string(``request.args``) with fields
+
+    Each value is converted with ``coerce`` of its field(e.g. ``'42'`` into ``42`` for ``IntField``) and validated.
+    ``ListField`` takes every value of a repeated key(``?tag=a&tag=b``), converted with its ``item``,
+    and other fields the first one. An empty value is None for a field with ``allow_null``.
+    The mapping is compiled into a parser here, and the typed values are passed to the view as keyword arguments,
+    or as a dictionary in the ``kwarg`` keyword argument. Optional keys missing from the query string are not passed.
+
+    If a required key is missing, abort the ``key_missing_code``,
+    and if a value can not be converted or is invalid, abort the ``validation_failure_code``.
+
+    :param key_field_mapping: A flat dictionary with this form ``{<key name>: <field instance>}``
+    :param kwarg: name of the keyword argument to pass the values with, instead of one keyword argument per key
+    """
+    parser = compile_multidict(key_field_mapping)
+    spec = ValidationSpec([key_field_mapping])
+
+    def check(kwargs):
+        _pass_values(parser(request.args), kwargs, kwarg)
+
+    def decorator(fn):
+        return _wrap(fn, check, offload=False, spec=spec)
+    return decorator
+
+
+def validate_form(key_field_mapping: dict, kwarg: str=None):
+    """
+    A decorator to parse and check the form(``request.form``) with fields, like ``validate_args``
+
+    :param key_field_mapping: A flat dictionary with this form ``{<key name>: <field instance>}``
+    :param kwarg: name of the keyword argument to pass the values with, instead of one keyword argument per key
+    """
+    parser = compile_multidict(key_field_mapping)
+    spec = ValidationSpec([key_field_mapping])
+
+    def check(kwargs):
+        _pass_values(parser(request.form), kwargs, kwarg)
+
+    def decorator(fn):
+        return _wrap(fn, check, spec=spec)
+    return decorator
+
+
+def validate_view_args(key_field_mapping: dict):
+    """
+    A decorator to convert and check the path arguments of the view(``request.view_args``) with fields, like ``validate_args``
+
+    Arguments already converted by a URL converter(e.g. ``<int:id>``) are only checked.
+    The typed values replace the arguments passed to the view. ``ListField`` is not supported.
+
+    :param key_field_mapping: A flat dictionary with this form ``{<key name>: <field instance>}``
+    """
+    parser = compile_multidict(key_field_mapping, multi_valued=False)
+    spec = ValidationSpec([key_field_mapping])
+
+    def check(kwargs):
+        _pass_values(parser(kwargs), kwargs, None)
+
+    def decorator(fn):
+        return _wrap(fn, check, offload=False, spec=spec)
+    return decorator
+
+
+def validate_response(spec: dict, sample_rate: float=0.01, engine: str='interpreted', defer: bool=True):
+    """
+    A decorator to check a sample of the JSON responses of the view with Field classes or jsonschema
+
+    ``sample_rate`` of the successful(2xx) JSON responses are validated, by default in a background thread
+    after the response is returned(see ``ResponseValidation``), so a request never fails because of its response.
+    Violations are reported to the hooks registered with ``Validator.on_response_violation``
+    with ``(endpoint, errors)``, errors being like ``validate_payload`` with ``collect_errors``.
+    Nothing is validated without ``Validator``.
+
+    :param spec: A dictionary like ``validate_with_fields``, or jsonschema
+    :param sample_rate: fraction of responses to validate, from 0 to 1
+    :param engine: Validation engine used by ``compile_fields``, ``interpreted`` or ``codegen``
+    :param defer: validate in the background thread instead of before returning the response
+    """
+    check_response = compile_response_check(spec, engine)
+    if _is_field_mapping(spec):
+        validation_spec = ValidationSpec([spec])
+    else:
+        validation_spec = ValidationSpec(jsonschema=compile_jsonschema(spec))
+    validation_spec.decorator = 'validate_response'
+
+    def sample(rv):
+        if random.random() >= sample_rate:
+            return rv
+
+        state = current_app.extensions.get('flask_validation')
+        if state is None:
+            return rv
+
+        # sample된 response만 별도의 response 객체로 만들어 직렬화된 body를 검사
+        # 바깥 decorator와 after_request가 sample 여부와 관계없이 같은 값을 받도록 rv는 그대로 반환
+        response = current_app.make_response(rv)
+        if 200 <= response.status_code < 300 and response.is_json and not response.is_streamed:
+            state.responses.submit(check_response, request.endpoint, response.get_data(), defer)
+
+        return rv
+
+    def decorator(fn):
+        if inspect.iscoroutinefunction(fn):
+            @wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                return sample(await fn(*args, **kwargs))
+
+            async_wrapper.__validation_spec__ = validation_spec
+            return async_wrapper
+
         @wraps(fn)
         def wrapper(*args, **kwargs):
-            validation_error_abort_code = current_app.config['VALIDATION_ERROR_ABORT_CODE']
-            if request.is_json:
-                try:
-                    validate(request.json, jsonschema)
-                except ValidationError:
-                    abort(validation_error_abort_code)
-
-            return fn(*args, **kwargs)
+            return sample(fn(*args, **kwargs))
+
+        wrapper.__validation_spec__ = validation_spec
         return wrapper
     return decorator
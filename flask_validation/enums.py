@@ -0,0 +1,137 @@
+import json
+from functools import partial
+from threading import Lock
+
+
+class EnumSet(object):
+    """
+    Allowed values of a field's ``enum``, with O(1) membership test for hashable values
+
+    Fields normalize ``enum`` into an ``EnumSet`` at construction time. Unhashable allowed values(like lists)
+    are kept aside and compared one by one, so they still work as they did with a list.
+    Pass one ``EnumSet`` instance to several fields to share it instead of building a set per field.
+
+    :param values: allowed values
+    """
+    def __init__(self, values=(), loader=None):
+        self.hashable = frozenset()
+        self.unhashable = ()
+        self._loader = loader
+        self._lock = Lock()
+
+        if loader is None:
+            self._set(values)
+
+    def _set(self, values):
+        hashable = []
+        unhashable = []
+
+        for value in values:
+            try:
+                hash(value)
+            except TypeError:
+                unhashable.append(value)
+            else:
+                hashable.append(value)
+
+        self.hashable = frozenset(hashable)
+        self.unhashable = tuple(unhashable)
+
+    @property
+    def loaded(self):
+        return self._loader is None
+
+    def load(self):
+        """
+        Loads the values of a lazy instance(see ``load_enum``) if they are not loaded yet
+        """
+        with self._lock:
+            if self._loader is not None:
+                self._set(self._loader())
+                self._loader = None
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        del state['_lock']
+
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = Lock()
+
+    def __contains__(self, value):
+        if self._loader is not None:
+            self.load()
+
+        try:
+            if value in self.hashable:
+                return True
+        except TypeError:
+            pass
+
+        return bool(self.unhashable) and value in self.unhashable
+
+    def __iter__(self):
+        if self._loader is not None:
+            self.load()
+
+        yield from self.hashable
+        yield from self.unhashable
+
+    def __len__(self):
+        if self._loader is not None:
+            self.load()
+
+        return len(self.hashable) + len(self.unhashable)
+
+    def __repr__(self):
+        if self._loader is not None:
+            return 'EnumSet(<not loaded>)'
+
+        return 'EnumSet({!r})'.format(list(self))
+
+
+def normalize_enum(enum):
+    """
+    Returns ``enum`` as an ``EnumSet``, or ``enum`` itself if it is None or already an ``EnumSet``
+    """
+    if enum is None or isinstance(enum, EnumSet):
+        return enum
+
+    return EnumSet(enum)
+
+
+def _read_enum_file(path, encoding):
+    with open(path, encoding=encoding) as f:
+        if path.endswith('.json'):
+            return json.load(f)
+
+        return [line.strip() for line in f if line.strip()]
+
+
+# source별로 한 번만 load하고 모든 field가 공유
+_lazy_enums = {}
+_lazy_enums_lock = Lock()
+
+
+def load_enum(source, encoding: str='utf-8'):
+    """
+    Returns an ``EnumSet`` loading its values from ``source`` on the first membership test
+
+    Instances are memoized by ``source``, so that fields using the same source share one set in memory.
+
+    :param source: A path of a file with one value per line(or a JSON array if the name ends with ``.json``),
+        or a function returning the values
+    :param encoding: encoding of the file
+    """
+    with _lazy_enums_lock:
+        enum = _lazy_enums.get(source)
+
+        if enum is None:
+            # lambda 대신 partial을 사용해 process pool로 pickle할 수 있게 함
+            loader = source if callable(source) else partial(_read_enum_file, source, encoding)
+
+            enum = _lazy_enums[source] = EnumSet(loader=loader)
+
+    return enum
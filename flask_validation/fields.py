@@ -1,15 +1,64 @@
+import math
 import re
 
+from .common_regex import find_redos, required_literals
+from .enums import normalize_enum
+from .regex_engine import compile_regex
+
 
 class _BaseField:
     """
     Base field class
+
+    ``enum`` is normalized into an ``EnumSet``, so that large lists of allowed values cost O(1) per check.
+    Use ``load_enum`` for huge ones loaded lazily from a file or a function.
+    With ``cache``(e.g. ``LRU(maxsize=10000)``), results of ``validator_function`` are cached per value.
     """
-    def __init__(self, validator_function=None, enum=None, required: bool=True, allow_null: bool=False):
+    # 앞선 type check로 값이 항상 hashable임이 보장되는 field
+    _hashable_values = False
+
+    def __init__(self, validator_function=None, enum=None, required: bool=True, allow_null: bool=False, cache=None):
         self.required = required
-        self.enum = enum
+        self.enum = normalize_enum(enum)
         self.allow_null = allow_null
         self.validator_function = validator_function
+        self.cache = cache
+        self._bind()
+
+    def _bind(self):
+        """
+        Builds the check functions derived from the options. Called again when the field is unpickled,
+        since they are closures that can not be pickled.
+        """
+        self._validator_function = self._cached(self.validator_function)
+
+    def __getstate__(self):
+        # pickle된 field는 process pool의 worker에서 다시 compile됨
+        state = dict(self.__dict__)
+        for name in ('_validator_function', 'regex_match', '_item_check'):
+            state.pop(name, None)
+
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._bind()
+
+    def _cached(self, function):
+        if self.cache is None or function is None:
+            return function
+
+        return self.cache.wrap(function)
+
+    def _get_enum(self):
+        """
+        Returns the container used for the ``enum`` check.
+        If no unhashable value can reach the check, it is the frozenset of ``EnumSet`` itself, checked without a Python call.
+        """
+        if self._hashable_values and self.enum.loaded and not self.enum.unhashable:
+            return self.enum.hashable
+
+        return self.enum
 
     def validate(self, value):
         if self.enum is not None and value not in self.enum:
@@ -17,22 +66,127 @@ class _BaseField:
 
         # allow_null은 decorators.py에서 체크
 
-        if self.validator_function is not None and not self.validator_function(value):
+        if self.validator_function is not None and not self._validator_function(value):
             return False
 
+    def coerce(self, value):
+        """
+        Converts a string of a query string, form or path into the value this field validates,
+        raising ``ValueError`` if it can not. Values which are not strings are returned as they are.
+        """
+        return value
+
+    def _get_checks(self):
+        """
+        Returns ``(constraint name, predicate)`` pairs for the constraints actually set on this field,
+        in the same order ``validate`` evaluates them. A predicate returns a falsy value on failure.
+        """
+        checks = []
+
+        if self.enum is not None:
+            checks.append(('enum', self._get_enum().__contains__))
+
+        if self.validator_function is not None:
+            checks.append(('validator_function', self._validator_function))
+
+        return checks
+
+    def _get_source_checks(self, bind):
+        """
+        Same as ``_get_checks``, but returns ``(constraint name, failure condition)`` pairs
+        as Python source over a local named ``value``. ``bind`` turns an object into a source expression referring to it.
+        """
+        checks = []
+
+        if self.enum is not None:
+            checks.append(('enum', 'value not in {}'.format(bind(self._get_enum()))))
+
+        if self.validator_function is not None:
+            checks.append(('validator_function', 'not {}(value)'.format(bind(self._validator_function))))
+
+        return checks
+
+    def _first_defined(self, *names):
+        """
+        Returns which of ``names`` is defined first in this field's MRO.
+        Used to detect subclasses overriding ``validate`` without describing their constraints in ``_get_checks``
+        """
+        for cls in type(self).__mro__:
+            for name in names:
+                if name in vars(cls):
+                    return name
+
+    def compile(self):
+        """
+        Compiles this field into a check function bound to its active constraints.
+
+        The returned function takes a value and returns the name of the first failing constraint,
+        or None if the value is valid. Constraints set to None are not evaluated at all.
+        """
+        if self._first_defined('_get_checks', 'validate') != '_get_checks':
+            # validate만 override한 사용자 정의 field는 validate를 그대로 사용
+            return lambda value: 'validate' if self.validate(value) is False else None
+
+        checks = tuple(self._get_checks())
+
+        if not checks:
+            return lambda value: None
+
+        if len(checks) == 1:
+            (constraint, predicate), = checks
+
+            def check(value):
+                if not predicate(value):
+                    return constraint
+        else:
+            def check(value):
+                for constraint, predicate in checks:
+                    if not predicate(value):
+                        return constraint
+
+        return check
+
 
 class StringField(_BaseField):
     """
     String field class
+
+    Before running ``regex``, strings missing a literal the pattern requires(see ``required_literals``) fail,
+    and so do strings longer than any string the pattern can match if it is one of the patterns in ``common_regex``.
+    ``regex_engine`` and ``regex_timeout`` are passed to ``compile_regex``, so that a match running over the time budget
+    fails like a non-matching string. Regex results are cached by ``cache`` too.
+    With ``check_redos``, a pattern that may backtrack catastrophically(see ``find_redos``)
+    raises ``ValueError`` here instead of stalling a request later.
     """
-    def __init__(self, allow_empty: bool=True, min_length: int=None, max_length: int=None, regex=None, **kwargs):
+    _hashable_values = True
+
+    def __init__(self, allow_empty: bool=True, min_length: int=None, max_length: int=None, regex=None,
+                 check_redos: bool=False, regex_engine: str=None, regex_timeout: float=None, **kwargs):
         self.allow_empty = allow_empty
         self.min_length = min_length
         self.max_length = max_length
         self.regex = re.compile(regex) if regex else None
+        self.regex_engine = regex_engine
+        self.regex_timeout = regex_timeout
+
+        if self.regex is not None:
+            if check_redos:
+                problem = find_redos(self.regex)
+                if problem is not None:
+                    raise ValueError('Regex {!r} is vulnerable to ReDoS: {}'.format(self.regex.pattern, problem))
+
+            # common_regex의 pattern은 match 가능한 최대 길이를 가지고 있음
+            self.regex_max_length = getattr(regex, 'max_length', None)
+            self.regex_literals = required_literals(self.regex)
 
         super(StringField, self).__init__(**kwargs)
 
+    def _bind(self):
+        super(StringField, self)._bind()
+
+        if self.regex is not None:
+            self.regex_match = self._cached(compile_regex(self.regex, self.regex_engine, self.regex_timeout))
+
     def validate(self, value):
         if not isinstance(value, str):
             return False
@@ -43,11 +197,62 @@ class StringField(_BaseField):
         if self.min_length is not None and len(value) < self.min_length:
             return False
 
-        if self.regex is not None and self.regex.match(value) is None:
+        if self.regex is not None and not self._check_regex(value):
             return False
 
         return super(StringField, self).validate(value)
 
+    def _check_regex(self, value):
+        if self.regex_max_length is not None and len(value) > self.regex_max_length:
+            return False
+
+        for literal in self.regex_literals:
+            if literal not in value:
+                return False
+
+        return bool(self.regex_match(value))
+
+    def _get_checks(self):
+        checks = [('type', lambda value: isinstance(value, str))]
+
+        if self.max_length is not None:
+            max_length = self.max_length
+            checks.append(('max_length', lambda value: len(value) <= max_length))
+
+        if self.min_length is not None:
+            min_length = self.min_length
+            checks.append(('min_length', lambda value: len(value) >= min_length))
+
+        if self.regex is not None:
+            if self.regex_max_length is None and not self.regex_literals:
+                checks.append(('regex', self.regex_match))
+            else:
+                checks.append(('regex', self._check_regex))
+
+        return checks + super(StringField, self)._get_checks()
+
+    def _get_source_checks(self, bind):
+        checks = [('type', 'not isinstance(value, str)')]
+
+        if self.max_length is not None:
+            checks.append(('max_length', 'len(value) > {}'.format(bind(self.max_length))))
+
+        if self.min_length is not None:
+            checks.append(('min_length', 'len(value) < {}'.format(bind(self.min_length))))
+
+        if self.regex is not None:
+            conditions = []
+
+            if self.regex_max_length is not None:
+                conditions.append('len(value) > {}'.format(bind(self.regex_max_length)))
+
+            conditions.extend('{} not in value'.format(bind(literal)) for literal in self.regex_literals)
+            conditions.append('not {}(value)'.format(bind(self.regex_match)))
+
+            checks.append(('regex', ' or '.join(conditions)))
+
+        return checks + super(StringField, self)._get_source_checks(bind)
+
 
 class NumberField(_BaseField):
     """
@@ -68,50 +273,132 @@ class NumberField(_BaseField):
 
         return super(NumberField, self).validate(value)
 
+    def _get_checks(self):
+        checks = []
+
+        if self.min_value is not None:
+            min_value = self.min_value
+            checks.append(('min_value', lambda value: not value < min_value))
+
+        if self.max_value is not None:
+            max_value = self.max_value
+            checks.append(('max_value', lambda value: not value > max_value))
+
+        return checks + super(NumberField, self)._get_checks()
+
+    def _get_source_checks(self, bind):
+        checks = []
+
+        if self.min_value is not None:
+            checks.append(('min_value', 'value < {}'.format(bind(self.min_value))))
+
+        if self.max_value is not None:
+            checks.append(('max_value', 'value > {}'.format(bind(self.max_value))))
+
+        return checks + super(NumberField, self)._get_source_checks(bind)
+
 
 class IntField(NumberField):
     """
     Int field class
     """
+    _hashable_values = True
+
     def validate(self, value):
         if not isinstance(value, int):
             return False
         
         return super(IntField, self).validate(value)
 
+    def coerce(self, value):
+        return int(value) if isinstance(value, str) else value
+
+    def _get_checks(self):
+        return [('type', lambda value: isinstance(value, int))] + super(IntField, self)._get_checks()
+
+    def _get_source_checks(self, bind):
+        return [('type', 'not isinstance(value, int)')] + super(IntField, self)._get_source_checks(bind)
+
 
 class FloatField(NumberField):
     """
     Float field class
     """
+    _hashable_values = True
+
     def validate(self, value):
         if not isinstance(value, float):
             return False
         
         return super(FloatField, self).validate(value)
 
+    def coerce(self, value):
+        if not isinstance(value, str):
+            return value
+
+        value = float(value)
+        if not math.isfinite(value):
+            # 'nan'은 범위 조건을 항상 통과하므로 거부
+            raise ValueError('Invalid float {!r}'.format(value))
+
+        return value
+
+    def _get_checks(self):
+        return [('type', lambda value: isinstance(value, float))] + super(FloatField, self)._get_checks()
+
+    def _get_source_checks(self, bind):
+        return [('type', 'not isinstance(value, float)')] + super(FloatField, self)._get_source_checks(bind)
+
+
+_BOOLEAN_STRINGS = {'true': True, '1': True, 'yes': True, 'on': True, 'false': False, '0': False, 'no': False, 'off': False}
+
 
 class BooleanField(_BaseField):
     """
     Boolean field class
     """
+    _hashable_values = True
+
     def validate(self, value):
         if not isinstance(value, bool):
             return False
         
         return super(BooleanField, self).validate(value)
 
+    def coerce(self, value):
+        if not isinstance(value, str):
+            return value
+
+        try:
+            return _BOOLEAN_STRINGS[value.lower()]
+        except KeyError:
+            raise ValueError('Invalid boolean {!r}'.format(value))
+
+    def _get_checks(self):
+        return [('type', lambda value: isinstance(value, bool))] + super(BooleanField, self)._get_checks()
+
+    def _get_source_checks(self, bind):
+        return [('type', 'not isinstance(value, bool)')] + super(BooleanField, self)._get_source_checks(bind)
+
 
 class ListField(_BaseField):
     """
     List field class
+
+    If ``item`` is given, every element of the list is validated with it.
+    ``item`` can be a field instance or a dictionary like ``validate_with_fields``.
     """
-    def __init__(self, min_length: int=None, max_length: int=None, **kwargs):
+    def __init__(self, min_length: int=None, max_length: int=None, item=None, **kwargs):
         self.min_length = min_length
         self.max_length = max_length
+        self.item = item
 
         super(ListField, self).__init__(**kwargs)
 
+    def _bind(self):
+        super(ListField, self)._bind()
+        self._item_check = None
+
     def validate(self, value):
         if not isinstance(value, list):
             return False
@@ -122,4 +409,108 @@ class ListField(_BaseField):
         if self.min_length is not None and len(value) < self.min_length:
             return False
 
+        if self.item is not None and not self._get_item_check()(value):
+            return False
+
         return super(ListField, self).validate(value)
+
+    def coerce(self, value):
+        # 여러 값을 가진 key의 값들을 각각 item으로 변환
+        if self.item is None or isinstance(self.item, dict):
+            return list(value)
+
+        return [self.item.coerce(item) for item in value]
+
+    def _get_item_check(self):
+        """
+        Returns a predicate over a whole list, which is True if every element is valid for ``item``
+        """
+        if self._item_check is None:
+            self._item_check = self._compile_item_check()
+
+        return self._item_check
+
+    def _compile_item_check(self):
+        item = self.item
+
+        if isinstance(item, dict):
+            # compiler가 fields를 import하므로 여기서 import
+            from .compiler import compile_fields
+
+            check = compile_fields(item)
+            allow_null = False
+        else:
+            check = item.compile()
+            allow_null = item.allow_null
+
+        def check_items(items):
+            for value in items:
+                if allow_null and value is None:
+                    continue
+
+                if check(value) is not None:
+                    return False
+
+            return True
+
+        if type(item) not in (IntField, FloatField) or item.enum is not None \
+                or item.validator_function is not None or allow_null:
+            return check_items
+
+        # 범위 조건만 있는 IntField/FloatField는 element마다 check하지 않고 min()/max()로 한 번에 확인
+        is_float = type(item) is FloatField
+        types = frozenset((float,)) if is_float else frozenset((int, bool))
+        min_value = item.min_value
+        max_value = item.max_value
+
+        def check_items_columnar(items):
+            if not items:
+                return True
+
+            if not types.issuperset(map(type, items)):
+                # 다른 type이 섞여 있으면 element 단위로 check
+                return check_items(items)
+
+            if is_float and any(map(math.isnan, items)):
+                # NaN은 비교가 항상 False라서 min()/max()의 결과가 위치에 따라 달라지므로 element 단위로 check
+                return check_items(items)
+
+            if min_value is not None and min(items) < min_value:
+                return False
+
+            if max_value is not None and max(items) > max_value:
+                return False
+
+            return True
+
+        return check_items_columnar
+
+    def _get_checks(self):
+        checks = [('type', lambda value: isinstance(value, list))]
+
+        if self.max_length is not None:
+            max_length = self.max_length
+            checks.append(('max_length', lambda value: len(value) <= max_length))
+
+        if self.min_length is not None:
+            min_length = self.min_length
+            checks.append(('min_length', lambda value: len(value) >= min_length))
+
+        if self.item is not None:
+            checks.append(('item', self._get_item_check()))
+
+        return checks + super(ListField, self)._get_checks()
+
+    def _get_source_checks(self, bind):
+        checks = [('type', 'not isinstance(value, list)')]
+
+        if self.max_length is not None:
+            checks.append(('max_length', 'len(value) > {}'.format(bind(self.max_length))))
+
+        if self.min_length is not None:
+            checks.append(('min_length', 'len(value) < {}'.format(bind(self.min_length))))
+
+        if self.item is not None:
+            checks.append(('item', 'not {}(value)'.format(bind(self._get_item_check()))))
+
+        return checks + super(ListField, self)._get_source_checks(bind)
@@ -0,0 +1,223 @@
+import time
+from bisect import bisect_left
+from threading import Lock
+
+from flask import request
+from werkzeug.exceptions import HTTPException
+
+from .context import get_context
+from .rejection import Rejection
+
+DURATION_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+SIZE_BUCKETS = (128, 512, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+HOOKS = ('on_validation_start', 'on_validation_end', 'on_validation_failure')
+
+
+class Histogram(object):
+    """
+    A histogram with fixed upper bounds, counting each observation in the first bucket not below it
+    """
+    def __init__(self, buckets):
+        self.buckets = tuple(buckets)
+        # 마지막은 +Inf bucket
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def to_dict(self):
+        return {'buckets': dict(zip(self.buckets + (float('inf'),), self.counts)), 'sum': self.sum, 'count': self.count}
+
+
+class _Series(object):
+    def __init__(self, duration_buckets, size_buckets):
+        self.validated = 0
+        self.rejected = 0
+        self.failures = {}
+        self.duration = Histogram(duration_buckets)
+        self.payload_size = Histogram(size_buckets)
+
+
+def _escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class ValidationMetrics(object):
+    """
+    Counters and histograms of the validations run by the decorators, per endpoint and decorator, and hooks around them
+
+    Every validation run by a decorator counts as validated or rejected(with its failure reason),
+    and its duration and the request's ``Content-Length`` are observed in histograms.
+    Stacked decorators are recorded separately. Nothing is recorded unless ``VALIDATION_METRICS`` is set
+    or a hook is registered.
+
+    Hooks are registered with ``on_validation_start``, ``on_validation_end`` and ``on_validation_failure``,
+    which can be used as decorators. They are called with ``(endpoint, decorator)``, plus the duration in seconds for
+    ``on_validation_end``, and the failure reason for ``on_validation_failure``.
+
+    :param duration_buckets: upper bounds of the duration histogram, in seconds
+    :param size_buckets: upper bounds of the payload size histogram, in bytes
+    :param statsd: A statsd client(``incr(name, count)`` and ``timing(name, milliseconds)``) to send events to as they happen
+    :param statsd_prefix: prefix of the statsd metric names
+    """
+    def __init__(self, duration_buckets=DURATION_BUCKETS, size_buckets=SIZE_BUCKETS, statsd=None, statsd_prefix: str='flask_validation'):
+        self.duration_buckets = tuple(duration_buckets)
+        self.size_buckets = tuple(size_buckets)
+        self.statsd = statsd
+        self.statsd_prefix = statsd_prefix
+        self.recording = False
+        self.hooks = {name: [] for name in HOOKS}
+        self._series = {}
+        self._lock = Lock()
+
+    @property
+    def enabled(self):
+        return self.recording or any(self.hooks.values())
+
+    def on_validation_start(self, function):
+        self.hooks['on_validation_start'].append(function)
+        return function
+
+    def on_validation_end(self, function):
+        self.hooks['on_validation_end'].append(function)
+        return function
+
+    def on_validation_failure(self, function):
+        self.hooks['on_validation_failure'].append(function)
+        return function
+
+    def run(self, decorator, check, kwargs):
+        """
+        Runs ``check(kwargs)`` of ``decorator``, recording its result and calling the hooks
+        """
+        endpoint = request.endpoint
+
+        for hook in self.hooks['on_validation_start']:
+            hook(endpoint, decorator)
+
+        started = time.perf_counter()
+        try:
+            check(kwargs)
+        except (HTTPException, Rejection) as e:
+            duration = time.perf_counter() - started
+            # Rejection은 항상 failure reason이 설정된 뒤 raise됨
+            failure_reason = get_context().failure_reason or 'http_{}'.format(e.code)
+
+            self._record(endpoint, decorator, duration, failure_reason)
+
+            for hook in self.hooks['on_validation_failure']:
+                hook(endpoint, decorator, failure_reason)
+            for hook in self.hooks['on_validation_end']:
+                hook(endpoint, decorator, duration)
+
+            raise
+
+        duration = time.perf_counter() - started
+        self._record(endpoint, decorator, duration, None)
+
+        for hook in self.hooks['on_validation_end']:
+            hook(endpoint, decorator, duration)
+
+    def _record(self, endpoint, decorator, duration, failure_reason):
+        if not self.recording:
+            return
+
+        content_length = request.content_length
+
+        with self._lock:
+            series = self._series.get((endpoint, decorator))
+            if series is None:
+                series = self._series[endpoint, decorator] = _Series(self.duration_buckets, self.size_buckets)
+
+            if failure_reason is None:
+                series.validated += 1
+            else:
+                series.rejected += 1
+                series.failures[failure_reason] = series.failures.get(failure_reason, 0) + 1
+
+            series.duration.observe(duration)
+            if content_length is not None:
+                series.payload_size.observe(content_length)
+
+        if self.statsd is not None:
+            name = '{}.{}.{}'.format(self.statsd_prefix, endpoint, decorator)
+
+            self.statsd.timing(name + '.duration', duration * 1000)
+            if failure_reason is None:
+                self.statsd.incr(name + '.validated', 1)
+            else:
+                self.statsd.incr(name + '.rejected', 1)
+                self.statsd.incr('{}.failure.{}'.format(name, failure_reason), 1)
+
+    def snapshot(self):
+        """
+        Returns the recorded values as a dictionary keyed by ``(endpoint, decorator)``
+        """
+        with self._lock:
+            return {
+                key: {
+                    'validated': series.validated,
+                    'rejected': series.rejected,
+                    'failures': dict(series.failures),
+                    'duration': series.duration.to_dict(),
+                    'payload_size': series.payload_size.to_dict()
+                }
+                for key, series in self._series.items()
+            }
+
+    def reset(self):
+        with self._lock:
+            self._series.clear()
+
+    def export_prometheus(self, prefix: str='flask_validation'):
+        """
+        Returns the recorded values in the Prometheus text exposition format
+        """
+        lines = [
+            '# HELP {}_validations_total Validations run by the decorators, by result'.format(prefix),
+            '# TYPE {}_validations_total counter'.format(prefix)
+        ]
+        failures = [
+            '# HELP {}_failures_total Rejected validations, by failure reason'.format(prefix),
+            '# TYPE {}_failures_total counter'.format(prefix)
+        ]
+        histograms = {
+            'duration': [
+                '# HELP {}_duration_seconds Duration of validations'.format(prefix),
+                '# TYPE {}_duration_seconds histogram'.format(prefix)
+            ],
+            'payload_size': [
+                '# HELP {}_payload_bytes Content-Length of validated requests'.format(prefix),
+                '# TYPE {}_payload_bytes histogram'.format(prefix)
+            ]
+        }
+        names = {'duration': prefix + '_duration_seconds', 'payload_size': prefix + '_payload_bytes'}
+
+        for (endpoint, decorator), values in sorted(self.snapshot().items(), key=lambda item: tuple(map(str, item[0]))):
+            labels = 'endpoint="{}",decorator="{}"'.format(_escape_label(endpoint), _escape_label(decorator))
+
+            for result in ('validated', 'rejected'):
+                lines.append('{}_validations_total{{{},result="{}"}} {}'.format(prefix, labels, result, values[result]))
+
+            for failure_reason, count in sorted(values['failures'].items()):
+                failures.append('{}_failures_total{{{},reason="{}"}} {}'.format(prefix, labels, _escape_label(failure_reason), count))
+
+            for kind, output in histograms.items():
+                histogram = values[kind]
+                cumulative = 0
+
+                for bound, count in histogram['buckets'].items():
+                    cumulative += count
+                    output.append('{}_bucket{{{},le="{}"}} {}'.format(
+                        names[kind], labels, '+Inf' if bound == float('inf') else repr(bound), cumulative
+                    ))
+
+                output.append('{}_sum{{{}}} {}'.format(names[kind], labels, repr(histogram['sum'])))
+                output.append('{}_count{{{}}} {}'.format(names[kind], labels, histogram['count']))
+
+        return '\n'.join(lines + failures + histograms['duration'] + histograms['payload_size']) + '\n'
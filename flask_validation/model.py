@@ -0,0 +1,47 @@
+import keyword
+
+
+class Model(object):
+    """
+    Base class of the slotted classes generated from field mappings
+
+    An instance has one attribute per key of the mapping, and nested dictionaries become nested instances.
+    Optional keys missing from the payload are None.
+    """
+    __slots__ = ()
+
+    def __repr__(self):
+        return '{}({})'.format(
+            type(self).__name__, ', '.join('{}={!r}'.format(name, getattr(self, name)) for name in self.__slots__)
+        )
+
+    def __eq__(self, other):
+        return type(self) is type(other) and all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    __hash__ = None
+
+    def to_dict(self):
+        """
+        Returns the instance as a dictionary, with nested instances converted too
+        """
+        return {
+            name: value.to_dict() if isinstance(value, Model) else value
+            for name, value in ((name, getattr(self, name)) for name in self.__slots__)
+        }
+
+
+def make_model_class(name, attributes):
+    """
+    Creates a ``Model`` subclass with ``__slots__`` for ``attributes``
+
+    :param name: class name
+    :param attributes: attribute names, which must be valid Python identifiers
+    """
+    attributes = tuple(attributes)
+
+    for attribute in attributes:
+        if not isinstance(attribute, str) or not attribute.isidentifier() or keyword.iskeyword(attribute) \
+                or attribute.startswith('__') or hasattr(Model, attribute):
+            raise ValueError('Key {!r} can not be an attribute of a model'.format(attribute))
+
+    return type(name, (Model,), {'__slots__': attributes})
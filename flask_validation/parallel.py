@@ -0,0 +1,89 @@
+import os
+import pickle
+from itertools import count
+
+from .compiler import compile_many
+
+_tokens = count()
+
+# worker process에서 token별로 compile된 validator. mapping은 처음 받은 chunk에서 한 번만 compile
+_worker_validators = {}
+
+
+def _validate_chunk(token, mapping, engine, collect_errors, max_errors, records, offset):
+    validator = _worker_validators.get(token)
+    if validator is None:
+        validator = _worker_validators[token] = compile_many(pickle.loads(mapping), engine, collect_errors, max_errors)
+
+    return [
+        {'path': (error['path'][0] + offset,) + error['path'][1:], 'code': error['code'], 'constraint': error['constraint']}
+        for error in validator(records)
+    ]
+
+
+class ParallelValidator(object):
+    """
+    Validates a list of records in chunks on a process pool, with the same result as ``compile_many``
+
+    The mapping is pickled once here, and compiled once per worker process on its first chunk.
+    Every field of the mapping must be picklable, so ``validator_function`` must be a module-level function.
+
+    :param key_field_mapping: A dictionary for record check with this form ``{<key name>: <field class>}``
+    :param engine: ``interpreted`` or ``codegen``
+    :param collect_errors: collect all errors of each record instead of the first failure reason
+    :param max_errors: stop validating after this many errors
+    :param chunk_size: records validated by a task
+    """
+    def __init__(self, key_field_mapping: dict, engine: str='interpreted', collect_errors: bool=False, max_errors: int=None,
+                 chunk_size: int=10000):
+        try:
+            self.mapping = pickle.dumps(key_field_mapping)
+        except (pickle.PicklingError, AttributeError, TypeError) as e:
+            raise ValueError('Mapping must be picklable to be validated in parallel: {}'.format(e)) from e
+
+        self.token = '{}-{}'.format(os.getpid(), next(_tokens))
+        self.engine = engine
+        self.collect_errors = collect_errors
+        self.max_errors = max_errors
+        self.chunk_size = chunk_size
+
+    def warm_up(self, executor):
+        """
+        Starts the workers of ``executor`` and compiles the mapping in them, before the first request
+        """
+        workers = getattr(executor, '_max_workers', None) or os.cpu_count() or 1
+        futures = [
+            executor.submit(
+                _validate_chunk, self.token, self.mapping, self.engine, self.collect_errors, self.max_errors, [], 0
+            )
+            for _ in range(workers)
+        ]
+
+        for future in futures:
+            future.result()
+
+    def __call__(self, executor, records):
+        """
+        Returns the errors of ``records`` ordered by index, validating its chunks on ``executor``
+        """
+        futures = [
+            executor.submit(
+                _validate_chunk, self.token, self.mapping, self.engine, self.collect_errors, self.max_errors,
+                records[offset:offset + self.chunk_size], offset
+            )
+            for offset in range(0, len(records), self.chunk_size)
+        ]
+
+        errors = []
+
+        for future in futures:
+            errors.extend(future.result())
+
+            if self.max_errors is not None and len(errors) >= self.max_errors:
+                del errors[self.max_errors:]
+                # 이미 충분한 error를 모았으므로 시작하지 않은 chunk는 취소
+                for pending in futures:
+                    pending.cancel()
+                break
+
+        return errors
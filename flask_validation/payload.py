@@ -0,0 +1,96 @@
+import json
+import re
+import warnings
+from importlib import import_module
+from itertools import accumulate
+
+# escape를 포함한 문자열 전체
+_string = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"')
+# 여는 괄호는 1, 닫는 괄호는 -1(signed char)로 바꾸고 나머지는 지움
+_BRACKETS = bytes.maketrans(b'[{]}', b'\x01\x01\xff\xff')
+_NOT_BRACKETS = bytes(sorted(set(range(256)) - set(b'[{]}')))
+
+
+def exceeds_limits(data: bytes, max_depth: int=None, max_keys: int=None):
+    """
+    Scans a raw JSON body and returns True if it nests deeper than ``max_depth``
+    or has more than ``max_keys`` object keys in total, without building any object
+
+    Malformed JSON is not detected here; it is left to the JSON decoder.
+
+    Strings are cut out of the body, and the keys are counted as the colons left, and the depth over the brackets left.
+    Every step runs in C, so it costs less than a ``json.loads`` of the body. A body with escaped quotes(``\\"``)
+    cuts the strings with a regex instead, which costs about two ``json.loads``.
+
+    :param data: raw request body
+    :param max_depth: maximum nesting depth of objects and arrays, the top-level value being depth 1
+    :param max_keys: maximum number of object keys in the whole payload
+    """
+    if b'\\"' in data:
+        # escape된 따옴표가 있으면 따옴표로 나눌 수 없으므로 정규식으로 문자열을 제거
+        outside = _string.sub(b'', data)
+    else:
+        # 따옴표로 나누면 짝수 번째 조각들이 문자열 밖
+        outside = b''.join(data.split(b'"')[::2])
+
+    # 문자열 밖의 ':'는 모두 object key 뒤에 옴
+    if max_keys is not None and outside.count(b':') > max_keys:
+        return True
+
+    if max_depth is not None:
+        brackets = outside.translate(_BRACKETS, _NOT_BRACKETS)
+
+        # 여는 괄호가 max_depth개 이하면 그보다 깊을 수 없음
+        if brackets.count(1) > max_depth and max(accumulate(memoryview(brackets).cast('b'))) > max_depth:
+            return True
+
+    return False
+
+
+def _load_stdlib_json(data):
+    return json.loads(data.decode('utf-8'))
+
+
+# decoder 이름별 (module, loads 함수 이름, 잘못된 JSON에 raise하는 exception의 module과 이름)
+_JSON_DECODERS = {
+    'orjson': ('orjson', 'loads', 'orjson', 'JSONDecodeError'),
+    'ujson': ('ujson', 'loads', 'ujson', 'JSONDecodeError'),
+    # msgspec.DecodeError는 ValueError의 subclass가 아님
+    'msgspec': ('msgspec.json', 'decode', 'msgspec', 'DecodeError')
+}
+
+_STDLIB_ERRORS = (ValueError,)
+
+
+def resolve_json_decoder(decoder):
+    """
+    Resolves the ``VALIDATION_JSON_DECODER`` option into a function decoding a raw body,
+    and the exception types it raises for a malformed body
+
+    Returns ``(None, ())`` for the default(Flask's ``request.json``). If the library of a named decoder is not installed,
+    warns and falls back to the standard ``json`` module. A function is expected to raise ``ValueError``.
+
+    :param decoder: None, ``json``, ``orjson``, ``ujson``, ``msgspec``, or a function taking bytes
+    """
+    if decoder is None:
+        return None, ()
+
+    if callable(decoder):
+        return decoder, _STDLIB_ERRORS
+
+    if decoder == 'json':
+        return _load_stdlib_json, _STDLIB_ERRORS
+
+    if decoder not in _JSON_DECODERS:
+        raise ValueError('Unknown JSON decoder {!r}, expected one of {}'.format(decoder, ('json',) + tuple(_JSON_DECODERS)))
+
+    module_name, function_name, error_module_name, error_name = _JSON_DECODERS[decoder]
+    try:
+        function = getattr(import_module(module_name), function_name)
+        error_module = import_module(error_module_name)
+    except ImportError:
+        warnings.warn('{} is not installed, falling back to json'.format(module_name))
+        return _load_stdlib_json, _STDLIB_ERRORS
+
+    # 오래된 ujson처럼 전용 exception이 없는 경우 ValueError를 raise함
+    return function, (ValueError, getattr(error_module, error_name, ValueError))
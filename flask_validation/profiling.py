@@ -0,0 +1,213 @@
+import atexit
+import glob
+import json
+import logging
+import os
+import random
+import time
+from threading import Lock, get_ident
+
+import click
+from flask import current_app, request
+from flask.cli import with_appcontext
+
+logger = logging.getLogger(__name__)
+
+_missing = object()
+
+
+def _flatten(key_field_mapping, path=()):
+    """
+    Returns ``(path, field, checks)`` of every field in a ``validate_with_fields`` mapping
+    """
+    flattened = []
+
+    for key, field in key_field_mapping.items():
+        if isinstance(field, dict):
+            flattened.extend(_flatten(field, path + (key,)))
+        elif field._first_defined('_get_checks', 'validate') == '_get_checks':
+            flattened.append((path + (key,), field, tuple(field._get_checks())))
+        else:
+            # validate만 override한 field는 전체를 하나의 constraint로 측정
+            flattened.append((path + (key,), field, (('validate', lambda value, field=field: field.validate(value) is not False),)))
+
+    return flattened
+
+
+def _lookup(payload, path):
+    for key in path:
+        if not isinstance(payload, dict):
+            return _missing
+
+        payload = payload.get(key, _missing)
+        if payload is _missing:
+            return _missing
+
+    return payload
+
+
+class FieldProfiler(object):
+    """
+    Attributes the cost of ``validate_with_fields`` to each key path and constraint, on a sample of requests
+
+    On a sampled request, every constraint of every field present in the payload is timed separately,
+    in the same order the compiled validator checks them and stopping at the first failing one of a field.
+    This runs in addition to the validation, so a sampled request costs about twice as much.
+
+    :param rate: fraction of requests to profile, from 0 to 1
+    :param path: file to dump the profile to as JSON(see ``dump``). ``{pid}`` is replaced with the process id,
+        so that every worker process has its own file.
+    :param dump_interval: seconds between dumps while profiling
+    """
+    def __init__(self, rate: float=0.0, path: str=None, dump_interval: float=10.0):
+        self.rate = rate
+        self.path = path
+        self.dump_interval = dump_interval
+        self._stats = {}
+        self._flattened = {}
+        self._lock = Lock()
+        self._dump_lock = Lock()
+        self._last_dump = time.monotonic()
+
+    def sample(self):
+        return random.random() < self.rate
+
+    def profile(self, key_field_mapping, payload):
+        """
+        Times each constraint of ``key_field_mapping`` over ``payload``, and records it under the current endpoint
+        """
+        flattened = self._flattened.get(id(key_field_mapping))
+        if flattened is None or flattened[0] is not key_field_mapping:
+            # mapping도 함께 보관해 id가 재사용되지 않도록 함
+            flattened = self._flattened[id(key_field_mapping)] = (key_field_mapping, _flatten(key_field_mapping))
+
+        endpoint = request.endpoint
+        timings = []
+
+        for path, field, checks in flattened[1]:
+            value = _lookup(payload, path)
+            if value is _missing or value is None:
+                continue
+
+            for constraint, predicate in checks:
+                started = time.perf_counter()
+                passed = predicate(value)
+                timings.append((path, constraint, time.perf_counter() - started))
+
+                if not passed:
+                    break
+
+        with self._lock:
+            for path, constraint, elapsed in timings:
+                key = (endpoint, '.'.join(map(str, path)), constraint)
+                calls, total = self._stats.get(key, (0, 0.0))
+                self._stats[key] = (calls + 1, total + elapsed)
+
+        if self.path is not None and time.monotonic() - self._last_dump > self.dump_interval:
+            self._dump_periodically()
+
+    def _dump_periodically(self):
+        # request thread에서 호출되므로 다른 thread가 dump 중이면 기다리지 않고 넘어감
+        if not self._dump_lock.acquire(blocking=False):
+            return
+
+        try:
+            if time.monotonic() - self._last_dump > self.dump_interval:
+                self._last_dump = time.monotonic()
+                self.dump()
+        except OSError:
+            # profile을 쓰지 못해도 request는 실패하지 않도록 log만 남김
+            logger.exception('Failed to dump the validation profile to %r', self.path)
+        finally:
+            self._dump_lock.release()
+
+    def stats(self):
+        """
+        Returns the profile as a list of ``{'endpoint', 'path', 'constraint', 'calls', 'total', 'mean'}``,
+        the most expensive first
+        """
+        with self._lock:
+            items = list(self._stats.items())
+
+        return _to_rows(items)
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+    def dump(self, path: str=None):
+        """
+        Writes the profile to ``path``(``path`` of this profiler by default) as JSON, replacing the file atomically
+        """
+        path = (path or self.path).format(pid=os.getpid())
+
+        with self._lock:
+            rows = [[endpoint, key_path, constraint, calls, total] for (endpoint, key_path, constraint), (calls, total) in self._stats.items()]
+
+        # 동시에 dump하는 thread끼리 temporary file이 겹치지 않도록 thread id도 붙임
+        temporary_path = '{}.{}.{}.tmp'.format(path, os.getpid(), get_ident())
+        with open(temporary_path, 'w') as f:
+            json.dump(rows, f)
+
+        os.replace(temporary_path, path)
+
+
+def _to_rows(items):
+    rows = [
+        {'endpoint': endpoint, 'path': path, 'constraint': constraint, 'calls': calls, 'total': total, 'mean': total / calls}
+        for (endpoint, path, constraint), (calls, total) in items
+    ]
+    rows.sort(key=lambda row: row['total'], reverse=True)
+
+    return rows
+
+
+def load_profiles(paths):
+    """
+    Reads and merges profiles dumped by ``FieldProfiler.dump``, returning rows like ``FieldProfiler.stats``
+    """
+    merged = {}
+
+    for path in paths:
+        with open(path) as f:
+            for endpoint, key_path, constraint, calls, total in json.load(f):
+                key = (endpoint, key_path, constraint)
+                merged_calls, merged_total = merged.get(key, (0, 0.0))
+                merged[key] = (merged_calls + calls, merged_total + total)
+
+    return _to_rows(merged.items())
+
+
+def register_profile_dump(profiler):
+    atexit.register(lambda: profiler.dump() if profiler.stats() else None)
+
+
+@click.command('validation-profile')
+@click.option('--file', 'paths', multiple=True, help='Profile files to read. Defaults to VALIDATION_PROFILE_FILE of every process.')
+@click.option('--sort', type=click.Choice(['total', 'calls', 'mean']), default='total', show_default=True)
+@click.option('--limit', type=int, default=30, show_default=True)
+@with_appcontext
+def profile_command(paths, sort, limit):
+    """
+    Shows the validation cost of each field and constraint, profiled with VALIDATION_PROFILE_RATE
+    """
+    if not paths and current_app.config['VALIDATION_PROFILE_FILE']:
+        paths = sorted(glob.glob(current_app.config['VALIDATION_PROFILE_FILE'].replace('{pid}', '*')))
+
+    if paths:
+        rows = load_profiles(paths)
+    else:
+        # dump된 file이 없으면 이 process의 profile
+        rows = current_app.extensions['flask_validation'].profiler.stats()
+
+    if not rows:
+        click.echo('No validation profile recorded')
+        return
+
+    rows.sort(key=lambda row: row[sort], reverse=True)
+
+    click.echo('{:<24} {:<32} {:<20} {:>10} {:>12} {:>12}'.format('endpoint', 'path', 'constraint', 'calls', 'total(ms)', 'mean(us)'))
+    for row in rows[:limit]:
+        click.echo('{:<24} {:<32} {:<20} {:>10} {:>12.3f} {:>12.3f}'.format(
+            str(row['endpoint']), row['path'], row['constraint'], row['calls'], row['total'] * 1000, row['mean'] * 1000000
+        ))
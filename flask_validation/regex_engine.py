@@ -0,0 +1,96 @@
+import re
+import warnings
+from importlib import import_module
+
+REGEX_ENGINES = ('re', 'regex', 're2')
+
+# stdlib re와 regex가 공유하는 flag 중 re2로 옮길 수 없는 것. re.UNICODE는 str pattern의 기본값
+_RE2_UNSUPPORTED_FLAGS = ~re.UNICODE
+
+
+def _import_engine(engine):
+    try:
+        return import_module(engine)
+    except ImportError:
+        return None
+
+
+def _compile_stdlib(pattern, flags, timeout):
+    if timeout is not None:
+        warnings.warn('The re module does not support a timeout, regex {!r} runs unbounded'.format(pattern))
+
+    return re.compile(pattern, flags).match
+
+
+def _compile_regex(module, pattern, flags, timeout):
+    match = module.compile(pattern, flags).match
+
+    if timeout is None:
+        return match
+
+    def match_with_timeout(value):
+        try:
+            return match(value, timeout=timeout)
+        except TimeoutError:
+            # 시간 안에 끝나지 않은 입력은 match 실패로 취급
+            return None
+
+    return match_with_timeout
+
+
+def _compile_re2(module, pattern, flags, timeout):
+    if flags & _RE2_UNSUPPORTED_FLAGS:
+        warnings.warn('re2 does not support the flags of regex {!r}, falling back to re'.format(pattern))
+        return _compile_stdlib(pattern, flags, timeout)
+
+    try:
+        # re2는 입력 길이에 선형인 시간을 보장하므로 timeout이 필요 없음
+        return module.compile(pattern).match
+    except getattr(module, 'error', ValueError):
+        warnings.warn('re2 does not support regex {!r}, falling back to re'.format(pattern))
+        return _compile_stdlib(pattern, flags, timeout)
+
+
+def compile_regex(pattern, engine: str=None, timeout: float=None):
+    """
+    Compiles ``pattern`` with a regex engine and returns its ``match`` function
+
+    With a ``timeout``, a match running longer than ``timeout`` seconds returns None like a failed match.
+    If ``engine`` is None, ``regex`` is used when a timeout is given and it is installed, then ``re2``, then ``re``.
+    If the library of a named engine is not installed, warns and falls back to the standard ``re`` module.
+
+    :param pattern: regex pattern string or compiled pattern
+    :param engine: ``re``, ``regex``, ``re2`` or None
+    :param timeout: time budget of a match in seconds. Only ``regex`` enforces it, and ``re2`` does not need it.
+    """
+    if engine is not None and engine not in REGEX_ENGINES:
+        raise ValueError('Unknown regex engine {!r}, expected one of {}'.format(engine, REGEX_ENGINES))
+
+    flags = 0
+    if hasattr(pattern, 'pattern'):
+        pattern, flags = pattern.pattern, pattern.flags
+
+    if engine is None:
+        if timeout is None:
+            return re.compile(pattern, flags).match
+
+        for name in ('regex', 're2'):
+            module = _import_engine(name)
+            if module is not None:
+                engine = name
+                break
+        else:
+            return _compile_stdlib(pattern, flags, timeout)
+    else:
+        module = _import_engine(engine) if engine != 're' else None
+
+        if module is None:
+            if engine != 're':
+                warnings.warn('{} is not installed, falling back to re'.format(engine))
+
+            return _compile_stdlib(pattern, flags, timeout)
+
+    if engine == 'regex':
+        return _compile_regex(module, pattern, flags, timeout)
+
+    return _compile_re2(module, pattern, flags, timeout)
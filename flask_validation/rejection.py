@@ -0,0 +1,40 @@
+import json
+
+
+class Rejection(Exception):
+    """
+    Raised by the checks of the decorators instead of ``abort`` with ``VALIDATION_FAST_REJECTION``,
+    and turned into a response by the wrapper of the decorator before it reaches the application
+
+    :param failure_reason: failure reason of the rejection
+    :param errors: errors of ``collect_errors``, responded instead of the failure reason
+    """
+    def __init__(self, failure_reason, errors=None):
+        super(Rejection, self).__init__(failure_reason)
+        self.failure_reason = failure_reason
+        self.errors = errors
+
+
+class RejectionResponses(object):
+    """
+    JSON responses of the fast rejection mode, ``{"error": <failure reason>}`` with the abort code of the reason
+
+    The body and headers are built once per abort code and failure reason, and every rejection only creates
+    a ``response_class`` from them. A response object itself is not shared, since ``after_request`` functions may change it.
+    """
+    def __init__(self):
+        self._prebuilt = {}
+
+    def response(self, response_class, failure_reason, code, errors=None, dumps=json.dumps):
+        if errors is not None:
+            # errors는 요청마다 다르므로 body만 새로 만듦
+            return response_class(dumps({'errors': errors}), code, _HEADERS)
+
+        body = self._prebuilt.get((code, failure_reason))
+        if body is None:
+            body = self._prebuilt[code, failure_reason] = json.dumps({'error': failure_reason}).encode()
+
+        return response_class(body, code, _HEADERS)
+
+
+_HEADERS = (('Content-Type', 'application/json'),)
@@ -0,0 +1,136 @@
+import json
+import logging
+import os
+from queue import Full, Queue
+from threading import Lock, Thread
+
+from .compiler import VALIDATION_ERROR, compile_fields, compile_jsonschema
+from .fields import _BaseField
+
+logger = logging.getLogger(__name__)
+
+
+def _is_field_mapping(spec):
+    # jsonschema의 값은 field가 아니므로 leaf가 모두 field인 dict만 mapping으로 취급
+    return bool(spec) and all(
+        isinstance(value, _BaseField) or (isinstance(value, dict) and _is_field_mapping(value)) for value in spec.values()
+    )
+
+
+def compile_response_check(spec: dict, engine: str='interpreted'):
+    """
+    Compiles a ``validate_with_fields`` mapping or a jsonschema into a function taking a response body(bytes)
+    and returning a list of errors like ``compile_payload`` with ``collect_errors``, empty if it is valid
+
+    A body which is not JSON is a ``VALIDATION_ERROR`` with the ``json`` constraint,
+    and jsonschema errors are ``VALIDATION_ERROR`` with the failed keyword as the constraint.
+
+    :param spec: A dictionary like ``validate_with_fields``, or jsonschema
+    :param engine: Validation engine used by ``compile_fields``, ``interpreted`` or ``codegen``
+    """
+    if _is_field_mapping(spec):
+        validate = compile_fields(spec, engine, collect_errors=True)
+    else:
+        validator = compile_jsonschema(spec)
+
+        def validate(payload):
+            return [
+                {'path': tuple(error.absolute_path), 'code': VALIDATION_ERROR, 'constraint': error.validator}
+                for error in validator.iter_errors(payload)
+            ]
+
+    def check_response(body):
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            return [{'path': (), 'code': VALIDATION_ERROR, 'constraint': 'json'}]
+
+        return validate(payload)
+
+    return check_response
+
+
+class ResponseValidation(object):
+    """
+    Validates response bodies sampled by ``validate_response``, and reports the violations to hooks
+
+    Bodies are validated in a background thread after the response is returned, through a queue of ``queue_size`` bodies.
+    When the queue is full, bodies are dropped instead of slowing down the requests, and counted in ``dropped``.
+    Hooks are registered with ``on_violation``, and called in the background thread(without application context)
+    with ``(endpoint, errors)``. ``checked`` and ``violations`` count the validated and the invalid bodies.
+
+    :param queue_size: maximum number of bodies waiting to be validated
+    """
+    def __init__(self, queue_size: int=1000):
+        self.queue_size = queue_size
+        self.hooks = []
+        self.checked = 0
+        self.violations = 0
+        self.dropped = 0
+        self._queue = None
+        self._pid = None
+        self._lock = Lock()
+
+    def on_violation(self, function):
+        self.hooks.append(function)
+        return function
+
+    def submit(self, check, endpoint, body, defer: bool=True):
+        """
+        Validates ``body`` with ``check``(see ``compile_response_check``) in the background thread,
+        or right away if ``defer`` is False
+        """
+        if not defer:
+            # background thread와 같이 검사 실패가 response를 막지 않도록 log만 남김
+            try:
+                self._check(check, endpoint, body)
+            except Exception:
+                logger.exception('Failed to validate a response of endpoint %r', endpoint)
+
+            return
+
+        try:
+            self._get_queue().put_nowait((check, endpoint, body))
+        except Full:
+            with self._lock:
+                self.dropped += 1
+
+    def join(self):
+        """
+        Waits until every submitted body is validated
+        """
+        if self._queue is not None and self._pid == os.getpid():
+            self._queue.join()
+
+    def _get_queue(self):
+        if self._pid != os.getpid():
+            with self._lock:
+                # fork된 worker process에는 thread가 없으므로 process마다 새로 시작
+                if self._pid != os.getpid():
+                    self._queue = Queue(self.queue_size)
+                    Thread(target=self._run, args=(self._queue,), name='flask-validation-response', daemon=True).start()
+                    self._pid = os.getpid()
+
+        return self._queue
+
+    def _run(self, queue):
+        while True:
+            check, endpoint, body = queue.get()
+            try:
+                self._check(check, endpoint, body)
+            except Exception:
+                logger.exception('Failed to validate a response of endpoint %r', endpoint)
+            finally:
+                queue.task_done()
+
+    def _check(self, check, endpoint, body):
+        errors = check(body)
+
+        with self._lock:
+            self.checked += 1
+            if errors:
+                self.violations += 1
+
+        if errors:
+            for hook in self.hooks:
+                hook(endpoint, errors)
@@ -0,0 +1,311 @@
+import re
+
+from jsonschema.validators import validator_for
+
+from .common_regex import sre_parse
+from .fields import BooleanField, FloatField, IntField, ListField, NumberField, StringField, _BaseField
+
+# jsonschema의 pattern은 search, StringField의 regex는 match이므로 앞에 붙여 search로 만듦
+_SEARCH_PREFIX = '(?s:.*?)'
+
+# 검사에 영향이 없는 keyword
+_ANNOTATIONS = frozenset((
+    'title', 'description', 'default', 'examples', '$comment', 'format', 'readOnly', 'writeOnly', 'deprecated'
+))
+
+_TYPE_KEYWORDS = {
+    'string': frozenset(('minLength', 'maxLength', 'pattern', 'enum')),
+    'integer': frozenset(('minimum', 'maximum', 'enum')),
+    'number': frozenset(('minimum', 'maximum', 'enum')),
+    'boolean': frozenset(('enum',)),
+    'array': frozenset(('minItems', 'maxItems', 'items')),
+    'object': frozenset(('properties', 'required', 'additionalProperties'))
+}
+
+
+def _is_anchored(pattern):
+    # '^a|b'처럼 최상위에 alternation이 있거나 MULTILINE이면 시작에 고정되지 않음
+    parsed = sre_parse.parse(pattern)
+    return not parsed.state.flags & re.MULTILINE and len(parsed) > 0 and parsed[0] == (sre_parse.AT, sre_parse.AT_BEGINNING)
+
+
+class UnsupportedSchema(ValueError):
+    """
+    Raised by ``jsonschema_to_fields`` for a schema which fields can not check exactly like jsonschema
+    """
+
+
+class JSONIntegerField(NumberField):
+    """
+    Field of a JSON Schema ``integer``: an int which is not a bool, or with ``integral_floats``, a float without
+    a fractional part(``1.0``), like draft 6 and later
+    """
+    _hashable_values = True
+
+    def __init__(self, integral_floats: bool=True, **kwargs):
+        self.integral_floats = integral_floats
+
+        super(JSONIntegerField, self).__init__(**kwargs)
+
+    def _is_integer(self, value):
+        if isinstance(value, bool):
+            return False
+
+        return isinstance(value, int) or (self.integral_floats and isinstance(value, float) and value.is_integer())
+
+    def validate(self, value):
+        if not self._is_integer(value):
+            return False
+
+        return super(JSONIntegerField, self).validate(value)
+
+    def _get_checks(self):
+        return [('type', self._is_integer)] + super(JSONIntegerField, self)._get_checks()
+
+    def _get_source_checks(self, bind):
+        condition = 'not isinstance(value, int) or isinstance(value, bool)'
+        if self.integral_floats:
+            condition = '({}) and not (isinstance(value, float) and value.is_integer())'.format(condition)
+
+        return [('type', condition)] + super(JSONIntegerField, self)._get_source_checks(bind)
+
+
+class JSONNumberField(NumberField):
+    """
+    Field of a JSON Schema ``number``: an int or a float which is not a bool
+    """
+    _hashable_values = True
+
+    def validate(self, value):
+        if not isinstance(value, (int, float)) or isinstance(value, bool):
+            return False
+
+        return super(JSONNumberField, self).validate(value)
+
+    def _get_checks(self):
+        return [
+            ('type', lambda value: isinstance(value, (int, float)) and not isinstance(value, bool))
+        ] + super(JSONNumberField, self)._get_checks()
+
+    def _get_source_checks(self, bind):
+        return [
+            ('type', 'not isinstance(value, (int, float)) or isinstance(value, bool)')
+        ] + super(JSONNumberField, self)._get_source_checks(bind)
+
+
+def _get_type(schema):
+    typ = schema.get('type')
+    nullable = False
+
+    if isinstance(typ, list):
+        types = [t for t in typ if t != 'null']
+        nullable = len(types) < len(typ)
+
+        if len(types) != 1:
+            raise UnsupportedSchema('Unsupported type {!r}'.format(typ))
+
+        typ = types[0]
+
+    if typ not in _TYPE_KEYWORDS:
+        raise UnsupportedSchema('Unsupported type {!r}'.format(typ))
+
+    unsupported = set(schema) - _TYPE_KEYWORDS[typ] - _ANNOTATIONS - {'type'}
+    if unsupported:
+        raise UnsupportedSchema('Unsupported keywords {} for type {!r}'.format(sorted(unsupported), typ))
+
+    return typ, nullable
+
+
+_ENUM_TYPES = {'string': (str,), 'integer': (int, float), 'number': (int, float), 'boolean': (bool,)}
+
+
+def _get_enum(schema, typ, nullable):
+    if 'enum' not in schema:
+        return None
+
+    enum = schema['enum']
+    for value in enum:
+        if value is None and nullable:
+            continue
+
+        # python에서는 1 == True이므로 type이 다른 값이 섞이면 jsonschema와 결과가 달라질 수 있음
+        if not isinstance(value, _ENUM_TYPES[typ]) or (typ != 'boolean' and isinstance(value, bool)):
+            raise UnsupportedSchema('Unsupported enum {!r} for type {!r}'.format(enum, typ))
+
+    return list(enum)
+
+
+def _to_object(schema, integral_floats):
+    if schema.get('additionalProperties', True) is not True:
+        raise UnsupportedSchema('Unsupported additionalProperties')
+
+    properties = schema.get('properties', {})
+    required = schema.get('required', [])
+
+    if not isinstance(required, list) or set(required) - set(properties):
+        raise UnsupportedSchema('Unsupported required {!r}'.format(required))
+
+    mapping = {}
+    for key, subschema in properties.items():
+        if not isinstance(subschema, dict):
+            raise UnsupportedSchema('Unsupported schema of {!r}'.format(key))
+
+        mapping[key] = _to_field(subschema, integral_floats, key in required)
+
+    return mapping
+
+
+def _to_field(schema, integral_floats, required=True):
+    typ, nullable = _get_type(schema)
+
+    if typ == 'object':
+        # 중첩된 dict는 항상 required이고 null일 수 없음
+        if nullable or not required:
+            raise UnsupportedSchema('Optional or nullable objects are not supported')
+
+        return _to_object(schema, integral_floats)
+
+    options = {'required': required, 'allow_null': nullable}
+    enum = _get_enum(schema, typ, nullable)
+    if enum is not None:
+        options['enum'] = enum
+        # allow_null이면 enum 검사 전에 null을 허용하므로, enum에 null이 없으면 enum이 결정하도록 함
+        options['allow_null'] = nullable and None in enum
+
+    if typ == 'string':
+        pattern = schema.get('pattern')
+
+        try:
+            if pattern is not None and not _is_anchored(pattern):
+                pattern = '{}(?:{})'.format(_SEARCH_PREFIX, pattern)
+
+            return StringField(min_length=schema.get('minLength'), max_length=schema.get('maxLength'), regex=pattern, **options)
+        except re.error as e:
+            raise UnsupportedSchema('Unsupported pattern {!r}: {}'.format(schema['pattern'], e))
+    if typ == 'integer':
+        return JSONIntegerField(integral_floats, min_value=schema.get('minimum'), max_value=schema.get('maximum'), **options)
+    if typ == 'number':
+        return JSONNumberField(min_value=schema.get('minimum'), max_value=schema.get('maximum'), **options)
+    if typ == 'boolean':
+        return BooleanField(**options)
+
+    item = schema.get('items')
+    if item is not None:
+        if not isinstance(item, dict):
+            raise UnsupportedSchema('Unsupported items {!r}'.format(item))
+
+        item = _to_field(item, integral_floats)
+
+    return ListField(min_length=schema.get('minItems'), max_length=schema.get('maxItems'), item=item, **options)
+
+
+def jsonschema_to_fields(jsonschema: dict):
+    """
+    Converts a JSON Schema into a ``validate_with_fields`` mapping validating exactly the same payloads
+
+    The supported subset is an object schema with ``properties`` and ``required``, where properties have a single ``type``
+    (or a type and ``null``) among ``string``(``minLength``, ``maxLength``, ``pattern``, ``enum``),
+    ``integer`` and ``number``(``minimum``, ``maximum``, ``enum``), ``boolean``(``enum``), ``array``(``minItems``, ``maxItems``,
+    ``items`` with a single schema) and required, non-nullable nested ``object`` schemas.
+    Annotations like ``title``, ``description`` and ``format`` are ignored, since they are not validated.
+    Other keywords(``$ref``, ``additionalProperties: false``, ``oneOf``, ...) raise ``UnsupportedSchema``.
+
+    :param jsonschema: jsonschema
+    """
+    if not isinstance(jsonschema, dict) or set(jsonschema) - {'$schema', '$id'} - _TYPE_KEYWORDS['object'] - _ANNOTATIONS - {'type'}:
+        raise UnsupportedSchema('Unsupported keywords at the root')
+
+    if jsonschema.get('type') != 'object':
+        raise UnsupportedSchema('The root must be an object schema')
+
+    # draft 6부터 1.0은 integer. TYPE_CHECKER는 jsonschema 3.0부터 있으므로 validator의 is_type으로 확인
+    return _to_object(jsonschema, validator_for(jsonschema)(jsonschema).is_type(1.0, 'integer'))
+
+
+def _field_type(field):
+    if isinstance(field, StringField):
+        return 'string'
+    if isinstance(field, (IntField, JSONIntegerField)):
+        return 'integer'
+    if isinstance(field, (FloatField, JSONNumberField)):
+        return 'number'
+    if isinstance(field, BooleanField):
+        return 'boolean'
+    if isinstance(field, ListField):
+        return 'array'
+
+
+def _field_to_jsonschema(field):
+    if isinstance(field, dict):
+        return fields_to_jsonschema(field)
+
+    typ = _field_type(field)
+    if typ is None:
+        # 사용자 정의 field는 표현할 수 없으므로 모든 값을 허용
+        return {}
+
+    schema = {'type': [typ, 'null'] if field.allow_null else typ}
+
+    if typ == 'string':
+        min_length = field.min_length
+        if not field.allow_empty:
+            min_length = max(min_length or 0, 1)
+
+        if min_length is not None:
+            schema['minLength'] = min_length
+        if field.max_length is not None:
+            schema['maxLength'] = field.max_length
+
+        if field.regex is not None:
+            pattern = field.regex.pattern
+            if pattern.startswith(_SEARCH_PREFIX):
+                # jsonschema_to_fields에서 붙인 prefix와 group을 제거
+                pattern = pattern[len(_SEARCH_PREFIX) + 3:-1]
+            elif not _is_anchored(pattern):
+                pattern = '^(?:{})'.format(pattern)
+
+            schema['pattern'] = pattern
+    elif typ in ('integer', 'number'):
+        if field.min_value is not None:
+            schema['minimum'] = field.min_value
+        if field.max_value is not None:
+            schema['maximum'] = field.max_value
+    elif typ == 'array':
+        if field.min_length is not None:
+            schema['minItems'] = field.min_length
+        if field.max_length is not None:
+            schema['maxItems'] = field.max_length
+        if field.item is not None:
+            schema['items'] = _field_to_jsonschema(field.item)
+
+    if field.enum is not None:
+        schema['enum'] = sorted(field.enum, key=repr)
+
+    return schema
+
+
+def fields_to_jsonschema(key_field_mapping: dict):
+    """
+    Converts a ``validate_with_fields`` mapping into a JSON Schema, for documentation and clients
+
+    ``validator_function`` and the fields not in ``fields.py`` can not be described, and are not checked by the schema.
+    ``FloatField`` becomes a ``number``, which also accepts integers.
+
+    :param key_field_mapping: A dictionary like ``validate_with_fields``
+    """
+    properties = {}
+    required = []
+
+    for key, field in key_field_mapping.items():
+        if not isinstance(field, (dict, _BaseField)):
+            continue
+
+        properties[key] = _field_to_jsonschema(field)
+        if isinstance(field, dict) or field.required:
+            required.append(key)
+
+    schema = {'type': 'object', 'properties': properties}
+    if required:
+        schema['required'] = required
+
+    return schema
@@ -0,0 +1,170 @@
+import codecs
+import json
+import re
+
+_decoder = json.JSONDecoder()
+_non_whitespace = re.compile(r'[^ \t\n\r]')
+# 숫자 뒤에 이어질 수 있는 문자들, buffer 끝까지 이것뿐이면 숫자가 잘렸을 수 있음
+_number_tail = re.compile(r'[0-9.eE+\-]*\Z')
+_literals = ('true', 'false', 'null', 'NaN', 'Infinity', '-Infinity')
+
+
+def iter_ndjson(stream, chunk_size: int=65536):
+    """
+    Yields the objects of a NDJSON(newline delimited JSON) stream, one line at a time
+
+    Only the current line is buffered. Raises ``ValueError`` on a malformed line.
+
+    :param stream: A binary file-like object like ``request.stream``
+    :param chunk_size: bytes to read at a time
+    """
+    pending = []
+
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+
+        lines = chunk.split(b'\n')
+        if len(lines) == 1:
+            pending.append(chunk)
+            continue
+
+        pending.append(lines[0])
+        lines[0] = b''.join(pending)
+        pending = [lines.pop()]
+
+        for line in lines:
+            if line.strip():
+                yield json.loads(line.decode('utf-8'))
+
+    line = b''.join(pending)
+    if line.strip():
+        yield json.loads(line.decode('utf-8'))
+
+
+class _Reader(object):
+    """
+    A text buffer over a binary stream, which keeps only the part not consumed yet
+    """
+    def __init__(self, stream, chunk_size):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.decoder = codecs.getincrementaldecoder('utf-8')()
+        self.buffer = ''
+        self.position = 0
+        self.eof = False
+
+    def fill(self):
+        """
+        Reads chunks until the text not consumed yet is at least doubled, and returns False if the stream was already exhausted
+        """
+        if self.eof:
+            return False
+
+        # 잘린 value를 chunk마다 이어 붙이면 O(n^2)이므로 chunk를 모아서 한 번에 합침
+        chunks = [self.buffer[self.position:]]
+        size = len(chunks[0])
+        read = 0
+
+        while not self.eof and (read == 0 or read < size):
+            chunk = self.stream.read(self.chunk_size)
+            self.eof = not chunk
+
+            text = self.decoder.decode(chunk, final=self.eof)
+            chunks.append(text)
+            read += len(text)
+
+        self.buffer = ''.join(chunks)
+        self.position = 0
+
+        return True
+
+    def is_truncated(self, error):
+        """
+        Whether a decode error can be caused by the end of the buffer, not by malformed JSON
+        """
+        if error.msg.startswith('Unterminated string'):
+            return True
+
+        rest = self.buffer[error.pos:]
+        if error.msg.startswith('Invalid \\uXXXX escape'):
+            return len(rest) < 5
+
+        return _number_tail.match(rest) is not None or any(literal.startswith(rest) for literal in _literals)
+
+    def peek(self):
+        """
+        Skips whitespaces and returns the next character without consuming it, or an empty string at the end
+        """
+        while True:
+            match = _non_whitespace.search(self.buffer, self.position)
+            if match is not None:
+                self.position = match.start()
+                return match.group()
+
+            self.position = len(self.buffer)
+            if not self.fill():
+                return ''
+
+    def skip(self):
+        self.position += 1
+
+    def decode(self):
+        self.peek()
+
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buffer, self.position)
+            except json.JSONDecodeError as e:
+                # value가 chunk 경계에서 잘린 경우에만 더 읽어서 재시도
+                if not self.is_truncated(e) or not self.fill():
+                    raise
+
+                continue
+
+            if _number_tail.match(self.buffer, end) is not None and self.fill():
+                # buffer 끝에서 끝난 숫자는 다음 chunk에 이어질 수 있음
+                continue
+
+            self.position = end
+            return value
+
+
+def iter_json_array(stream, chunk_size: int=65536):
+    """
+    Yields the elements of a JSON array stream, one element at a time
+
+    Only the current element is buffered. Raises ``ValueError`` if the stream is not a well-formed JSON array.
+
+    :param stream: A binary file-like object like ``request.stream``
+    :param chunk_size: bytes to read at a time
+    """
+    reader = _Reader(stream, chunk_size)
+
+    if reader.peek() != '[':
+        raise ValueError('Expecting a JSON array')
+    reader.skip()
+
+    if reader.peek() == ']':
+        reader.skip()
+    else:
+        while True:
+            yield reader.decode()
+
+            delimiter = reader.peek()
+            reader.skip()
+
+            if delimiter == ']':
+                break
+            if delimiter != ',':
+                raise ValueError("Expecting ',' delimiter")
+
+    if reader.peek() != '':
+        raise ValueError('Extra data')
+
+
+STREAM_FORMATS = {
+    'ndjson': iter_ndjson,
+    'array': iter_json_array
+}
@@ -1,18 +1,157 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from threading import Lock
+
+from .metrics import ValidationMetrics
+from .payload import resolve_json_decoder
+from .profiling import FieldProfiler, profile_command, register_profile_dump
+from .rejection import RejectionResponses
+from .response import ResponseValidation
+from .warmup import warm_up
+
+
+def _get_mp_context():
+    method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+    return multiprocessing.get_context(method)
+
+
+class _ValidatorState(object):
+    """
+    Per-application state of the extension, registered as ``app.extensions['flask_validation']``
+    """
+    def __init__(self, app, metrics, profiler, responses):
+        self.metrics = metrics
+        self.profiler = profiler
+        self.responses = responses
+        # warm up된 ValidationSpec들의 id
+        self.warmed_specs = set()
+        self.warmed_up_late_views = False
+        self.json_decoder, self.json_decode_errors = resolve_json_decoder(app.config['VALIDATION_JSON_DECODER'])
+        self.fast_rejection = app.config['VALIDATION_FAST_REJECTION']
+        self.rejections = RejectionResponses()
+        self.offload_threshold = app.config['VALIDATION_OFFLOAD_THRESHOLD']
+        self.executor = app.config['VALIDATION_OFFLOAD_EXECUTOR']
+        self._executor_lock = Lock()
+
+        self.process_pool_workers = app.config['VALIDATION_PROCESS_POOL_WORKERS']
+        self._process_pool = None
+        self._process_pool_pid = None
+        self._process_pool_lock = Lock()
+
+    def get_executor(self):
+        """
+        Returns the executor running validations offloaded from async views, creating a thread pool on first use
+        """
+        if self.executor is None:
+            with self._executor_lock:
+                if self.executor is None:
+                    self.executor = ThreadPoolExecutor(thread_name_prefix='flask-validation')
+
+        return self.executor
+
+    def get_process_pool(self):
+        """
+        Returns the process pool of ``validate_many``, created on first use in each process, or None without workers
+
+        The pool is created from a request thread of a process already running other threads(the server, the offload
+        executor, the response validation), so its workers are started by a ``forkserver``(``spawn`` where it is not
+        available) instead of forking this process, which could copy a lock held by another thread.
+        """
+        if not self.process_pool_workers:
+            return None
+
+        if self._process_pool_pid != os.getpid():
+            with self._process_pool_lock:
+                # fork 전에 만든 pool의 worker는 fork된 process에서 사용할 수 없으므로 process마다 새로 만듦
+                if self._process_pool_pid != os.getpid():
+                    # 요청마다 process를 만들지 않도록 process당 하나의 pool을 재사용
+                    self._process_pool = ProcessPoolExecutor(self.process_pool_workers, mp_context=_get_mp_context())
+                    self._process_pool_pid = os.getpid()
+
+        return self._process_pool
+
+
 class Validator(object):
     """
     Create the Validator instance to register config. You can either pass a flask application in directly
     here to register this extension with the flask app, or call init_app after creating
     this object (in a factory pattern).
+
+    With ``VALIDATION_METRICS``, validations are recorded in ``metrics``(see ``ValidationMetrics``).
+    Hooks are registered with ``on_validation_start``, ``on_validation_end`` and ``on_validation_failure``.
+    With ``VALIDATION_PROFILE_RATE``, ``validate_with_fields`` is profiled per field in ``profiler``(see ``FieldProfiler``),
+    which is shown by the ``flask validation-profile`` command.
+
+    With ``VALIDATION_WARMUP``, the validation decorators of the views registered on the app are warmed up here
+    (see ``warm_up``), and views registered later(e.g. by blueprints) before the first request.
+    With ``VALIDATION_FAST_REJECTION``, invalid requests get a prebuilt JSON response from the decorator
+    instead of an ``abort`` going through the error handlers of the app(see ``RejectionResponses``).
+    Responses sampled by ``validate_response`` are validated in ``responses``(see ``ResponseValidation``),
+    which reports violations to hooks registered with ``on_response_violation``.
     :param app: A flask application
     """
     def __init__(self, app=None):
         self.app = app
+        self.metrics = ValidationMetrics()
+        self.profiler = FieldProfiler()
+        self.responses = ResponseValidation()
         if app is not None:
             self.init_app(app)
 
     def init_app(self, app):
         self._set_default_configuration_options(app)
 
+        if app.config['VALIDATION_METRICS']:
+            self.metrics.recording = True
+        if app.config['VALIDATION_STATSD_CLIENT'] is not None:
+            self.metrics.statsd = app.config['VALIDATION_STATSD_CLIENT']
+
+        if app.config['VALIDATION_PROFILE_RATE']:
+            self.profiler.rate = app.config['VALIDATION_PROFILE_RATE']
+        if app.config['VALIDATION_PROFILE_FILE'] is not None and self.profiler.path is None:
+            self.profiler.path = app.config['VALIDATION_PROFILE_FILE']
+            register_profile_dump(self.profiler)
+
+        self.responses.queue_size = app.config['VALIDATION_RESPONSE_QUEUE_SIZE']
+
+        app.cli.add_command(profile_command)
+        state = app.extensions['flask_validation'] = _ValidatorState(app, self.metrics, self.profiler, self.responses)
+
+        if app.config['VALIDATION_WARMUP']:
+            warm_up(app)
+
+            @app.before_request
+            def warm_up_late_views():
+                # init_app 이후에 등록된 view를 첫 request 전에 한 번 warm up
+                if not state.warmed_up_late_views:
+                    state.warmed_up_late_views = True
+                    warm_up(app, start_workers=True)
+
+    @staticmethod
+    def warm_up(app, start_workers: bool=False):
+        """
+        Loads lazy enums(failing fast if they can not be loaded) and compiles lazily compiled checks,
+        for every validation decorator of the views registered on ``app``.
+        Call this after registering blueprints, so that the first requests run as fast as the following ones.
+        With ``start_workers``, also starts the process pool workers of this process, which should be done
+        after the server forked(e.g. in a ``post_fork`` hook), since a pool is not shared with forked processes.
+        Returns the number of decorators warmed up.
+        """
+        return warm_up(app, start_workers)
+
+    def on_validation_start(self, function):
+        return self.metrics.on_validation_start(function)
+
+    def on_validation_end(self, function):
+        return self.metrics.on_validation_end(function)
+
+    def on_validation_failure(self, function):
+        return self.metrics.on_validation_failure(function)
+
+    def on_response_violation(self, function):
+        return self.responses.on_violation(function)
+
     @staticmethod
     def _set_default_configuration_options(app):
         app.config.setdefault('INVALID_CONTENT_TYPE_ABORT_CODE', 406)
@@ -20,3 +159,16 @@ class Validator(object):
         app.config.setdefault('INVALID_TYPE_ABORT_CODE', 400)
         app.config.setdefault('VALIDATION_FAILURE_ABORT_CODE', 400)
         app.config.setdefault('VALIDATION_ERROR_ABORT_CODE', 400)
+        app.config.setdefault('PAYLOAD_TOO_LARGE_ABORT_CODE', 413)
+        app.config.setdefault('VALIDATION_JSON_DECODER', None)
+        app.config.setdefault('VALIDATION_SKIP_PROVEN', True)
+        app.config.setdefault('VALIDATION_OFFLOAD_THRESHOLD', None)
+        app.config.setdefault('VALIDATION_OFFLOAD_EXECUTOR', None)
+        app.config.setdefault('VALIDATION_PROCESS_POOL_WORKERS', None)
+        app.config.setdefault('VALIDATION_METRICS', False)
+        app.config.setdefault('VALIDATION_STATSD_CLIENT', None)
+        app.config.setdefault('VALIDATION_PROFILE_RATE', 0.0)
+        app.config.setdefault('VALIDATION_PROFILE_FILE', None)
+        app.config.setdefault('VALIDATION_WARMUP', False)
+        app.config.setdefault('VALIDATION_FAST_REJECTION', False)
+        app.config.setdefault('VALIDATION_RESPONSE_QUEUE_SIZE', 1000)
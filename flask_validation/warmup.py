@@ -0,0 +1,105 @@
+import os
+
+from .enums import EnumSet
+from .fields import ListField
+
+
+class ValidationSpec(object):
+    """
+    What a decorator applied to a view validates with, attached to its wrapper as ``__validation_spec__``
+
+    :param mappings: ``validate_common`` or ``validate_with_fields`` style mappings
+    :param jsonschema: jsonschema validator
+    :param parallel_validator: ``ParallelValidator`` of ``validate_many``
+    """
+    def __init__(self, mappings=(), jsonschema=None, parallel_validator=None):
+        # _wrap에서 설정
+        self.decorator = None
+        self.mappings = tuple(mapping for mapping in mappings if mapping)
+        self.jsonschema = jsonschema
+        self.parallel_validator = parallel_validator
+
+    def __repr__(self):
+        return 'ValidationSpec({})'.format(self.decorator)
+
+
+def iter_validation_specs(view_func):
+    """
+    Yields the ``ValidationSpec`` of every validation decorator stacked on ``view_func``, outermost first
+    """
+    seen = set()
+
+    while view_func is not None:
+        # functools.wraps가 __dict__를 복사하므로 바깥 wrapper에 안쪽 spec이 복사되어 있을 수 있음
+        spec = getattr(view_func, '__validation_spec__', None)
+        if spec is not None and id(spec) not in seen:
+            seen.add(id(spec))
+            yield spec
+
+        view_func = getattr(view_func, '__wrapped__', None)
+
+
+def _iter_fields(mapping):
+    for value in mapping.values():
+        if isinstance(value, dict):
+            yield from _iter_fields(value)
+        elif not isinstance(value, type):
+            yield value
+
+            if isinstance(value, ListField) and value.item is not None:
+                yield from _iter_fields(value.item if isinstance(value.item, dict) else {None: value.item})
+
+
+def warm_up_spec(spec, process_pool=None):
+    """
+    Does the work ``spec`` would do lazily on the first requests: loads lazy enums(raising if their source fails),
+    compiles the item checks of ``ListField``, and starts the workers of ``process_pool`` with the mapping compiled
+    """
+    for mapping in spec.mappings:
+        for field in _iter_fields(mapping):
+            if isinstance(field.enum, EnumSet):
+                field.enum.load()
+
+            if isinstance(field, ListField) and field.item is not None:
+                field._get_item_check()
+
+    if spec.jsonschema is not None:
+        # jsonschema는 $ref 등을 처음 검사할 때 resolve
+        spec.jsonschema.is_valid({})
+
+    if spec.parallel_validator is not None and process_pool is not None:
+        spec.parallel_validator.warm_up(process_pool)
+
+
+def warm_up(app, start_workers: bool=False):
+    """
+    Finds the validation decorators of every view function registered on ``app`` and warms them up(see ``warm_up_spec``)
+
+    The process pool workers are started only with ``start_workers``, for every decorator including the ones
+    already warmed up, since the pool is created per process(see ``_ValidatorState.get_process_pool``).
+    Returns the number of decorators warmed up.
+    """
+    state = app.extensions.get('flask_validation')
+    process_pool = state.get_process_pool() if state is not None and start_workers else None
+    warmed = state.warmed_specs if state is not None else set()
+    count = 0
+
+    for endpoint, view_func in app.view_functions.items():
+        for spec in iter_validation_specs(view_func):
+            if id(spec) in warmed:
+                if process_pool is not None and spec.parallel_validator is not None:
+                    spec.parallel_validator.warm_up(process_pool)
+
+                continue
+
+            try:
+                warm_up_spec(spec, process_pool)
+            except Exception as e:
+                raise RuntimeError('Failed to warm up {} of endpoint {!r}: {}'.format(spec.decorator, endpoint, e)) from e
+
+            warmed.add(id(spec))
+            count += 1
+
+    app.logger.debug('Warmed up %d validation decorators in process %d', count, os.getpid())
+
+    return count
@@ -10,6 +10,7 @@ setup(
     author_email='mingyu.planb@gmail.com',
     maintainer='PlanB',
     maintainer_email='mingyu.planb@gmail.com',
+    python_requires='>=3.7',
     install_requires=[
         'Flask',
         'jsonschema'
@@ -17,6 +18,8 @@ setup(
     classifiers=[
         'Programming Language :: Python',
         'Programming Language :: Python :: 3',
+        'Programming Language :: Python :: 3 :: Only',
+        'Programming Language :: Python :: 3.7',
         'Topic :: Software Development :: Libraries :: Python Modules'
     ],
     packages=['flask_validation']
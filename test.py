@@ -1,10 +1,32 @@
-from unittest import TestCase
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from copy import deepcopy
+from io import BytesIO
+from types import ModuleType
+from unittest import mock, TestCase
 
 from flask import Flask
 from flask.testing import FlaskClient
 
 from flask_validation import common_regex as cr
+from flask_validation.parallel import ParallelValidator
+from flask_validation.payload import exceeds_limits, resolve_json_decoder
+from flask_validation.profiling import FieldProfiler
+from flask_validation.regex_engine import compile_regex
+from flask_validation.response import ResponseValidation
+from flask_validation.schema import UnsupportedSchema
+from flask_validation.streaming import iter_json_array, iter_ndjson
+from flask_validation.warmup import iter_validation_specs
 from flask_validation import *
+from jsonschema.exceptions import SchemaError
+
+from flask_validation.compiler import compile_jsonschema, compile_multidict, compile_partial, ENGINES, INVALID_TYPE, KEY_MISSING, VALIDATION_FAILURE
 
 
 class BaseTestCase(TestCase):
@@ -14,15 +36,28 @@ class BaseTestCase(TestCase):
     def tearDown(self):
         pass
 
-    def _get_test_client_of_decorated_view_function_registered_flask_app(self, decorator_func) -> FlaskClient:
-        def view_func():
-            return 'hello'
+    def _get_decorated_view_function_registered_flask_app(self, decorator_func, view_func=None, methods=('POST',), **config):
+        """
+        Returns the app and the validator with ``config``, on which ``view_func`` decorated with ``decorator_func``
+        is registered at ``/`` as ``index``. Without ``decorator_func``, ``view_func`` is registered as it is.
+        """
+        if view_func is None:
+            def view_func():
+                return 'hello'
+
+        if decorator_func is not None:
+            view_func = decorator_func(view_func)
 
-        decorated_view_func = decorator_func(view_func)
         app = Flask(__name__)
-        Validator(app)
+        app.config.update(config)
+        validator = Validator(app)
+
+        app.add_url_rule('/', 'index', view_func, methods=methods)
+
+        return app, validator
 
-        app.add_url_rule('/', view_func=decorated_view_func, methods=['POST'])
+    def _get_test_client_of_decorated_view_function_registered_flask_app(self, decorator_func, **config) -> FlaskClient:
+        app, _ = self._get_decorated_view_function_registered_flask_app(decorator_func, **config)
 
         return app.test_client()
 
@@ -119,6 +154,87 @@ class TestValidateWithFields(BaseTestCase):
         self.assertEqual(resp.status_code, 400)
 
 
+class TestValidateWithFieldsCodegen(TestValidateWithFields):
+    def setUp(self):
+        self.target_func = validate_with_fields
+        self.client = self._get_test_client_of_decorated_view_function_registered_flask_app(self.target_func({
+            'a': StringField(max_length=10),
+            'b': IntField(min_value=0),
+            'c': FloatField(min_value=3.8),
+            'd': ListField(max_length=10),
+            'e': {
+                'f': BooleanField(allow_null=True)
+            }
+        }, engine='codegen'))
+
+
+class TestCompileFields(TestCase):
+    def setUp(self):
+        self.validators = [compile_fields({
+            'a': StringField(max_length=3, enum=['a', 'abc']),
+            'b': IntField(min_value=0, required=False),
+            'c': {
+                'd': FloatField(allow_null=True)
+            }
+        }, engine) for engine in ENGINES]
+
+    def test_valid(self):
+        for validate_payload in self.validators:
+            self.assertIsNone(validate_payload({'a': 'abc', 'c': {'d': None}}))
+            self.assertIsNone(validate_payload({'a': 'a', 'b': 0, 'c': {'d': 1.5}}))
+
+    def test_key_missing(self):
+        for validate_payload in self.validators:
+            self.assertEqual(validate_payload({'b': 1, 'c': {'d': 1.5}}), KEY_MISSING)
+            self.assertEqual(validate_payload({'a': 'a', 'c': {}}), KEY_MISSING)
+
+    def test_validation_failure(self):
+        for validate_payload in self.validators:
+            self.assertEqual(validate_payload({'a': 'ab', 'c': {'d': 1.5}}), VALIDATION_FAILURE)
+            self.assertEqual(validate_payload({'a': 'a', 'b': -1, 'c': {'d': 1.5}}), VALIDATION_FAILURE)
+            self.assertEqual(validate_payload({'a': 'a', 'c': 1}), VALIDATION_FAILURE)
+            self.assertEqual(validate_payload(['a']), VALIDATION_FAILURE)
+
+    def test_compile_types(self):
+        for engine in ENGINES:
+            validate_payload = compile_types({'a': str, 'c': {'d': int}}, engine)
+            self.assertIsNone(validate_payload({'a': 'a', 'c': {'d': 1}}))
+            self.assertEqual(validate_payload({'a': 'a'}), KEY_MISSING)
+            self.assertEqual(validate_payload({'a': 'a', 'c': {'d': True}}), INVALID_TYPE)
+
+    def test_codegen_source(self):
+        validate_payload = compile_fields({'a': StringField(regex='[a-z]+')}, 'codegen')
+        self.assertIn('def validate_payload', validate_payload.source)
+
+    def test_unknown_engine(self):
+        with self.assertRaises(ValueError):
+            compile_fields({'a': StringField()}, 'unknown')
+
+    def test_field_compile(self):
+        check = StringField(min_length=2, regex='[a-z]+$').compile()
+        self.assertIsNone(check('ab'))
+        self.assertEqual(check(1), 'type')
+        self.assertEqual(check('a'), 'min_length')
+        self.assertEqual(check('A1'), 'regex')
+
+    def test_custom_field(self):
+        class EvenField(IntField):
+            def validate(self, value):
+                if value % 2:
+                    return False
+
+                return super(EvenField, self).validate(value)
+
+        check = EvenField(min_value=0).compile()
+        self.assertIsNone(check(2))
+        self.assertEqual(check(3), 'validate')
+        self.assertEqual(check(-2), 'validate')
+
+        validate_payload = compile_fields({'a': EvenField()}, 'codegen')
+        self.assertIsNone(validate_payload({'a': 2}))
+        self.assertEqual(validate_payload({'a': 3}), VALIDATION_FAILURE)
+
+
 class TestValidateWithJsonSchema(BaseTestCase):
     def setUp(self):
         self.target_func = validate_with_jsonschema
@@ -146,6 +262,437 @@ class TestValidateWithJsonSchema(BaseTestCase):
         self.assertEqual(resp.status_code, 400)
 
 
+class TestCompilePayload(TestCase):
+    def setUp(self):
+        self.validators = [compile_payload(
+            required_keys=['a', {'c': ['e']}],
+            key_type_mapping={'b': int},
+            key_field_mapping={'a': StringField(max_length=3), 'c': {'d': IntField(min_value=0)}},
+            engine=engine,
+            collect_errors=True
+        ) for engine in ENGINES]
+
+    def test_valid(self):
+        for validate_payload in self.validators:
+            self.assertEqual(validate_payload({'a': 'a', 'b': 1, 'c': {'d': 1, 'e': None}}), [])
+
+    def test_collect_errors(self):
+        for validate_payload in self.validators:
+            self.assertEqual(validate_payload({'a': 'abcd', 'b': '1', 'c': {'d': -1}}), [
+                {'path': ('a',), 'code': VALIDATION_FAILURE, 'constraint': 'max_length'},
+                {'path': ('c', 'e'), 'code': KEY_MISSING, 'constraint': 'required'},
+                {'path': ('c', 'd'), 'code': VALIDATION_FAILURE, 'constraint': 'min_value'},
+                {'path': ('b',), 'code': INVALID_TYPE, 'constraint': 'type'}
+            ])
+
+    def test_skip_invalid_object(self):
+        for validate_payload in self.validators:
+            self.assertEqual(validate_payload({'b': 1, 'c': 1}), [
+                {'path': ('a',), 'code': KEY_MISSING, 'constraint': 'required'},
+                {'path': ('c',), 'code': KEY_MISSING, 'constraint': 'type'}
+            ])
+
+
+class TestValidatePayload(BaseTestCase):
+    def setUp(self):
+        self.target_func = validate_payload
+        self.client = self._get_test_client_of_decorated_view_function_registered_flask_app(self.target_func(
+            required_keys=['a'],
+            key_field_mapping={'a': StringField(max_length=3), 'b': {'c': IntField(min_value=0)}},
+            collect_errors=True
+        ))
+
+    def test_200(self):
+        resp = self._json_post_request(self.client, json={'a': 'a', 'b': {'c': 1}})
+        self.assertEqual(resp.status_code, 200)
+
+    def test_collect_errors(self):
+        resp = self._json_post_request(self.client, json={'a': 'abcd', 'b': {'c': -1}})
+        self.assertEqual(resp.status_code, 400)
+        self.assertEqual(resp.get_json(), {'errors': [
+            {'path': ['a'], 'code': 'validation_failure', 'constraint': 'max_length'},
+            {'path': ['b', 'c'], 'code': 'validation_failure', 'constraint': 'min_value'}
+        ]})
+
+
+class TestListFieldItem(TestCase):
+    def test_columnar(self):
+        field = ListField(item=IntField(min_value=0, max_value=10))
+        self.assertIsNone(field.validate([0, 5, 10]))
+        self.assertIsNone(field.validate([]))
+        self.assertFalse(field.validate([0, 11]))
+        self.assertFalse(field.validate([-1, 5]))
+        self.assertFalse(field.validate([1, 1.5]))
+
+        check = ListField(item=FloatField(min_value=0.0)).compile()
+        self.assertIsNone(check([0.0, 1.5]))
+        self.assertEqual(check([0.0, -1.5]), 'item')
+        self.assertEqual(check([1.0, 1]), 'item')
+
+    def test_columnar_nan(self):
+        # min()/max()는 NaN이 앞에 있으면 NaN을 반환하므로 element 단위로 check해야 함
+        check = ListField(item=FloatField(min_value=0.0, max_value=10.0)).compile()
+        self.assertEqual(check([float('nan'), -1.0]), 'item')
+        self.assertEqual(check([float('nan'), 11.0]), 'item')
+        # 단일 FloatField와 같이 NaN 자체는 범위 check를 통과함
+        self.assertIsNone(check([float('nan'), 1.0]))
+
+    def test_item_mapping(self):
+        for engine in ENGINES:
+            validate_payload = compile_fields({
+                'a': ListField(item={'b': StringField(max_length=3)}),
+                'c': ListField(item=IntField(allow_null=True, enum=[1, 2]), required=False)
+            }, engine)
+            self.assertIsNone(validate_payload({'a': [{'b': 'b'}, {'b': 'bb'}], 'c': [1, None, 2]}))
+            self.assertEqual(validate_payload({'a': [{'b': 'b'}, {'b': 'bbbb'}]}), VALIDATION_FAILURE)
+            self.assertEqual(validate_payload({'a': [{'b': 'b'}, 1]}), VALIDATION_FAILURE)
+            self.assertEqual(validate_payload({'a': [], 'c': [1, 3]}), VALIDATION_FAILURE)
+
+
+class TestValidateMany(BaseTestCase):
+    def setUp(self):
+        self.target_func = validate_many
+        self.client = self._get_test_client_of_decorated_view_function_registered_flask_app(self.target_func({
+            'a': StringField(max_length=3),
+            'b': IntField(min_value=0)
+        }, max_errors=2))
+
+    def test_200(self):
+        resp = self._json_post_request(self.client, json=[{'a': 'a', 'b': 1}, {'a': 'abc', 'b': 0}])
+        self.assertEqual(resp.status_code, 200)
+
+    def test_failing_indices(self):
+        resp = self._json_post_request(self.client, json=[{'a': 'a', 'b': 1}, {'a': 'abcd', 'b': 1}, {'a': 'a'}, {'b': -1}])
+        self.assertEqual(resp.status_code, 400)
+        self.assertEqual(resp.get_json(), {'errors': [
+            {'path': [1], 'code': 'validation_failure', 'constraint': None},
+            {'path': [2], 'code': 'key_missing', 'constraint': None}
+        ]})
+
+    def test_not_list(self):
+        resp = self._json_post_request(self.client, json={'a': 'a', 'b': 1})
+        self.assertEqual(resp.status_code, 400)
+
+
+class TestStreaming(TestCase):
+    def test_ndjson(self):
+        body = b'{"a": 1}\n\n{"a": "\xea\xb0\x80"}\n[1, 23]'
+        for chunk_size in (1, 4, 65536):
+            self.assertEqual(list(iter_ndjson(BytesIO(body), chunk_size)), [{'a': 1}, {'a': '\uac00'}, [1, 23]])
+
+    def test_json_array(self):
+        body = b' [{"a": 123}, 4567 , "\xea\xb0\x80", [true, null]] '
+        for chunk_size in (1, 4, 65536):
+            self.assertEqual(list(iter_json_array(BytesIO(body), chunk_size)), [{'a': 123}, 4567, '\uac00', [True, None]])
+
+        self.assertEqual(list(iter_json_array(BytesIO(b'[ ]'))), [])
+
+    def test_malformed(self):
+        for body in (b'{"a": 1}', b'[1 2]', b'[1, 2', b'[1] 2'):
+            with self.assertRaises(ValueError):
+                list(iter_json_array(BytesIO(body), 2))
+
+    def test_json_array_split_tokens(self):
+        body = b'[1.5, -2e-3, {"a": "\\u00e9\\ud83d\\ude00"}, false, -Infinity, "' + b'x' * 100 + b'"]'
+        expected = json.loads(body)
+        for chunk_size in range(1, 12):
+            self.assertEqual(list(iter_json_array(BytesIO(body), chunk_size)), expected)
+
+    def test_malformed_without_reading_ahead(self):
+        stream = BytesIO(b'[1, , ' + b'2, ' * 10000 + b'3]')
+        with self.assertRaises(ValueError):
+            list(iter_json_array(stream, 4))
+
+        self.assertLess(stream.tell(), 100)
+
+
+class TestValidateStream(BaseTestCase):
+    def setUp(self):
+        self.records = []
+
+        @validate_stream({'a': IntField(min_value=0)}, format='array', chunk_size=4)
+        def view_func(records):
+            for record in records:
+                self.records.append(record)
+
+            return 'hello'
+
+        app = Flask(__name__)
+        Validator(app)
+        app.add_url_rule('/', view_func=view_func, methods=['POST'])
+
+        self.client = app.test_client()
+
+    def test_200(self):
+        resp = self._json_post_request(self.client, data='[{"a": 1}, {"a": 20}]')
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(self.records, [{'a': 1}, {'a': 20}])
+
+    def test_validation_failure(self):
+        resp = self._json_post_request(self.client, data='[{"a": 1}, {"a": -1}, {"a": 2}]')
+        self.assertEqual(resp.status_code, 400)
+        self.assertEqual(self.records, [{'a': 1}])
+
+    def test_malformed(self):
+        resp = self._json_post_request(self.client, data='[{"a": 1}, {"a": ')
+        self.assertEqual(resp.status_code, 400)
+
+
+class TestPayloadLimits(BaseTestCase):
+    def setUp(self):
+        self.target_func = validate_with_fields
+        self.client = self._get_test_client_of_decorated_view_function_registered_flask_app(self.target_func({
+            'a': ListField(required=False)
+        }, max_body_bytes=64, max_depth=3, max_keys=2))
+
+    def test_200(self):
+        resp = self._json_post_request(self.client, json={'a': [[1]], 'b': '{{{[['})
+        self.assertEqual(resp.status_code, 200)
+
+    def test_body_too_large(self):
+        resp = self._json_post_request(self.client, json={'a': list(range(100))})
+        self.assertEqual(resp.status_code, 413)
+
+    def test_too_deep(self):
+        resp = self._json_post_request(self.client, json={'a': [[[1]]]})
+        self.assertEqual(resp.status_code, 413)
+
+    def test_too_many_keys(self):
+        resp = self._json_post_request(self.client, json={'a': [{'b': 1}], 'c': 1})
+        self.assertEqual(resp.status_code, 413)
+
+    def test_chunked_body(self):
+        # Content-Length 없이 보내진 body는 limit보다 1 byte만 더 읽음
+        for body, status_code in ((b'{"a": [1]}', 200), (json.dumps({'a': list(range(10000))}).encode(), 413)):
+            stream = BytesIO(body)
+            resp = self.client.post('/', content_type='application/json', environ_overrides={
+                'wsgi.input': stream, 'wsgi.input_terminated': True, 'HTTP_TRANSFER_ENCODING': 'chunked'
+            })
+            self.assertEqual(resp.status_code, status_code)
+            self.assertLessEqual(stream.tell(), 65)
+
+    def test_scan_once(self):
+        scanned = []
+
+        def counted(data, max_depth, max_keys):
+            scanned.append(data)
+            return exceeds_limits(data, max_depth, max_keys)
+
+        limits = {'max_depth': 3, 'max_keys': 2}
+        client = self._get_test_client_of_decorated_view_function_registered_flask_app(
+            lambda fn: validate_keys(['a'], **limits)(validate_with_fields({'a': ListField()}, **limits)(fn))
+        )
+
+        with mock.patch('flask_validation.context.exceeds_limits', counted):
+            resp = self._json_post_request(client, json={'a': [[1]]})
+
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(len(scanned), 1)
+
+    def test_exceeds_limits(self):
+        self.assertFalse(exceeds_limits(b'{"a": "\\"}}}:", "b": [1]}', max_depth=2, max_keys=2))
+        self.assertTrue(exceeds_limits(b'[[[[[[', max_depth=5))
+        # escape된 따옴표와 문자열 안의 괄호, ':'는 세지 않음
+        self.assertFalse(exceeds_limits(b'{"a\\"": "[[:", "b": {"c": "\\\\"}}', max_depth=2, max_keys=3))
+        self.assertTrue(exceeds_limits(b'{"a\\"": "[[:", "b": {"c": "\\\\"}}', max_keys=2))
+        self.assertFalse(exceeds_limits(b'[[1], [2], [3], {"a": 1}]', max_depth=2))
+        self.assertTrue(exceeds_limits(b'[[1], [2], [[3]]]', max_depth=2))
+
+
+class TestJsonDecoder(BaseTestCase):
+    def setUp(self):
+        self.decoded = []
+
+        def decoder(data):
+            self.decoded.append(data)
+            return json.loads(data.decode('utf-8'))
+
+        @validate_keys(['a'])
+        @validate_with_fields({'a': IntField(min_value=0)})
+        def view_func():
+            return str(get_json()['a'])
+
+        app = Flask(__name__)
+        app.config['VALIDATION_JSON_DECODER'] = decoder
+        Validator(app)
+        app.add_url_rule('/', view_func=view_func, methods=['POST'])
+
+        self.client = app.test_client()
+
+    def test_decode_once(self):
+        resp = self._json_post_request(self.client, json={'a': 1})
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.get_data(as_text=True), '1')
+        self.assertEqual(len(self.decoded), 1)
+
+    def test_validation_failure(self):
+        resp = self._json_post_request(self.client, json={'a': -1})
+        self.assertEqual(resp.status_code, 400)
+
+    def test_malformed(self):
+        resp = self._json_post_request(self.client, data='{"a": ')
+        self.assertEqual(resp.status_code, 400)
+
+    def test_fallback(self):
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            decoder, errors = resolve_json_decoder('msgspec')
+
+        self.assertEqual(decoder(b'{"a": 1}'), {'a': 1})
+        if caught:
+            self.assertIn('msgspec', str(caught[0].message))
+
+        with self.assertRaises(ValueError):
+            resolve_json_decoder('unknown')
+
+    def test_decoder_errors(self):
+        # msgspec처럼 ValueError가 아닌 exception을 raise하는 decoder
+        class DecodeError(Exception):
+            pass
+
+        def decode(data):
+            try:
+                return json.loads(data.decode('utf-8'))
+            except ValueError:
+                raise DecodeError('malformed')
+
+        msgspec = ModuleType('msgspec')
+        msgspec.DecodeError = DecodeError
+        msgspec_json = ModuleType('msgspec.json')
+        msgspec_json.decode = decode
+
+        with mock.patch.dict('sys.modules', {'msgspec': msgspec, 'msgspec.json': msgspec_json}):
+            self.assertEqual(resolve_json_decoder('msgspec'), (decode, (ValueError, DecodeError)))
+
+            app = Flask(__name__)
+            app.config['VALIDATION_JSON_DECODER'] = 'msgspec'
+            Validator(app)
+
+        app.add_url_rule('/', view_func=validate_keys(['a'])(lambda: 'OK'), methods=['POST'])
+        client = app.test_client()
+
+        self.assertEqual(self._json_post_request(client, data='{"a": ').status_code, 400)
+        self.assertEqual(self._json_post_request(client, json={'a': 1}).status_code, 200)
+
+
+class TestValidationContext(BaseTestCase):
+    def setUp(self):
+        self.calls = []
+
+        def counted(value):
+            self.calls.append(value)
+            return True
+
+        keys = ['a']
+        mapping = {'a': IntField(validator_function=counted)}
+        validate_a = validate_with_fields(mapping)
+
+        @validate_payload(required_keys=keys, key_field_mapping=mapping)
+        @validate_keys(keys)
+        @validate_a
+        def view_func():
+            return 'hello'
+
+        self.app = Flask(__name__)
+        Validator(self.app)
+        self.app.add_url_rule('/', view_func=view_func, methods=['POST'])
+
+        self.client = self.app.test_client()
+
+    def test_skip_proven(self):
+        resp = self._json_post_request(self.client, json={'a': 1})
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(self.calls, [1])
+
+    def test_no_skip(self):
+        self.app.config['VALIDATION_SKIP_PROVEN'] = False
+
+        resp = self._json_post_request(self.client, json={'a': 1})
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(self.calls, [1, 1])
+
+    def test_stacked_literal_specs(self):
+        # decorator마다 새로 만든 list는 decorate 후 해제되어 id가 재사용될 수 있음
+        for _ in range(10):
+            client = self._get_test_client_of_decorated_view_function_registered_flask_app(
+                lambda fn: validate_keys(['a'])(validate_keys(['b'])(fn))
+            )
+
+            self.assertEqual(self._json_post_request(client, json={'a': 1}).status_code, 400)
+            self.assertEqual(self._json_post_request(client, json={'a': 1, 'b': 1}).status_code, 200)
+
+    def test_context_per_request(self):
+        with self.app.test_request_context('/', json={'a': 1}):
+            context = get_context()
+            self.assertIs(get_context(), context)
+            self.assertEqual(context.payload, {'a': 1})
+            self.assertEqual(context.get_abort_code('key_missing'), 400)
+
+        with self.app.test_request_context('/', json={'a': 2}):
+            self.assertIsNot(get_context(), context)
+            self.assertEqual(get_json(), {'a': 2})
+
+
+class TestModel(BaseTestCase):
+    def setUp(self):
+        self.mapping = {
+            'a': StringField(),
+            'b': IntField(required=False),
+            'c': {
+                'd': FloatField(allow_null=True)
+            }
+        }
+
+    def test_compile(self):
+        for engine in ENGINES:
+            validate_payload = compile_fields(self.mapping, engine, model=True)
+
+            failure_reason, instance = validate_payload({'a': 'a', 'c': {'d': 1.5}, 'e': 1})
+            self.assertIsNone(failure_reason)
+            self.assertIsInstance(instance, Model)
+            self.assertEqual((instance.a, instance.b, instance.c.d), ('a', None, 1.5))
+            self.assertEqual(instance.to_dict(), {'a': 'a', 'b': None, 'c': {'d': 1.5}})
+            self.assertFalse(hasattr(instance, '__dict__'))
+
+            self.assertEqual(validate_payload({'a': 'a', 'c': 1}), (VALIDATION_FAILURE, None))
+
+    def test_invalid_key(self):
+        with self.assertRaises(ValueError):
+            compile_fields({'not identifier': StringField()}, model=True)
+
+    def test_view_argument(self):
+        @validate_with_fields(self.mapping, model_kwarg='payload')
+        def view_func(payload):
+            return payload.a
+
+        app = Flask(__name__)
+        Validator(app)
+        app.add_url_rule('/', view_func=view_func, methods=['POST'])
+
+        client = app.test_client()
+
+        resp = self._json_post_request(client, json={'a': 'hello', 'c': {'d': 1.5}})
+        self.assertEqual(resp.get_data(as_text=True), 'hello')
+
+        resp = self._json_post_request(client, json={'a': 'hello', 'c': {}})
+        self.assertEqual(resp.status_code, 400)
+
+
+class TestCompileJsonSchema(TestCase):
+    def test_shared_validator(self):
+        schema = {'type': 'object', 'properties': {'a': {'type': 'integer'}}}
+
+        validator = compile_jsonschema(schema)
+        self.assertIs(compile_jsonschema(schema), validator)
+        self.assertIs(compile_jsonschema(deepcopy(schema)), validator)
+        self.assertTrue(validator.is_valid({'a': 1}))
+        self.assertFalse(validator.is_valid({'a': 'a'}))
+
+    def test_invalid_schema(self):
+        with self.assertRaises(SchemaError):
+            validate_with_jsonschema({'type': 'unknown'})
+
+
 class TestValidateWithCommonRegex(BaseTestCase):
     def setUp(self):
         self.target_func = validate_with_fields
@@ -188,3 +735,972 @@ class TestValidateWithCommonRegex(BaseTestCase):
             'date': '20010420'
         })
         self.assertEqual(resp.status_code, 400)
+
+
+class TestCommonRegex(TestCase):
+    def test_adversarial_input(self):
+        # 이전 url pattern은 이 입력에서 수 분 이상 걸림
+        for pattern, value in (
+            (cr.url, 'http://' + 'a' * 40 + '/' * 5000 + '!'),
+            (cr.url, 'a.' * 5000 + '!'),
+            (cr.email, 'a@' + 'a.' * 5000 + '!')
+        ):
+            started = time.perf_counter()
+            self.assertIsNone(re.match(pattern, value))
+            self.assertLess(time.perf_counter() - started, 0.5)
+
+    def test_length_prefilter(self):
+        check = StringField(regex=cr.email).compile()
+        self.assertIsNone(check('viper@istruly.sexy'))
+        self.assertEqual(check('a' * 300 + '@istruly.sexy'), 'regex')
+
+        check = compile_fields({'email': StringField(regex=cr.email)}, engine='codegen')
+        self.assertEqual(check({'email': 'a' * 300 + '@istruly.sexy'}), VALIDATION_FAILURE)
+        self.assertFalse(StringField(regex=cr.email).validate('a' * 300 + '@istruly.sexy'))
+
+    def test_find_redos(self):
+        for pattern in (r'(a+)+$', r'^([\w.]*)*$', r'^(https?:\/\/)?([\da-z\.-]+)\.([a-z\.]{2,6})([\/\w_\.-]*)*\/?$'):
+            self.assertIsNotNone(cr.find_redos(pattern))
+
+        for pattern in (cr.email, cr.url, cr.date, cr.isbn, r'^[a-z]+(?:\.[a-z]+)*$'):
+            self.assertIsNone(cr.find_redos(pattern))
+
+    def test_check_redos(self):
+        with self.assertRaises(ValueError):
+            StringField(regex=r'^(a+)+$', check_redos=True)
+
+        StringField(regex=r'^(a+)+$')
+        StringField(regex=cr.url, check_redos=True)
+
+
+class TestRegexEngine(TestCase):
+    def test_required_literals(self):
+        self.assertEqual(cr.required_literals(cr.email), ('@', '.'))
+        self.assertEqual(cr.required_literals(r'ab(cd)+e?f'), ('ab', 'cd', 'f'))
+        self.assertEqual(cr.required_literals(r'(?i)abc'), ())
+        self.assertEqual(cr.required_literals(r'x|y'), ())
+
+        field = StringField(regex=r'^[a-z]+@[a-z]+$')
+        self.assertIsNone(field.compile()('viper@planb'))
+        self.assertEqual(field.compile()('viper'), 'regex')
+        self.assertFalse(field.validate('viper'))
+
+        check = compile_fields({'a': field}, engine='codegen')
+        self.assertIn("'@' not in value", check.source)
+        self.assertIsNone(check({'a': 'viper@planb'}))
+        self.assertEqual(check({'a': 'viper@'}), VALIDATION_FAILURE)
+
+    def test_timeout(self):
+        try:
+            import regex
+        except ImportError:
+            self.skipTest('regex is not installed')
+
+        field = StringField(regex=r'^(a|aa)+$', regex_engine='regex', regex_timeout=0.05)
+        self.assertIsNone(field.compile()('a' * 10))
+
+        started = time.perf_counter()
+        self.assertEqual(field.compile()('a' * 60 + '!'), 'regex')
+        self.assertLess(time.perf_counter() - started, 1)
+
+    def test_engines(self):
+        match = compile_regex(cr.email, engine='re')
+        self.assertIsNotNone(match('viper@istruly.sexy'))
+        self.assertIsNone(match('viper'))
+
+        with self.assertRaises(ValueError):
+            compile_regex(cr.email, engine='unknown')
+
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            match = compile_regex(cr.email, engine='re', timeout=1)
+
+        self.assertEqual(len(caught), 1)
+        self.assertIsNotNone(match('viper@istruly.sexy'))
+
+
+class TestLRU(TestCase):
+    def test_validator_function(self):
+        calls = []
+
+        def is_tenant(value):
+            calls.append(value)
+            return value.startswith('t-')
+
+        cache = LRU(maxsize=2)
+        field = StringField(validator_function=is_tenant, cache=cache)
+
+        for engine in ENGINES:
+            check = compile_fields({'tenant': field}, engine=engine)
+            self.assertIsNone(check({'tenant': 't-1'}))
+            self.assertIsNone(check({'tenant': 't-1'}))
+            self.assertEqual(check({'tenant': 'x'}), VALIDATION_FAILURE)
+
+        self.assertFalse(field.validate('x'))
+        self.assertEqual(calls, ['t-1', 'x'])
+        self.assertEqual(cache.info(), (5, 2, 2, 2))
+
+        # maxsize를 넘으면 가장 오래 사용되지 않은 결과부터 제거
+        check({'tenant': 't-2'})
+        check({'tenant': 't-1'})
+        self.assertEqual(calls, ['t-1', 'x', 't-2', 't-1'])
+
+        cache.clear()
+        self.assertEqual(cache.info(), (0, 0, 2, 0))
+
+    def test_regex(self):
+        cache = LRU()
+        check = StringField(regex=cr.email, cache=cache).compile()
+
+        self.assertIsNone(check('viper@istruly.sexy'))
+        self.assertIsNone(check('viper@istruly.sexy'))
+        self.assertEqual(check('viper@'), 'regex')
+        self.assertEqual(cache.info().hits, 1)
+
+    def test_ttl(self):
+        cache = LRU(ttl=0)
+        check = IntField(validator_function=bool, cache=cache).compile()
+
+        check(1)
+        time.sleep(0.01)
+        check(1)
+        self.assertEqual(cache.info().hits, 0)
+
+    def test_distinguishes_types_and_unhashable_values(self):
+        cache = LRU()
+        check = IntField(validator_function=lambda value: value is True, cache=cache).compile()
+
+        self.assertIsNone(check(True))
+        self.assertEqual(check(1), 'validator_function')
+
+        check = ListField(validator_function=lambda value: len(value) > 1, cache=cache).compile()
+        self.assertEqual(check([1]), 'validator_function')
+        self.assertEqual(cache.info().currsize, 2)
+
+
+class TestEnumSet(TestCase):
+    def test_membership(self):
+        enum = EnumSet(['ko', 'en', ['a', 'b'], {'c': 1}])
+
+        self.assertEqual(enum.hashable, frozenset(('ko', 'en')))
+        self.assertIn('ko', enum)
+        self.assertIn(['a', 'b'], enum)
+        self.assertIn({'c': 1}, enum)
+        self.assertNotIn('ja', enum)
+        self.assertNotIn(['a'], enum)
+        self.assertEqual(len(enum), 4)
+
+    def test_fields(self):
+        codes = ['SKU-{}'.format(i) for i in range(10000)]
+
+        for engine in ENGINES:
+            check = compile_fields({
+                'sku': StringField(enum=codes),
+                'tags': ListField(enum=[['a'], ['b']], required=False)
+            }, engine=engine)
+
+            self.assertIsNone(check({'sku': 'SKU-9999', 'tags': ['b']}))
+            self.assertEqual(check({'sku': 'SKU-10000'}), VALIDATION_FAILURE)
+            self.assertEqual(check({'sku': 'SKU-1', 'tags': ['c']}), VALIDATION_FAILURE)
+
+        self.assertIsInstance(StringField(enum=codes).enum, EnumSet)
+        self.assertFalse(StringField(enum=codes).validate('SKU-10000'))
+
+        shared = EnumSet(codes)
+        self.assertIs(StringField(enum=shared).enum, IntField(enum=shared).enum)
+
+    def test_load_enum(self):
+        calls = []
+
+        def load_locales():
+            calls.append(None)
+            return ['ko_KR', 'en_US']
+
+        field = StringField(enum=load_enum(load_locales))
+        self.assertEqual(calls, [])
+        self.assertFalse(field.enum.loaded)
+
+        check = field.compile()
+        self.assertIsNone(check('ko_KR'))
+        self.assertEqual(check('ja_JP'), 'enum')
+        self.assertIs(load_enum(load_locales), field.enum)
+        self.assertEqual(calls, [None])
+
+    def test_load_enum_from_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'locales.txt')
+            with open(path, 'w') as f:
+                f.write('ko_KR\nen_US\n\n')
+
+            json_path = os.path.join(directory, 'codes.json')
+            with open(json_path, 'w') as f:
+                json.dump([1, 2, 3], f)
+
+            self.assertIn('en_US', load_enum(path))
+            self.assertNotIn('', load_enum(path))
+            self.assertIn(3, load_enum(json_path))
+
+
+class TestAsyncViews(BaseTestCase):
+    def setUp(self):
+        try:
+            import asgiref
+        except ImportError:
+            self.skipTest('asgiref is not installed')
+
+    def _get_client(self, decorator_func, **config):
+        threads = []
+
+        def validator_function(value):
+            threads.append(threading.current_thread())
+            return True
+
+        @decorator_func({'name': StringField(validator_function=validator_function)})
+        async def view_func():
+            return get_json()['name']
+
+        app, _ = self._get_decorated_view_function_registered_flask_app(json_required, view_func, **config)
+
+        return app.test_client(), threads
+
+    def test_async_view(self):
+        for decorator_func in (validate_with_fields, lambda mapping: validate_payload(key_field_mapping=mapping)):
+            client, threads = self._get_client(decorator_func)
+
+            resp = self._json_post_request(client, json={'name': 'viper'})
+            self.assertEqual(resp.status_code, 200)
+            self.assertEqual(resp.data, b'viper')
+
+            resp = self._json_post_request(client, json={'name': 1})
+            self.assertEqual(resp.status_code, 400)
+
+            resp = self._plain_post_request(client, data='viper')
+            self.assertEqual(resp.status_code, 406)
+
+            self.assertNotIn('flask-validation', threads[0].name)
+
+    def test_offload(self):
+        client, threads = self._get_client(validate_with_fields, VALIDATION_OFFLOAD_THRESHOLD=20)
+
+        resp = self._json_post_request(client, json={'name': 'viper'})
+        self.assertEqual(resp.status_code, 200)
+        self.assertNotIn('flask-validation', threads[-1].name)
+
+        resp = self._json_post_request(client, json={'name': 'viper' * 10})
+        self.assertEqual(resp.status_code, 200)
+        self.assertIn('flask-validation', threads[-1].name)
+
+        # executor에서 abort해도 같은 응답
+        resp = self._json_post_request(client, json={'name': ['viper'] * 10})
+        self.assertEqual(resp.status_code, 400)
+
+    def test_model_kwarg(self):
+        @validate_with_fields({'name': StringField()}, model_kwarg='payload')
+        async def view_func(payload):
+            return payload.name
+
+        app, _ = self._get_decorated_view_function_registered_flask_app(None, view_func, VALIDATION_OFFLOAD_THRESHOLD=0)
+
+        resp = self._json_post_request(app.test_client(), json={'name': 'viper'})
+        self.assertEqual(resp.data, b'viper')
+
+
+class TestParallelValidation(BaseTestCase):
+    mapping = {
+        'name': StringField(regex=cr.email, cache=LRU()),
+        'tags': ListField(item=IntField(min_value=0), required=False),
+        'position': {'latitude': FloatField(enum=[1.0, 2.0])}
+    }
+
+    @classmethod
+    def setUpClass(cls):
+        cls.pool = ProcessPoolExecutor(2)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.pool.shutdown()
+
+    def _get_records(self):
+        records = [{'name': 'viper@istruly.sexy', 'position': {'latitude': 1.0}} for _ in range(250)]
+        records[3]['name'] = 'viper'
+        records[120]['tags'] = [1, -1]
+        records[249]['position'] = {'latitude': 3}
+
+        return records
+
+    def test_same_result_as_compile_many(self):
+        records = self._get_records()
+
+        for collect_errors in (False, True):
+            for max_errors in (None, 2):
+                expected = compile_many(self.mapping, collect_errors=collect_errors, max_errors=max_errors)(records)
+                validator = ParallelValidator(self.mapping, collect_errors=collect_errors, max_errors=max_errors, chunk_size=50)
+
+                self.assertEqual(validator(self.pool, records), expected)
+
+        self.assertEqual([error['path'][0] for error in expected], [3, 120])
+
+    def test_unpicklable_mapping(self):
+        with self.assertRaises(ValueError):
+            ParallelValidator({'a': IntField(validator_function=lambda value: True)})
+
+    def test_validate_many(self):
+        app = Flask(__name__)
+        app.config['VALIDATION_PROCESS_POOL_WORKERS'] = 2
+        Validator(app)
+        app.add_url_rule('/', view_func=validate_many(self.mapping, parallel_threshold=100, chunk_size=50)(lambda: 'hello'), methods=['POST'])
+        client = app.test_client()
+
+        resp = self._json_post_request(client, json=self._get_records())
+        self.assertEqual(resp.status_code, 400)
+        self.assertEqual([error['path'][0] for error in resp.json['errors']], [3, 120, 249])
+
+        resp = self._json_post_request(client, json=self._get_records()[4:100])
+        self.assertEqual(resp.status_code, 200)
+
+        app.extensions['flask_validation'].get_process_pool().shutdown()
+
+
+class _StatsdStub(object):
+    def __init__(self):
+        self.counters = {}
+        self.timings = []
+
+    def incr(self, name, count=1):
+        self.counters[name] = self.counters.get(name, 0) + count
+
+    def timing(self, name, milliseconds):
+        self.timings.append(name)
+
+
+class TestValidationMetrics(BaseTestCase):
+    def _get_app(self, **config):
+        return self._get_decorated_view_function_registered_flask_app(
+            lambda fn: validate_keys(['name'])(validate_with_fields({'name': StringField(), 'age': IntField(required=False)})(fn)),
+            **config
+        )
+
+    def test_disabled(self):
+        app, validator = self._get_app()
+
+        with app.test_request_context('/', method='POST', json={}):
+            self.assertIsNone(get_context().metrics)
+
+        self._json_post_request(app.test_client(), json={'name': 'viper'})
+        self.assertEqual(validator.metrics.snapshot(), {})
+
+    def test_counters(self):
+        statsd = _StatsdStub()
+        app, validator = self._get_app(VALIDATION_METRICS=True, VALIDATION_STATSD_CLIENT=statsd)
+        client = app.test_client()
+
+        self._json_post_request(client, json={'name': 'viper'})
+        self._json_post_request(client, json={'name': 'viper', 'age': 'old'})
+        self._json_post_request(client, json={})
+
+        snapshot = validator.metrics.snapshot()
+        keys = snapshot[('index', 'validate_keys')]
+        fields = snapshot[('index', 'validate_with_fields')]
+
+        self.assertEqual((keys['validated'], keys['rejected'], keys['failures']), (2, 1, {KEY_MISSING: 1}))
+        self.assertEqual((fields['validated'], fields['rejected'], fields['failures']), (1, 1, {VALIDATION_FAILURE: 1}))
+        self.assertEqual(keys['duration']['count'], 3)
+        self.assertEqual(fields['payload_size']['buckets'][128], 2)
+
+        self.assertEqual(statsd.counters['flask_validation.index.validate_keys.validated'], 2)
+        self.assertEqual(statsd.counters['flask_validation.index.validate_keys.failure.key_missing'], 1)
+        self.assertEqual(len(statsd.timings), 5)
+
+        exported = validator.metrics.export_prometheus()
+        self.assertIn('flask_validation_validations_total{endpoint="index",decorator="validate_keys",result="validated"} 2', exported)
+        self.assertIn('flask_validation_failures_total{endpoint="index",decorator="validate_with_fields",reason="validation_failure"} 1', exported)
+        self.assertIn('flask_validation_duration_seconds_bucket{endpoint="index",decorator="validate_keys",le="+Inf"} 3', exported)
+        self.assertIn('flask_validation_payload_bytes_count{endpoint="index",decorator="validate_with_fields"} 2', exported)
+
+        validator.metrics.reset()
+        self.assertEqual(validator.metrics.snapshot(), {})
+
+    def test_hooks(self):
+        app, validator = self._get_app()
+        calls = []
+
+        @validator.on_validation_start
+        def on_start(endpoint, decorator):
+            calls.append(('start', endpoint, decorator))
+
+        @validator.on_validation_end
+        def on_end(endpoint, decorator, duration):
+            calls.append(('end', endpoint, decorator))
+
+        @validator.on_validation_failure
+        def on_failure(endpoint, decorator, failure_reason):
+            calls.append(('failure', endpoint, decorator, failure_reason))
+
+        resp = self._json_post_request(app.test_client(), json={'age': 1})
+        self.assertEqual(resp.status_code, 400)
+        self.assertEqual(calls, [
+            ('start', 'index', 'validate_keys'),
+            ('failure', 'index', 'validate_keys', KEY_MISSING),
+            ('end', 'index', 'validate_keys')
+        ])
+        # hook만 등록한 경우 counter는 기록하지 않음
+        self.assertEqual(validator.metrics.snapshot(), {})
+
+
+class TestFieldProfiler(BaseTestCase):
+    mapping = {
+        'email': StringField(regex=cr.email),
+        'position': {'latitude': FloatField(min_value=-90.0, max_value=90.0)},
+        'age': IntField(required=False)
+    }
+
+    def _get_app(self, **config):
+        config.setdefault('VALIDATION_PROFILE_RATE', 1.0)
+
+        return self._get_decorated_view_function_registered_flask_app(validate_with_fields(self.mapping), **config)
+
+    def test_stats(self):
+        app, validator = self._get_app()
+        client = app.test_client()
+
+        for _ in range(3):
+            self._json_post_request(client, json={'email': 'viper@istruly.sexy', 'position': {'latitude': 100.0}})
+
+        stats = {(row['path'], row['constraint']): row for row in validator.profiler.stats()}
+
+        self.assertEqual(set(stats), {
+            ('email', 'type'), ('email', 'regex'),
+            ('position.latitude', 'type'), ('position.latitude', 'min_value'), ('position.latitude', 'max_value')
+        })
+        self.assertEqual(stats['email', 'regex']['calls'], 3)
+        self.assertEqual(stats['email', 'regex']['endpoint'], 'index')
+        self.assertGreater(stats['email', 'regex']['total'], 0)
+
+    def test_disabled(self):
+        app, validator = self._get_app(VALIDATION_PROFILE_RATE=0.0)
+        self._json_post_request(app.test_client(), json={'email': 'viper@istruly.sexy', 'position': {'latitude': 1.0}})
+
+        self.assertEqual(validator.profiler.stats(), [])
+
+    def test_cli(self):
+        with tempfile.TemporaryDirectory() as directory:
+            app, validator = self._get_app(VALIDATION_PROFILE_FILE=os.path.join(directory, 'profile-{pid}.json'))
+            runner = app.test_cli_runner()
+
+            result = runner.invoke(args=['validation-profile'])
+            self.assertIn('No validation profile recorded', result.output)
+
+            self._json_post_request(app.test_client(), json={'email': 'viper@istruly.sexy', 'position': {'latitude': 1.0}})
+
+            # dump 전에는 이 process의 profile을 출력
+            result = runner.invoke(args=['validation-profile', '--sort', 'calls'])
+            self.assertIn('position.latitude', result.output)
+
+            validator.profiler.dump()
+            validator.profiler.reset()
+            self.assertEqual(os.listdir(directory), ['profile-{}.json'.format(os.getpid())])
+
+            result = runner.invoke(args=['validation-profile', '--limit', '1'])
+            self.assertEqual(result.exit_code, 0)
+            self.assertEqual(len(result.output.splitlines()), 2)
+
+    def test_concurrent_dumps(self):
+        app = Flask(__name__)
+        payload = {'email': 'viper@istruly.sexy', 'position': {'latitude': 1.0}}
+        failures = []
+
+        with tempfile.TemporaryDirectory() as directory:
+            profiler = FieldProfiler(rate=1.0, path=os.path.join(directory, 'profile-{pid}.json'), dump_interval=0.0)
+
+            def profile():
+                try:
+                    with app.test_request_context('/', method='POST', json=payload):
+                        for _ in range(30):
+                            profiler.profile(self.mapping, payload)
+                except Exception as e:
+                    failures.append(e)
+
+            threads = [threading.Thread(target=profile) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            self.assertEqual(failures, [])
+            self.assertEqual(os.listdir(directory), ['profile-{}.json'.format(os.getpid())])
+
+        # 쓸 수 없는 path여도 request는 실패하지 않음
+        profiler = FieldProfiler(rate=1.0, path=os.path.join(directory, 'missing', 'profile.json'), dump_interval=0.0)
+        with app.test_request_context('/', method='POST', json=payload), self.assertLogs('flask_validation.profiling', 'ERROR'):
+            profiler.profile(self.mapping, payload)
+
+
+class TestWarmUp(BaseTestCase):
+    def test_iter_validation_specs(self):
+        mapping = {'a': IntField()}
+
+        view_func = json_required(validate_keys(['a'])(validate_with_fields(mapping)(lambda: 'hello')))
+        specs = list(iter_validation_specs(view_func))
+
+        self.assertEqual([spec.decorator for spec in specs], ['json_required', 'validate_keys', 'validate_with_fields'])
+        self.assertEqual(specs[2].mappings, (mapping,))
+
+    def test_warm_up(self):
+        calls = []
+
+        def load_codes():
+            calls.append('codes')
+            return ['a', 'b']
+
+        def load_late_codes():
+            calls.append('late_codes')
+            return ['c']
+
+        app = Flask(__name__)
+        app.config['VALIDATION_WARMUP'] = True
+        view_func = validate_with_fields({'items': ListField(item={'code': StringField(enum=EnumSet(loader=load_codes))})})
+        app.add_url_rule('/', 'index', view_func(lambda: 'hello'), methods=['POST'])
+        validator = Validator(app)
+
+        self.assertEqual(calls, ['codes'])
+
+        # init_app 이후에 등록된 view는 첫 request 전에 warm up
+        view_func = validate_many({'code': StringField(enum=EnumSet(loader=load_late_codes))})
+        app.add_url_rule('/late', 'late', view_func(lambda: 'hello'), methods=['POST'])
+
+        resp = app.test_client().post('/', json={'items': [{'code': 'a'}]})
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(calls, ['codes', 'late_codes'])
+        self.assertEqual(validator.warm_up(app), 0)
+
+    def test_fail_fast(self):
+        def load_codes():
+            raise IOError('codes.txt')
+
+        app = Flask(__name__)
+        app.config['VALIDATION_WARMUP'] = True
+        app.add_url_rule('/', 'index', validate_with_fields({'code': StringField(enum=EnumSet(loader=load_codes))})(lambda: 'hello'))
+
+        with self.assertRaises(RuntimeError) as raised:
+            Validator(app)
+
+        self.assertIn("validate_with_fields of endpoint 'index'", str(raised.exception))
+
+    def test_process_pool(self):
+        app = Flask(__name__)
+        app.config['VALIDATION_WARMUP'] = True
+        app.config['VALIDATION_PROCESS_POOL_WORKERS'] = 2
+        app.add_url_rule('/', 'index', validate_many(TestParallelValidation.mapping, parallel_threshold=10)(lambda: 'hello'))
+        validator = Validator(app)
+
+        # init_app에서는 fork 전일 수 있으므로 pool을 만들지 않음
+        state = app.extensions['flask_validation']
+        self.assertIsNone(state._process_pool)
+
+        self.assertEqual(validator.warm_up(app, start_workers=True), 0)
+        pool = state.get_process_pool()
+        self.assertEqual(len(pool._processes), 2)
+        # request thread에서 만들어지므로 fork가 아닌 forkserver/spawn으로 worker를 시작
+        self.assertIn(pool._mp_context.get_start_method(), ('forkserver', 'spawn'))
+        self.assertIs(state.get_process_pool(), pool)
+        pool.shutdown()
+
+
+class TestFastRejection(BaseTestCase):
+    def _get_app(self, view_func, **config):
+        return self._get_decorated_view_function_registered_flask_app(None, view_func, VALIDATION_FAST_REJECTION=True, **config)
+
+    def test_rejection(self):
+        view_func = json_required(validate_keys(['name'])(validate_with_fields({'name': StringField(), 'age': IntField(required=False)})(lambda: 'hello')))
+        app, _ = self._get_app(view_func, KEY_MISSING_ABORT_CODE=422)
+        handled = []
+
+        @app.errorhandler(400)
+        def handle_bad_request(e):
+            handled.append(e)
+            return 'handled', 400
+
+        client = app.test_client()
+
+        resp = self._json_post_request(client, json={'name': 'viper'})
+        self.assertEqual(resp.status_code, 200)
+
+        resp = self._plain_post_request(client)
+        self.assertEqual((resp.status_code, resp.mimetype, resp.json), (406, 'application/json', {'error': 'invalid_content_type'}))
+
+        for _ in range(2):
+            resp = self._json_post_request(client, json={'age': 1})
+            self.assertEqual((resp.status_code, resp.json), (422, {'error': KEY_MISSING}))
+
+        resp = self._json_post_request(client, json={'name': 'viper', 'age': 'old'})
+        self.assertEqual((resp.status_code, resp.json), (400, {'error': VALIDATION_FAILURE}))
+        # error handler를 거치지 않음
+        self.assertEqual(handled, [])
+
+    def test_collect_errors(self):
+        view_func = validate_payload(['a'], key_field_mapping={'b': IntField()}, collect_errors=True)(lambda: 'hello')
+        app, _ = self._get_app(view_func)
+
+        resp = self._json_post_request(app.test_client(), json={'b': 'x'})
+        self.assertEqual(resp.status_code, 400)
+        self.assertEqual([error['code'] for error in resp.json['errors']], [KEY_MISSING, VALIDATION_FAILURE])
+
+    def test_after_request(self):
+        app, _ = self._get_app(validate_keys(['name'])(lambda: 'hello'))
+
+        @app.after_request
+        def add_header(response):
+            response.headers.add('X-Request', 'a')
+            return response
+
+        client = app.test_client()
+        self._json_post_request(client, json={})
+        resp = self._json_post_request(client, json={})
+
+        # 응답 객체는 request마다 새로 만들어짐
+        self.assertEqual(resp.headers.getlist('X-Request'), ['a'])
+
+    def test_metrics(self):
+        app, validator = self._get_app(validate_keys(['name'])(lambda: 'hello'), VALIDATION_METRICS=True)
+
+        self._json_post_request(app.test_client(), json={})
+        self.assertEqual(validator.metrics.snapshot()[('index', 'validate_keys')]['failures'], {KEY_MISSING: 1})
+
+    def test_stream(self):
+        def view_func(records):
+            return str(len(list(records)))
+
+        app, _ = self._get_app(validate_stream({'a': IntField()})(view_func))
+        body = b'{"a": 1}\n{"a": "x"}\n'
+
+        resp = app.test_client().post('/', data=body, headers={'Content-Type': 'application/x-ndjson'})
+        self.assertEqual(resp.status_code, 400)
+
+
+class TestValidateArgs(BaseTestCase):
+    def setUp(self):
+        app = Flask(__name__)
+        Validator(app)
+
+        @app.route('/items/<id>', methods=['GET', 'POST'])
+        @validate_view_args({'id': IntField(min_value=1)})
+        @validate_args({
+            'q': StringField(max_length=10),
+            'page': IntField(min_value=1, required=False),
+            'score': FloatField(required=False, allow_null=True),
+            'active': BooleanField(required=False),
+            'tag': ListField(item=IntField(), max_length=2, required=False)
+        })
+        def items(id, q, page=1, **kwargs):
+            return dict(kwargs, id=id, q=q, page=page)
+
+        @app.route('/form', methods=['POST'])
+        @validate_form({'name': StringField(), 'age': IntField()}, kwarg='form')
+        def form(form):
+            return form
+
+        self.client = app.test_client()
+
+    def test_coercion(self):
+        resp = self.client.get('/items/3?q=viper&page=2&score=0.5&active=Yes&tag=1&tag=2')
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.json, {'id': 3, 'q': 'viper', 'page': 2, 'score': 0.5, 'active': True, 'tag': [1, 2]})
+
+        resp = self.client.get('/items/3?q=viper&score=')
+        self.assertEqual(resp.json, {'id': 3, 'q': 'viper', 'page': 1, 'score': None})
+
+    def test_first_value(self):
+        resp = self.client.get('/items/3?q=a&q=b')
+        self.assertEqual(resp.json['q'], 'a')
+
+    def test_invalid(self):
+        for url in ('/items/3', '/items/0?q=a', '/items/a?q=a', '/items/3?q=' + 'a' * 11):
+            self.assertEqual(self.client.get(url).status_code, 400, url)
+
+        for query in ('page=a', 'page=0', 'score=nan', 'active=maybe', 'tag=a', 'tag=1&tag=2&tag=3'):
+            resp = self.client.get('/items/3?q=a&' + query)
+            self.assertEqual(resp.status_code, 400, query)
+
+    def test_form(self):
+        resp = self.client.post('/form', data={'name': 'viper', 'age': '21'})
+        self.assertEqual(resp.json, {'name': 'viper', 'age': 21})
+
+        resp = self.client.post('/form', data={'name': 'viper'})
+        self.assertEqual(resp.status_code, 400)
+
+    def test_compile_multidict(self):
+        from werkzeug.datastructures import MultiDict
+
+        parser = compile_multidict({'a': IntField(), 'b': ListField(item=BooleanField(), required=False)})
+
+        self.assertEqual(parser(MultiDict([('a', '1'), ('b', 'on'), ('b', '0')])), (None, {'a': 1, 'b': [True, False]}))
+        self.assertEqual(parser(MultiDict([('b', 'on')])), (KEY_MISSING, None))
+
+        with self.assertRaises(ValueError):
+            compile_multidict({'a': {'b': IntField()}})
+
+        with self.assertRaises(ValueError):
+            compile_multidict({'a': ListField()}, multi_valued=False)
+
+
+class TestPartial(BaseTestCase):
+    mapping = {
+        'name': StringField(max_length=10),
+        'age': IntField(min_value=0),
+        'nickname': StringField(allow_null=True),
+        'position': {'latitude': FloatField(), 'longitude': FloatField()}
+    }
+
+    def test_compile_partial(self):
+        for reject_unknown in (False, True):
+            validator = compile_partial(self.mapping, reject_unknown=reject_unknown)
+
+            self.assertIsNone(validator({}))
+            self.assertIsNone(validator({'age': 3, 'nickname': None}))
+            self.assertIsNone(validator({'position': {'latitude': 1.0}}))
+            self.assertEqual(validator({'age': -1}), VALIDATION_FAILURE)
+            self.assertEqual(validator({'position': None}), VALIDATION_FAILURE)
+            self.assertEqual(validator({'position': {'latitude': 'a'}}), VALIDATION_FAILURE)
+            self.assertEqual(validator([]), VALIDATION_FAILURE)
+
+        self.assertIsNone(compile_partial(self.mapping)({'age': 3, 'a': 1, 'b': 2, 'c': 3, 'd': 4}))
+        self.assertEqual(compile_partial(self.mapping)({'age': -1, 'a': 1, 'b': 2, 'c': 3, 'd': 4}), VALIDATION_FAILURE)
+        self.assertEqual(compile_partial(self.mapping, reject_unknown=True)({'position': {'altitude': 1.0}}), VALIDATION_FAILURE)
+
+    def test_collect_errors(self):
+        validator = compile_partial(self.mapping, collect_errors=True, reject_unknown=True)
+
+        self.assertEqual(validator({'age': 'a', 'position': {'latitude': 1.0, 'altitude': 1.0}, 'b': 2}), [
+            {'path': ('age',), 'code': VALIDATION_FAILURE, 'constraint': 'type'},
+            {'path': ('position', 'altitude'), 'code': VALIDATION_FAILURE, 'constraint': 'unknown'},
+            {'path': ('b',), 'code': VALIDATION_FAILURE, 'constraint': 'unknown'}
+        ])
+
+    def test_decorator(self):
+        client = self._get_test_client_of_decorated_view_function_registered_flask_app(
+            validate_with_fields(self.mapping, partial=True, reject_unknown=True)
+        )
+
+        self.assertEqual(self._json_post_request(client, json={'name': 'viper'}).status_code, 200)
+        self.assertEqual(self._json_post_request(client, json={'name': 1}).status_code, 400)
+        self.assertEqual(self._json_post_request(client, json={'name': 'viper', 'id': 1}).status_code, 400)
+
+        with self.assertRaises(ValueError):
+            validate_with_fields(self.mapping, partial=True, model_kwarg='model')
+
+    def test_not_proven_by_partial(self):
+        view_func = validate_with_fields(self.mapping, partial=True)(validate_with_fields(self.mapping)(lambda: 'hello'))
+        client = self._get_test_client_of_decorated_view_function_registered_flask_app(lambda fn: view_func)
+
+        self.assertEqual(self._json_post_request(client, json={'name': 'viper'}).status_code, 400)
+
+
+class TestValidateResponse(BaseTestCase):
+    def _get_app(self, spec, body, **kwargs):
+        app, validator = self._get_decorated_view_function_registered_flask_app(
+            validate_response(spec, **kwargs), lambda: body, methods=('GET',)
+        )
+        violations = []
+
+        @validator.on_response_violation
+        def record(endpoint, errors):
+            violations.append((endpoint, errors))
+
+        return app, validator, violations
+
+    def test_fields(self):
+        app, validator, violations = self._get_app({'name': StringField(), 'age': IntField()}, {'name': 'viper', 'age': 'old'}, sample_rate=1)
+        client = app.test_client()
+
+        for _ in range(3):
+            resp = client.get('/')
+            # 응답은 검사 결과와 관계없이 그대로
+            self.assertEqual(resp.json, {'name': 'viper', 'age': 'old'})
+
+        validator.responses.join()
+        self.assertEqual(validator.responses.checked, 3)
+        self.assertEqual(violations[0], ('index', [{'path': ('age',), 'code': VALIDATION_FAILURE, 'constraint': 'type'}]))
+
+    def test_jsonschema(self):
+        schema = {'type': 'object', 'properties': {'tags': {'type': 'array', 'items': {'type': 'string'}}}, 'required': ['tags']}
+
+        app, validator, violations = self._get_app(schema, {'tags': ['a', 1]}, sample_rate=1, defer=False)
+        app.test_client().get('/')
+
+        self.assertEqual(violations, [('index', [{'path': ('tags', 1), 'code': 'validation_error', 'constraint': 'type'}])])
+
+    def test_sampling(self):
+        app, validator, violations = self._get_app({'name': IntField()}, {'name': 'viper'}, sample_rate=0)
+        app.test_client().get('/')
+
+        validator.responses.join()
+        self.assertEqual((validator.responses.checked, violations), (0, []))
+
+    def test_return_value_unchanged(self):
+        app, validator, violations = self._get_app({'name': IntField()}, {'name': 'viper'}, sample_rate=1, defer=False)
+        body = {'name': 1}
+
+        # sample 여부와 관계없이 view의 return value가 그대로 전달됨
+        for sample_rate in (1, 0):
+            view_func = validate_response({'name': IntField()}, sample_rate=sample_rate, defer=False)(lambda: body)
+            with app.test_request_context('/'):
+                self.assertIs(view_func(), body)
+
+        self.assertEqual((validator.responses.checked, violations), (1, []))
+
+    def test_skipped_responses(self):
+        app, validator, violations = self._get_app({'name': IntField()}, ('not json', 200), sample_rate=1, defer=False)
+        app.test_client().get('/')
+
+        app.view_functions['index'] = validate_response({'name': IntField()}, sample_rate=1, defer=False)(lambda: ({'name': 'a'}, 500))
+        app.test_client().get('/')
+
+        self.assertEqual((validator.responses.checked, violations), (0, []))
+
+    def test_failing_hook(self):
+        app, validator, violations = self._get_app({'name': IntField()}, {'name': 'viper'}, sample_rate=1, defer=False)
+
+        @validator.on_response_violation
+        def fail(endpoint, errors):
+            raise RuntimeError('hook')
+
+        # defer=False에서도 hook의 exception은 log만 남기고 response는 그대로
+        with self.assertLogs('flask_validation.response', 'ERROR'):
+            resp = app.test_client().get('/')
+
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(len(violations), 1)
+
+    def test_dropped(self):
+        responses = ResponseValidation(queue_size=1)
+        started = threading.Event()
+        release = threading.Event()
+
+        def check(body):
+            started.set()
+            release.wait()
+            return []
+
+        responses.submit(check, 'index', b'{}')
+        started.wait()
+        responses.submit(check, 'index', b'{}')
+        responses.submit(check, 'index', b'{}')
+        release.set()
+        responses.join()
+
+        self.assertEqual((responses.checked, responses.dropped), (2, 1))
+
+
+class TestSchemaBridge(BaseTestCase):
+    schema = {
+        'type': 'object',
+        'properties': {
+            'id': {'type': 'integer', 'minimum': 1},
+            'name': {'type': ['string', 'null'], 'maxLength': 5, 'pattern': '^a|b', 'title': 'name'},
+            'scores': {'type': 'array', 'items': {'type': 'number'}, 'maxItems': 2},
+            'role': {'type': 'string', 'enum': ['admin', 'user']},
+            'status': {'type': ['string', 'null'], 'enum': ['x']},
+            'grade': {'type': ['integer', 'null'], 'enum': [1, None]},
+            'position': {
+                'type': 'object',
+                'properties': {'latitude': {'type': 'number'}, 'longitude': {'type': 'number'}},
+                'required': ['latitude']
+            }
+        },
+        'required': ['id', 'position']
+    }
+
+    payloads = [
+        {'id': 1, 'position': {'latitude': 1}},
+        {'id': 1.0, 'position': {'latitude': 1.5}},
+        {'id': True, 'position': {'latitude': 1}},
+        {'id': 0, 'position': {'latitude': 1}},
+        {'id': 1, 'position': {'latitude': False}},
+        {'id': 1, 'position': {}},
+        {'id': 1, 'position': None},
+        {'id': 1},
+        {'id': 1, 'position': {'latitude': 1}, 'name': None},
+        {'id': 1, 'position': {'latitude': 1}, 'name': 'xb'},
+        {'id': 1, 'position': {'latitude': 1}, 'name': 'x\nb'},
+        {'id': 1, 'position': {'latitude': 1}, 'name': 'xa'},
+        {'id': 1, 'position': {'latitude': 1}, 'scores': [1, 2.5]},
+        {'id': 1, 'position': {'latitude': 1}, 'scores': [1, True]},
+        {'id': 1, 'position': {'latitude': 1}, 'scores': [1, 2, 3]},
+        {'id': 1, 'position': {'latitude': 1}, 'role': 'admin'},
+        {'id': 1, 'position': {'latitude': 1}, 'role': 'root'},
+        {'id': 1, 'position': {'latitude': 1}, 'status': None},
+        {'id': 1, 'position': {'latitude': 1}, 'status': 'x'},
+        {'id': 1, 'position': {'latitude': 1}, 'grade': None},
+        {'id': 1, 'position': {'latitude': 1}, 'grade': 2},
+        []
+    ]
+
+    def test_same_result_as_jsonschema(self):
+        mapping = jsonschema_to_fields(self.schema)
+        validator = compile_jsonschema(self.schema)
+
+        for engine in ENGINES:
+            native_validator = compile_fields(mapping, engine)
+
+            for payload in self.payloads:
+                self.assertEqual(native_validator(payload) is None, validator.is_valid(payload), (engine, payload))
+
+    def test_draft4_integer(self):
+        schema = {'$schema': 'http://json-schema.org/draft-04/schema#', 'type': 'object', 'properties': {'a': {'type': 'integer'}}}
+        validator = compile_fields(jsonschema_to_fields(schema))
+
+        self.assertIsNone(validator({'a': 1}))
+        self.assertEqual(validator({'a': 1.0}), VALIDATION_FAILURE)
+
+    def test_unsupported(self):
+        for schema in (
+            {'type': 'object', 'properties': {'a': {'$ref': '#/definitions/a'}}, 'definitions': {'a': {'type': 'string'}}},
+            {'type': 'object', 'additionalProperties': False},
+            {'type': 'object', 'properties': {'a': {'type': 'object'}}},
+            {'type': 'object', 'properties': {'a': {'type': 'integer', 'enum': [1, True]}}},
+            {'type': 'object', 'properties': {'a': {'type': ['integer', 'string']}}},
+            {'type': 'object', 'required': ['a']},
+            {'properties': {'a': {'type': 'string'}}}
+        ):
+            with self.assertRaises(UnsupportedSchema):
+                jsonschema_to_fields(schema)
+
+    def test_fields_to_jsonschema(self):
+        mapping = {
+            'name': StringField(allow_empty=False, max_length=5, regex='[a-z]+'),
+            'age': IntField(min_value=0, required=False),
+            'score': FloatField(allow_null=True),
+            'tags': ListField(item=StringField(enum=['b', 'a'])),
+            'position': {'latitude': FloatField()}
+        }
+
+        self.assertEqual(fields_to_jsonschema(mapping), {
+            'type': 'object',
+            'properties': {
+                'name': {'type': 'string', 'minLength': 1, 'maxLength': 5, 'pattern': '^(?:[a-z]+)'},
+                'age': {'type': 'integer', 'minimum': 0},
+                'score': {'type': ['number', 'null']},
+                'tags': {'type': 'array', 'items': {'type': 'string', 'enum': ['a', 'b']}},
+                'position': {'type': 'object', 'properties': {'latitude': {'type': 'number'}}, 'required': ['latitude']}
+            },
+            'required': ['name', 'score', 'tags', 'position']
+        })
+
+        converted = {key: value for key, value in self.schema['properties'].items()}
+        converted['name'] = {key: value for key, value in converted['name'].items() if key != 'title'}
+        # null이 enum에 없으면 허용되지 않으므로 type에서 빠짐
+        converted['status'] = {'type': 'string', 'enum': ['x']}
+        self.assertEqual(fields_to_jsonschema(jsonschema_to_fields(self.schema))['properties'], converted)
+
+    def test_decorator(self):
+        native = validate_with_jsonschema(self.schema)(lambda: 'hello')
+        fallback = validate_with_jsonschema(dict(self.schema, additionalProperties=False))(lambda: 'hello')
+
+        self.assertEqual(len(native.__validation_spec__.mappings), 1)
+        self.assertEqual(fallback.__validation_spec__.mappings, ())
+
+        for view_func in (native, fallback):
+            client = self._get_test_client_of_decorated_view_function_registered_flask_app(lambda fn: view_func)
+
+            self.assertEqual(self._json_post_request(client, json={'id': 1, 'position': {'latitude': 1}}).status_code, 200)
+            self.assertEqual(self._json_post_request(client, json={'id': True, 'position': {'latitude': 1}}).status_code, 400)